@@ -19,7 +19,7 @@ const App = () => {
     useEffect(() => {
         axios.get('http://localhost:8000/api/centers/')
             .then(res => {
-                setCenters(res.data);
+                setCenters(res.data.results);
             })
             .catch(err => {
                 console.log(err);
@@ -27,7 +27,7 @@ const App = () => {
 
         axios.get('http://localhost:8000/api/services/')
             .then(res => {
-                setServices(res.data);
+                setServices(res.data.results);
             })
             .catch(err => {
                 console.log(err);
@@ -35,7 +35,7 @@ const App = () => {
 
         axios.get('http://localhost:8000/api/addresses/')
             .then(res => {
-                setAddresses(res.data);
+                setAddresses(res.data.results);
             })
             .catch(err => {
                 console.log(err);
@@ -43,7 +43,7 @@ const App = () => {
 
         axios.get('http://localhost:8000/api/center-services/')
             .then(res => {
-                setServiceCenters(res.data);
+                setServiceCenters(res.data.results);
             })
             .catch(err => {
                 console.log(err);
@@ -52,7 +52,7 @@ const App = () => {
 
         axios.get('http://localhost:8000/api/comments/', )
             .then(res => {
-                setComments(res.data);
+                setComments(res.data.results);
             })
             .catch(err => {
                 console.log(err);
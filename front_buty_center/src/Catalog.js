@@ -17,7 +17,7 @@ const Catalog = ({ details, username, token, onLogout }) => {
     useEffect(() => {
         axios.get('http://localhost:8000/api/centers/')
             .then(response => {
-                setCenters(response.data);
+                setCenters(response.data.results);
             })
             .catch(error => {
                 console.error('Error fetching centers:', error);
@@ -86,7 +86,7 @@ const Catalog = ({ details, username, token, onLogout }) => {
             console.log('Fetched comments for center', centerId, response.data);
             setComments(prevComments => ({
                 ...prevComments,
-                [centerId]: response.data
+                [centerId]: response.data.results
             }));
         } catch (error) {
             console.error('Error fetching comments:', error);
@@ -19,40 +19,20 @@ const CenterPage = ({ username, onLogout }) => {
     const [selectedCenter, setSelectedCenter] = useState(null);
 
     useEffect(() => {
-        const fetchCenterData = async () => {
+        // Центр, его услуги и первая страница отзывов одним запросом
+        const fetchCenterProfile = async () => {
             try {
-                const response = await fetch(`http://localhost:8000/api/centers/${centerId}/`);
+                const response = await fetch(`http://localhost:8000/api/centers/${centerId}/profile/`);
                 const data = await response.json();
-                setCenter(data);
+                setCenter(data.center);
+                setServices(data.center.services);
+                setComments(data.comments.results);
             } catch (error) {
-                console.error('Error fetching center data:', error);
+                console.error('Error fetching center profile:', error);
             }
         };
 
-        const fetchCenterServices = async () => {
-            try {
-                const response = await fetch(`http://localhost:8000/api/center-services/?center=${centerId}`);
-                const data = await response.json();
-                setServices(data.filter(service => service.center === centerId));
-            } catch (error) {
-                console.error('Error fetching services:', error);
-            }
-        };
-
-        const fetchComments = async () => {
-            try {
-                const response = await fetch(`http://localhost:8000/api/centers/${centerId}/comments/`);
-                const data = await response.json();
-                console.log('Fetched comments:', data); // Для отладки
-                setComments(Array.isArray(data) ? data : []);
-            } catch (error) {
-                console.error('Error fetching comments:', error);
-            }
-        };
-
-        fetchCenterData();
-        fetchCenterServices();
-        fetchComments();
+        fetchCenterProfile();
     }, [centerId]);
 
     const handleLogout = () => {
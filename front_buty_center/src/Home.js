@@ -92,7 +92,7 @@ const Home = ({ details, username, onLogout }) => {
             console.log('Fetched comments:', response.data);
             setComments(prevComments => ({
                 ...prevComments,
-                [centerId]: response.data
+                [centerId]: response.data.results
             }));
         } catch (error) {
             console.error('Error fetching comments:', error);
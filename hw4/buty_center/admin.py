@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Center, Service, Comments, CenterService, Address
+from .models import Center, Service, Comments, CenterService, Address, Job
 
 
 class CenterAdmin(admin.ModelAdmin):
@@ -41,8 +41,15 @@ class AddressAdmin(admin.ModelAdmin):
     search_fields = ("street", "city", "state", "number")
 
 
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "key", "attempts", "available_at", "failed_at")
+    search_fields = ("name", "key", "last_error")
+    list_filter = ("name",)
+
+
 admin.site.register(Center, CenterAdmin)
 admin.site.register(Service, ServiceAdmin)
 admin.site.register(Comments, CommentsAdmin)
 admin.site.register(CenterService, CenterServiceAdmin)
 admin.site.register(Address, AddressAdmin)
+admin.site.register(Job, JobAdmin)
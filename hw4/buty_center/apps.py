@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ButyCenterConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "buty_center"
+
+    def ready(self):
+        from django.conf import settings
+        from . import signals  # noqa: F401
+        from .throttling import check_buckets
+
+        check_buckets(settings.THROTTLE_BUCKETS)
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.utils.encoders import JSONEncoder
+from .cache import aget_generations, get_cache, response_cache_key, stats
+from .routers import replica_reads
+from .views import CenterViewSet, ServiceViewSet, CommentsViewSet
+
+
+class AsyncReadView(View):
+    """Async-native ``list`` and ``retrieve`` of a sync viewset.
+
+    Queryset, filters, pagination and serializer are taken from ``viewset``,
+    so responses match the sync endpoints, but rows are read with the async
+    ORM: under ASGI a request waiting on the database does not hold a thread.
+    Writes stay on the sync viewsets.
+
+    Permissions of the viewset are checked without authenticating, which
+    holds for ``AllowAny``; permissions reading ``request.user`` would need
+    the sync ORM.
+    """
+
+    viewset = None
+
+    async def get(self, request, *args, **kwargs):
+        action = "retrieve" if "pk" in kwargs else "list"
+        view = self.viewset(action_map={"get": action}, args=args, kwargs=kwargs)
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.format_kwarg = None
+        try:
+            view.check_permissions(view.request)
+            dependencies = getattr(view, "cache_dependencies", ())
+            if not dependencies:
+                return self.render(await self.get_data(view, action, kwargs))
+
+            # Тот же кеш по поколениям моделей, что и в CachedResponseMixin
+            cache = get_cache()
+            parts = [type(view).__name__, "async", action, request.build_absolute_uri()]
+            key = response_cache_key(parts, await aget_generations(dependencies))
+            data = await cache.aget(key)
+            if data is not None:
+                stats.hit()
+                return self.render(data)
+            stats.miss()
+            # Как и в CachedResponseMixin, кешируется только прочитанное с primary
+            with replica_reads(False):
+                data = await self.get_data(view, action, kwargs)
+            await cache.aset(key, data, getattr(settings, "API_CACHE_TIMEOUT", 300))
+            return self.render(data)
+        except APIException as e:
+            detail = (
+                e.detail if isinstance(e.detail, (list, dict)) else {"detail": e.detail}
+            )
+            return self.render(detail, status=e.status_code)
+
+    async def get_data(self, view, action, kwargs):
+        if action == "retrieve":
+            return await self.retrieve(view, kwargs["pk"])
+        return await self.list(view)
+
+    async def list(self, view):
+        queryset = view.filter_queryset(view.get_queryset())
+        rows = await view.paginator.apaginate_queryset(queryset, view.request, view)
+        serializer = view.get_serializer(rows, many=True)
+        return view.paginator.get_paginated_data(serializer.data)
+
+    async def retrieve(self, view, pk):
+        queryset = view.get_queryset()
+        try:
+            instance = await queryset.aget(pk=pk)
+        except ObjectDoesNotExist:
+            name = queryset.model._meta.object_name
+            raise NotFound(f"No {name} matches the given query.")
+        return view.get_serializer(instance).data
+
+    @staticmethod
+    def render(data, status=200):
+        return JsonResponse(
+            data,
+            status=status,
+            safe=False,
+            encoder=JSONEncoder,
+            json_dumps_params={"ensure_ascii": False, "separators": (",", ":")},
+        )
+
+
+class AsyncCenterView(AsyncReadView):
+    viewset = CenterViewSet
+
+
+class AsyncServiceView(AsyncReadView):
+    viewset = ServiceViewSet
+
+
+class AsyncCommentsView(AsyncReadView):
+    viewset = CommentsViewSet
@@ -0,0 +1,167 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from .cache import CacheStats
+
+stats = CacheStats()
+
+
+class TokenCache:
+    """Bounded LRU of resolved tokens whose entries expire after a TTL.
+
+    Size and TTL are read from ``AUTH_TOKEN_CACHE_SIZE`` and
+    ``AUTH_TOKEN_CACHE_TTL`` on every call, so they follow settings changes.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return settings.AUTH_TOKEN_CACHE_SIZE
+
+    @property
+    def ttl(self):
+        return settings.AUTH_TOKEN_CACHE_TTL
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            keys = [
+                key
+                for key, (resolution, _) in self._entries.items()
+                if resolution["token"]["user_id"] == user_id
+            ]
+            for key in keys:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+def get_shared_cache():
+    alias = settings.AUTH_TOKEN_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    # Сам токен в ключ не попадает: ключи кеша видны в memcached/redis
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+# Хеш пароля не должен попадать в кеши, тем более в общий redis/memcached;
+# у восстановленного пользователя поле отложено и читается из базы
+SECRET_FIELDS = {"password"}
+
+
+def _snapshot(instance):
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in SECRET_FIELDS
+    }
+
+
+def _restore(model, values):
+    return model.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+def forget_token(key):
+    """Drop a token from the local and the shared cache."""
+    token_cache.delete(key)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+
+
+def forget_user(user_id):
+    """Drop cached tokens of a user, e.g. after deactivation."""
+    token_cache.delete_user(user_id)
+    for key in Token.objects.filter(user_id=user_id).values_list("key", flat=True):
+        forget_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that caches token to user resolutions.
+
+    Resolutions are kept in the in-process LRU and, when
+    ``AUTH_TOKEN_CACHE_ALIAS`` is set, in that shared cache. Deleting a token
+    or saving its user invalidates both in this process; other processes
+    keep their local entry for at most ``AUTH_TOKEN_CACHE_TTL`` seconds.
+
+    Only field values, without the password hash, are cached; every
+    request gets its own user and token
+    instances, so attributes set on ``request.user`` do not leak between
+    requests and threads.
+    """
+
+    def authenticate_credentials(self, key):
+        ttl = token_cache.ttl
+        if ttl <= 0:
+            return super().authenticate_credentials(key)
+
+        resolved = token_cache.get(key)
+        if resolved is None:
+            shared = get_shared_cache()
+            if shared is not None:
+                resolved = shared.get(_shared_key(key))
+                if resolved is not None:
+                    token_cache.set(key, resolved)
+        if resolved is not None:
+            stats.hit()
+            return self.restore(resolved)
+
+        stats.miss()
+        user, token = super().authenticate_credentials(key)
+        resolved = {"user": _snapshot(user), "token": _snapshot(token)}
+        token_cache.set(key, resolved)
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.set(_shared_key(key), resolved, ttl)
+        return user, token
+
+    def restore(self, resolved):
+        token_model = self.get_model()
+        user = _restore(token_model.user.field.related_model, resolved["user"])
+        token = _restore(token_model, resolved["token"])
+        token.user = user
+        return user, token
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from .hashing import check_password, hash_password
+
+
+class PooledModelBackend(ModelBackend):
+    """``ModelBackend`` that verifies passwords in the hashing pool.
+
+    Used by the token login and the session login of the browsable API.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Хешируем и для несуществующих пользователей, чтобы по времени
+            # ответа нельзя было перебирать имена
+            hash_password(password)
+            return None
+
+        is_correct, must_update = check_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = hash_password(password)
+            user.save(update_fields=["password"])
+        return user
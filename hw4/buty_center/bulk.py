@@ -0,0 +1,266 @@
+import zlib
+from abc import ABC, abstractmethod
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .cache import invalidate_model
+from .models import Address, Center, Service, CenterService
+from .profiles import update_profiles
+from .search import update_search_index
+
+BATCH_SIZE = 1000
+
+ADDRESS_FIELDS = ["street", "city", "state", "number", "latitude", "longitude"]
+
+
+class BulkCenterServiceSerializer(serializers.Serializer):
+    # Существование center/service проверяется пачкой в check_link_references,
+    # а не отдельным запросом на каждый элемент
+    center = serializers.UUIDField()
+    service = serializers.UUIDField()
+    description = serializers.CharField()
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        end = start + size
+        yield values[start:end]
+
+
+def _fetch_in(queryset, field, values):
+    """Fetch rows whose ``field`` is in ``values``, chunking the IN list."""
+    rows = []
+    for chunk in _chunks(set(values)):
+        rows.extend(queryset.filter(**{f"{field}__in": chunk}))
+    return rows
+
+
+def _lock_upserts(model):
+    """Serialize bulk upserts of ``model`` until the transaction ends.
+
+    ``select_for_update`` locks only the rows already matched, so two
+    requests with the same new key would both insert it. On PostgreSQL a
+    transaction-level advisory lock orders them; SQLite has a single writer.
+    """
+    if connection.vendor != "postgresql":
+        return
+    key = zlib.crc32(f"bulk-upsert:{model._meta.db_table}".encode())
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+
+
+@transaction.atomic
+def upsert_centers(items):
+    """Create or update centers with their addresses by ``(name, phone)``.
+
+    Address fields missing from an item, e.g. coordinates filled by the
+    geocoder, keep their stored values.
+
+    Returns:
+        Tuple of center ids aligned with ``items``, number of created and
+        number of updated centers, whose address changed.
+    """
+    _lock_upserts(Center)
+    keys = [(item["name"], item["phone"]) for item in items]
+    existing = {}
+    centers_queryset = (
+        Center.objects.select_related("address")
+        .defer("search_document", "search_vector")
+        .select_for_update()
+    )
+    for center in _fetch_in(centers_queryset, "name", [name for name, _ in keys]):
+        existing.setdefault((center.name, center.phone), center)
+    # Повторы ключа внутри запроса: побеждает последний элемент
+    latest = dict(zip(keys, items))
+
+    now = timezone.now()
+    centers = {}
+    new_addresses, new_centers = [], []
+    changed_addresses, changed_centers = [], []
+    for key, item in latest.items():
+        center = existing.get(key)
+        if center is None:
+            address = Address(**item["address"])
+            center = Center(name=item["name"], phone=item["phone"], address=address)
+            new_addresses.append(address)
+            new_centers.append(center)
+        else:
+            address = center.address
+            values = {
+                name: item["address"].get(name, getattr(address, name))
+                for name in ADDRESS_FIELDS
+            }
+            if any(getattr(address, name) != value for name, value in values.items()):
+                for name, value in values.items():
+                    setattr(address, name, value)
+                address.updated_at = now
+                changed_addresses.append(address)
+                center.updated_at = now
+                changed_centers.append(center)
+        centers[key] = center
+
+    Address.objects.bulk_create(new_addresses, batch_size=BATCH_SIZE)
+    Center.objects.bulk_create(new_centers, batch_size=BATCH_SIZE)
+    Address.objects.bulk_update(
+        changed_addresses, [*ADDRESS_FIELDS, "updated_at"], batch_size=BATCH_SIZE
+    )
+    Center.objects.bulk_update(changed_centers, ["updated_at"], batch_size=BATCH_SIZE)
+    center_ids = [center.pk for center in new_centers + changed_centers]
+    update_search_index(center_ids)
+    update_profiles(center_ids)
+    invalidate_model(Address)
+    invalidate_model(Center)
+    ids = [centers[key].pk for key in keys]
+    return ids, len(new_centers), len(changed_centers)
+
+
+@transaction.atomic
+def upsert_services(items):
+    """Create services missing by ``(name, category)``.
+
+    Returns:
+        Tuple of service ids aligned with ``items``, number of created and
+        number of updated services. Services have no other fields, so the
+        latter is always zero.
+    """
+    _lock_upserts(Service)
+    keys = [(item["name"], item["category"]) for item in items]
+    services = {}
+    queryset = Service.objects.select_for_update()
+    for service in _fetch_in(queryset, "name", [name for name, _ in keys]):
+        services.setdefault((service.name, service.category), service)
+    new_services = []
+    for key in dict.fromkeys(keys):
+        if key not in services:
+            services[key] = Service(name=key[0], category=key[1])
+            new_services.append(services[key])
+
+    Service.objects.bulk_create(new_services, batch_size=BATCH_SIZE)
+    invalidate_model(Service)
+    return [services[key].pk for key in keys], len(new_services), 0
+
+
+def check_link_references(items):
+    """Return per-item errors for unknown centers and services, or ``None``."""
+    centers = {
+        center.pk
+        for center in _fetch_in(
+            Center.objects.only("id"), "pk", [item["center"] for item in items]
+        )
+    }
+    services = {
+        service.pk
+        for service in _fetch_in(
+            Service.objects.only("id"), "pk", [item["service"] for item in items]
+        )
+    }
+    errors = []
+    for item in items:
+        error = {}
+        if item["center"] not in centers:
+            error["center"] = ["Invalid Center ID."]
+        if item["service"] not in services:
+            error["service"] = ["Invalid Service ID."]
+        errors.append(error or None)
+    return errors if any(errors) else None
+
+
+@transaction.atomic
+def upsert_center_services(items):
+    """Create links or update their description by ``(center, service)``.
+
+    Returns:
+        Tuple of link ids aligned with ``items``, number of created links and
+        number of links whose description changed.
+    """
+    _lock_upserts(CenterService)
+    keys = [(item["center"], item["service"]) for item in items]
+    links = {}
+    queryset = CenterService.objects.select_for_update()
+    for link in _fetch_in(queryset, "center", [center for center, _ in keys]):
+        links.setdefault((link.center_id, link.service_id), link)
+    latest = dict(zip(keys, items))
+
+    now = timezone.now()
+    new_links, changed_links = [], []
+    for key, item in latest.items():
+        link = links.get(key)
+        if link is None:
+            links[key] = CenterService(
+                center_id=key[0], service_id=key[1], description=item["description"]
+            )
+            new_links.append(links[key])
+        elif link.description != item["description"]:
+            link.description = item["description"]
+            link.updated_at = now
+            changed_links.append(link)
+
+    CenterService.objects.bulk_create(new_links, batch_size=BATCH_SIZE)
+    CenterService.objects.bulk_update(
+        changed_links, ["description", "updated_at"], batch_size=BATCH_SIZE
+    )
+    touched = new_links + changed_links
+    for chunk in _chunks({link.center_id for link in touched}):
+        Center.objects.filter(pk__in=chunk).update(updated_at=now)
+    for chunk in _chunks({link.service_id for link in touched}):
+        Service.objects.filter(pk__in=chunk).update(updated_at=now)
+    center_ids = {link.center_id for link in touched}
+    update_search_index(center_ids)
+    update_profiles(center_ids)
+    invalidate_model(CenterService)
+    return [links[key].pk for key in keys], len(new_links), len(changed_links)
+
+
+class BulkUpsertMixin(ABC):
+    """``POST <list>/bulk/`` accepting an array of items.
+
+    All items are validated first; if any of them is invalid nothing is
+    written and the errors are returned aligned with the payload. Otherwise
+    the rows are written with ``bulk_create``/``bulk_update`` in one
+    transaction, matching existing rows by the natural key of the model.
+    Subclasses implement ``bulk_upsert``.
+    """
+
+    bulk_serializer_class = None
+    bulk_max_items = 10000
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not 0 < len(items) <= self.bulk_max_items:
+            return Response(
+                {"error": f"Expected a list of 1 to {self.bulk_max_items} items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # many=True строит поля сериализатора один раз на весь массив
+        serializer = self.bulk_serializer_class(data=items, many=True)
+        if serializer.is_valid():
+            validated = serializer.validated_data
+            errors = self.check_bulk_references(validated)
+        else:
+            errors = [error or None for error in serializer.errors]
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids, created, updated = self.bulk_upsert(validated)
+        return Response(
+            {"ids": ids, "created": created, "updated": updated},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def check_bulk_references(self, items):
+        return None
+
+    @abstractmethod
+    def bulk_upsert(self, items):
+        """Write validated ``items``.
+
+        Returns:
+            Tuple of row ids aligned with ``items``, number of created and
+            number of updated rows.
+        """
@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+from .routers import replica_reads
+
+
+class CacheStats:
+    """Hit and miss counters of a cache in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def _generation_key(model):
+    return f"api-cache:generation:{model._meta.label_lower}"
+
+
+def get_generations(models):
+    """Return current generations of the models, creating missing ones.
+
+    A missing generation starts from the current time, so responses cached
+    before the generation key was evicted can never be matched again.
+    """
+    cache = get_cache()
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+async def aget_generations(models):
+    """Async version of ``get_generations``."""
+    cache = get_cache()
+    keys = [_generation_key(model) for model in models]
+    generations = await cache.aget_many(keys)
+    for key in keys:
+        if key not in generations:
+            await cache.aadd(key, time.time_ns(), None)
+            generations[key] = await cache.aget(key)
+    return [generations[key] for key in keys]
+
+
+def response_cache_key(parts, generations):
+    raw = "|".join([*parts, ",".join(str(generation) for generation in generations)])
+    return "api-cache:response:" + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _bump(model):
+    cache = get_cache()
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_model(model):
+    """Drop cached responses that depend on ``model``.
+
+    The generation is bumped right away and once more after commit: a reader
+    that cached the old rows between the write and the commit would otherwise
+    keep serving them under the new generation.
+    """
+    _bump(model)
+    transaction.on_commit(lambda: _bump(model))
+
+
+class CachedResponseMixin:
+    """Read-through cache for ``list`` and ``retrieve`` of a viewset.
+
+    Cached data is keyed by the request URL, the response format and the
+    generations of ``cache_dependencies``, which are bumped from model
+    signals, so a write makes every dependent response unreachable.
+
+    Misses are built from the primary: a lagging replica read after a write
+    would store the old rows under the new generation.
+    """
+
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request):
+        parts = [
+            self.basename,
+            self.action,
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+        ]
+        return response_cache_key(parts, get_generations(self.cache_dependencies))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            stats.hit()
+            return Response(data)
+
+        stats.miss()
+        with replica_reads(False):
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = getattr(settings, "API_CACHE_TIMEOUT", 300)
+            cache.set(key, response.data, timeout)
+        return response
@@ -0,0 +1,97 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from .cache import get_cache, get_generations, response_cache_key
+from .routers import replica_reads
+
+
+class ConditionalResponseMixin:
+    """ETag and Last-Modified for ``list`` and ``retrieve`` of a viewset.
+
+    Validators come from one aggregate query over the requested rows: the
+    latest ``updated_at`` and the number of rows. Deleting a row changes the
+    count and any other write moves ``updated_at``, so matching validators
+    mean the payload is unchanged and 304 is sent without serialization.
+
+    The aggregate runs only when the generations of ``validator_dependencies``
+    (``cache_dependencies`` by default) changed since it was last cached.
+    The generations are part of the ETag, so writes to related models that
+    do not move ``updated_at``, e.g. a renamed comment author, change it too.
+    """
+
+    validator_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            queryset, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            queryset, super().retrieve, request, *args, **kwargs
+        )
+
+    def get_validators(self, request, queryset):
+        parts = [
+            self.basename,
+            self.action,
+            request.get_full_path(),
+            request.accepted_renderer.format,
+        ]
+        dependencies = self.validator_dependencies or getattr(
+            self, "cache_dependencies", ()
+        )
+        if not dependencies:
+            return self.compute_validators(parts, queryset)
+
+        generations = get_generations(dependencies)
+        cache = get_cache()
+        key = response_cache_key(["validators", *parts], generations)
+        validators = cache.get(key)
+        if validators is None:
+            # Как и закешированные ответы, валидаторы читаются с primary
+            with replica_reads(False):
+                validators = self.compute_validators(
+                    [*parts, *map(str, generations)], queryset
+                )
+            cache.set(key, validators, getattr(settings, "API_CACHE_TIMEOUT", 300))
+        return validators
+
+    def compute_validators(self, parts, queryset):
+        state = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        if state["last_modified"] is None:
+            return None, None
+        raw = "|".join(
+            [*parts, state["last_modified"].isoformat(), str(state["count"])]
+        )
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        return etag, int(state["last_modified"].timestamp())
+
+    def conditional_response(self, queryset, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, queryset)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if 200 <= response.status_code < 400:
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+        return response
@@ -0,0 +1,121 @@
+import csv
+import json
+from uuid import UUID
+
+from .filters import parse_moment
+from .models import Center, Comments, CenterService
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Ресурс: (queryset, колонки выгрузки, поле центра, есть ли created_at)
+RESOURCES = {
+    "comments": (
+        Comments.objects.order_by("created_at", "id"),
+        {
+            "id": "id",
+            "center": "center_id",
+            "user": "user__username",
+            "content": "content",
+            "mark": "mark",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+        "center_id",
+        True,
+    ),
+    "centers": (
+        Center.objects.order_by("name", "id"),
+        {
+            "id": "id",
+            "name": "name",
+            "phone": "phone",
+            "rating_avg": "rating_avg",
+            "rating_count": "rating_count",
+            "street": "address__street",
+            "city": "address__city",
+            "state": "address__state",
+            "number": "address__number",
+            "updated_at": "updated_at",
+        },
+        "pk",
+        False,
+    ),
+    "center-services": (
+        CenterService.objects.order_by("center_id", "id"),
+        {
+            "id": "id",
+            "center": "center_id",
+            "service": "service_id",
+            "service_name": "service__name",
+            "category": "service__category",
+            "description": "description",
+            "updated_at": "updated_at",
+        },
+        "center_id",
+        False,
+    ),
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_rows(resource, center=None, created_after=None, created_before=None):
+    """Return column names and a lazy iterator over rows of ``resource``.
+
+    Rows are read with ``iterator(chunk_size=...)`` (a server-side cursor on
+    PostgreSQL), so at most one chunk is held in memory at a time.
+    """
+    if resource not in RESOURCES:
+        raise ExportError(f"Unknown resource {resource!r}.")
+    queryset, columns, center_field, has_created = RESOURCES[resource]
+    if (created_after or created_before) and not has_created:
+        raise ExportError(f"{resource} cannot be filtered by created_at.")
+    try:
+        if center:
+            queryset = queryset.filter(**{center_field: UUID(str(center))})
+        if created_after:
+            queryset = queryset.filter(created_at__gte=parse_moment(created_after))
+        if created_before:
+            queryset = queryset.filter(created_at__lt=parse_moment(created_before))
+    except (TypeError, ValueError):
+        raise ExportError("Invalid filter value.")
+
+    rows = queryset.values_list(*columns.values()).iterator(chunk_size=CHUNK_SIZE)
+    return list(columns), rows
+
+
+def _value(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """File-like object for ``csv.writer`` that returns what is written."""
+
+    def write(self, value):
+        return value
+
+
+def render_lines(columns, rows, file_format):
+    """Yield the export encoded as NDJSON or CSV lines."""
+    if file_format == "ndjson":
+        for row in rows:
+            record = dict(zip(columns, map(_value, row)))
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    elif file_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_value(value) for value in row])
+    else:
+        raise ExportError(f"Unknown format {file_format!r}.")
@@ -0,0 +1,72 @@
+from datetime import datetime, time
+from uuid import UUID
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+def parse_moment(value):
+    """Parse ISO datetime or date into an aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.get_current_timezone())
+    return moment
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """Translate query parameters into ORM lookups.
+
+    The view declares ``query_filters`` as a mapping of query parameter to
+    ``(lookup, parser)``, e.g. ``{"mark_min": ("mark__gte", float)}``. All
+    predicates are applied in SQL with a single ``filter`` call, so they can be
+    served by the indexes of the model.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        errors = {}
+        for param, (lookup, parser) in getattr(view, "query_filters", {}).items():
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                lookups[lookup] = parser(value)
+            except (TypeError, ValueError):
+                errors[param] = ["Invalid value."]
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**lookups)
+
+
+CENTER_FILTERS = {
+    "rating_min": ("rating_avg__gte", float),
+    "rating_max": ("rating_avg__lte", float),
+    "rating_count_min": ("rating_count__gte", int),
+}
+
+SERVICE_FILTERS = {
+    "category": ("category", str),
+    "center": ("centerservice__center", UUID),
+}
+
+CENTER_SERVICE_FILTERS = {
+    "center": ("center", UUID),
+    "service": ("service", UUID),
+    "category": ("service__category", str),
+}
+
+COMMENT_FILTERS = {
+    "center": ("center", UUID),
+    "user": ("user", int),
+    "mark_min": ("mark__gte", float),
+    "mark_max": ("mark__lte", float),
+    "created_after": ("created_at__gte", parse_moment),
+    "created_before": ("created_at__lt", parse_moment),
+}
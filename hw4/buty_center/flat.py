@@ -0,0 +1,183 @@
+from functools import cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Поля, чье to_representation сводится к приведению типа
+CONVERTERS = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.BooleanField: bool,
+}
+
+
+class IsoDateTime:
+    """``DateTimeField`` output in ISO 8601.
+
+    ``DateTimeField.to_representation`` looks up the current timezone for
+    every value, which dominates the cost of a row; ``bind`` looks it up
+    once per page.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def bind(self):
+        if not settings.USE_TZ or getattr(self.field, "timezone", None) is not None:
+            return self.field.to_representation
+        current = timezone.get_current_timezone()
+
+        def convert(value):
+            if value.tzinfo is None:
+                return self.field.to_representation(value)
+            value = value.astimezone(current).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+
+
+def _converter(field):
+    """Return the function turning a column value into the field output.
+
+    ``None`` means the value is output as is.
+    """
+    if type(field) in CONVERTERS:
+        return CONVERTERS[type(field)]
+    if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+    if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if type(field) is serializers.DateTimeField:
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format and output_format.lower() == ISO_8601:
+            return IsoDateTime(field)
+    if isinstance(
+        field,
+        (
+            serializers.BaseSerializer,
+            serializers.RelatedField,
+            serializers.SerializerMethodField,
+            ManyRelatedField,
+        ),
+    ):
+        raise ImproperlyConfigured(f"Field {field.field_name!r} can not be flattened.")
+    return field.to_representation
+
+
+class FlatSerializer:
+    """Output of a ``ModelSerializer`` built from ``.values()`` rows.
+
+    Fields of the serializer are compiled once into ``(name, column,
+    converter)`` columns, so a row costs one dict lookup and at most one
+    conversion per field instead of model instantiation and the field by
+    field ``to_representation`` of DRF. Many-to-many primary keys are read
+    with one extra query per page.
+
+    Supported fields are scalars, primary key relations and the lists of
+    primary keys of a many-to-many relation; anything else, e.g. nested
+    serializers, raises ``ImproperlyConfigured``.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.columns = []
+        self.many = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            source = "__".join(field.source_attrs)
+            if (
+                isinstance(field, ManyRelatedField)
+                and isinstance(field.child_relation, PrimaryKeyRelatedField)
+                and field.child_relation.pk_field is None
+            ):
+                self.many.append((name, source))
+            else:
+                self.columns.append((name, source, _converter(field)))
+        self.fields = [column for _, column, _ in self.columns]
+
+    def values(self, queryset, extra=()):
+        """Return ``queryset`` as dict rows with the columns and ``extra``."""
+        fields = dict.fromkeys([*self.fields, "pk", *extra])
+        return queryset.prefetch_related(None).values(*fields)
+
+    def to_representation(self, rows):
+        columns = [
+            (
+                name,
+                column,
+                convert.bind() if isinstance(convert, IsoDateTime) else convert,
+            )
+            for name, column, convert in self.columns
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in columns:
+                value = row[column]
+                item[name] = (
+                    value if value is None or convert is None else convert(value)
+                )
+            data.append(item)
+        for name, source in self.many:
+            related = self.related_keys(source, [row["pk"] for row in rows])
+            for item, row in zip(data, rows):
+                item[name] = related.get(row["pk"], [])
+        return data
+
+    def related_keys(self, source, pks):
+        # Порядок как у instance.<source>.all(): по ordering связанной модели
+        related_model = self.model._meta.get_field(source).related_model
+        ordering = [
+            f"-{source}__{field[1:]}" if field.startswith("-") else f"{source}__{field}"
+            for field in related_model._meta.ordering
+        ]
+        pairs = (
+            self.model._default_manager.filter(
+                pk__in=pks, **{f"{source}__isnull": False}
+            )
+            .order_by(*ordering, f"{source}__pk")
+            .values_list("pk", source)
+        )
+        related = {}
+        for pk, related_pk in pairs:
+            related.setdefault(pk, []).append(related_pk)
+        return related
+
+
+@cache
+def get_flat_serializer(serializer_class):
+    return FlatSerializer(serializer_class)
+
+
+class FlatListMixin:
+    """``list`` of a viewset serialized with ``FlatSerializer``.
+
+    Set ``flat_serializer_class`` to the ``ModelSerializer`` whose output is
+    reproduced; filters, ordering and keyset pagination of the viewset apply
+    unchanged. Other actions use ``serializer_class`` as usual.
+    """
+
+    flat_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.flat_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        flat = get_flat_serializer(self.flat_serializer_class)
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is None:
+            return Response(flat.to_representation(list(flat.values(queryset))))
+
+        page = paginator.get_page_queryset(queryset, request, self)
+        ordering = [field.lstrip("-") for field in paginator.ordering]
+        rows = paginator.set_page(list(flat.values(page, extra=ordering)))
+        return paginator.get_paginated_response(flat.to_representation(rows))
@@ -0,0 +1,191 @@
+import csv
+import math
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .cache import invalidate_model
+from .models import Address, Center
+from .profiles import update_profiles
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is in requirements.txt
+    numpy = None
+
+EARTH_RADIUS_KM = 6371.0088
+
+BATCH_SIZE = 1000
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return the latitude range and longitude ranges covering a circle.
+
+    A box crossing the antimeridian is split into two longitude ranges; near
+    the poles the box spans all longitudes.
+    """
+    delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - delta, latitude + delta
+    if min_lat <= -90 or max_lat >= 90:
+        return (max(min_lat, -90), min(max_lat, 90)), [(-180, 180)]
+
+    lon_delta = math.degrees(
+        math.asin(
+            math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+        )
+    )
+    min_lon, max_lon = longitude - lon_delta, longitude + lon_delta
+    if min_lon < -180:
+        ranges = [(min_lon + 360, 180), (-180, max_lon)]
+    elif max_lon > 180:
+        ranges = [(min_lon, 180), (-180, max_lon - 360)]
+    else:
+        ranges = [(min_lon, max_lon)]
+    return (min_lat, max_lat), ranges
+
+
+def _haversine(latitude, longitude, other_lat, other_lon):
+    lat1, lat2 = math.radians(latitude), math.radians(other_lat)
+    dlat = lat2 - lat1
+    dlon = math.radians(other_lon - longitude)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Return great-circle distances in km from one point to many points.
+
+    Uses NumPy from ``requirements.txt``; installs without it fall back to
+    a plain loop.
+    """
+    if numpy is None:
+        return [
+            _haversine(latitude, longitude, other_lat, other_lon)
+            for other_lat, other_lon in zip(latitudes, longitudes)
+        ]
+    lat1 = math.radians(latitude)
+    lat2 = numpy.radians(numpy.asarray(latitudes, dtype=float))
+    dlat = lat2 - lat1
+    dlon = numpy.radians(numpy.asarray(longitudes, dtype=float) - longitude)
+    a = (
+        numpy.sin(dlat / 2) ** 2
+        + math.cos(lat1) * numpy.cos(lat2) * numpy.sin(dlon / 2) ** 2
+    )
+    return (
+        2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+    ).tolist()
+
+
+def nearest_centers(latitude, longitude, radius_km, limit):
+    """Return up to ``limit`` ``(center_id, distance_km)`` pairs, nearest first.
+
+    Candidates are read with a bounding-box filter and only they are ranked
+    by exact distance. The ``(latitude, longitude)`` B-tree bounds the scan
+    by latitude alone: the whole latitude band around the point is read and
+    longitude is checked on each index entry of it. A spatial (GiST) index
+    would narrow both coordinates, but needs PostGIS or a point column.
+    """
+    (min_lat, max_lat), lon_ranges = bounding_box(latitude, longitude, radius_km)
+    lon_filter = Q()
+    for min_lon, max_lon in lon_ranges:
+        lon_filter |= Q(address__longitude__range=(min_lon, max_lon))
+    candidates = list(
+        Center.objects.filter(
+            lon_filter, address__latitude__range=(min_lat, max_lat)
+        ).values_list("id", "address__latitude", "address__longitude")
+    )
+    if not candidates:
+        return []
+
+    ids, latitudes, longitudes = zip(*candidates)
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    ranked = sorted(
+        (
+            (distance, str(pk), pk)
+            for pk, distance in zip(ids, distances)
+            if distance <= radius_km
+        )
+    )
+    return [(pk, distance) for distance, _, pk in ranked[:limit]]
+
+
+def _normalize(*values):
+    return tuple(" ".join(str(value).lower().split()) for value in values)
+
+
+class GazetteerGeocoder:
+    """Offline geocoder over a CSV gazetteer.
+
+    The file has ``city``, ``latitude`` and ``longitude`` columns and
+    optional ``street`` and ``number`` columns. An address is resolved by
+    the most specific matching row: city, street and number, then city and
+    street, then the city alone.
+    """
+
+    def __init__(self, path):
+        self.places = {}
+        with open(path, newline="", encoding="utf-8") as gazetteer:
+            for row in csv.DictReader(gazetteer):
+                key = _normalize(
+                    *(
+                        row[column]
+                        for column in ("city", "street", "number")
+                        if row.get(column)
+                    )
+                )
+                self.places[key] = (float(row["latitude"]), float(row["longitude"]))
+
+    def __call__(self, address):
+        for key in (
+            _normalize(address.city, address.street, address.number),
+            _normalize(address.city, address.street),
+            _normalize(address.city),
+        ):
+            if key in self.places:
+                return self.places[key]
+        return None
+
+
+def geocode_addresses(geocoder, addresses):
+    """Fill coordinates of ``addresses`` with ``geocoder``.
+
+    ``geocoder`` is any callable taking an address and returning
+    ``(latitude, longitude)`` or ``None``. Addresses are written with
+    ``bulk_update``; the centers using them are marked as changed and their
+    profiles are rebuilt.
+
+    Returns:
+        Number of geocoded addresses.
+    """
+    now = timezone.now()
+    geocoded = 0
+    batch = []
+
+    def flush():
+        with transaction.atomic():
+            Address.objects.bulk_update(
+                batch, ["latitude", "longitude", "updated_at"], batch_size=BATCH_SIZE
+            )
+            centers = Center.objects.filter(address__in=batch)
+            centers.update(updated_at=now)
+            update_profiles(centers.values_list("id", flat=True))
+        batch.clear()
+
+    for address in addresses.iterator(chunk_size=BATCH_SIZE):
+        point = geocoder(address)
+        if point is None:
+            continue
+        address.latitude, address.longitude = point
+        address.updated_at = now
+        batch.append(address)
+        geocoded += 1
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+    invalidate_model(Address)
+    invalidate_model(Center)
+    return geocoded
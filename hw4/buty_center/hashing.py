@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Server is busy, try again later."
+    default_code = "hashing_unavailable"
+    # DRF отдает wait в заголовке Retry-After
+    wait = 1
+
+
+def _init_worker(settings_module):
+    # Процессы пула запускаются через spawn и настраивают Django заново;
+    # поэтому модуль импортирует только то, что не требует загруженных apps
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+class HashingPool:
+    """Process pool for password hashing with a bounded queue.
+
+    PBKDF2 takes a core for ~100ms per password; hashing in the pool spreads
+    it over ``PASSWORD_HASHING_WORKERS`` processes while the request thread
+    only waits for the result. At most ``PASSWORD_HASHING_QUEUE`` passwords
+    wait for a free process, a call beyond that raises ``HashingUnavailable``
+    at once instead of piling up requests. With 0 workers passwords are
+    hashed in the calling thread.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self):
+        return settings.PASSWORD_HASHING_WORKERS
+
+    def get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get("DJANGO_SETTINGS_MODULE"),),
+                )
+                self._slots = threading.BoundedSemaphore(
+                    self.workers + settings.PASSWORD_HASHING_QUEUE
+                )
+            return self._executor, self._slots
+
+    def run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+
+        executor, slots = self.get_executor()
+        if not slots.acquire(blocking=False):
+            raise HashingUnavailable()
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self.shutdown()
+            raise HashingUnavailable()
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+        # До Python 3.11 это не встроенный TimeoutError
+        except FutureTimeoutError:
+            raise HashingUnavailable()
+        except BrokenProcessPool:
+            # Упавший процесс ломает весь пул: следующий вызов создаст новый
+            self.shutdown()
+            raise HashingUnavailable()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+            self._executor = self._slots = None
+
+
+pool = HashingPool()
+
+
+def hash_password(password):
+    """Return the encoded ``password`` hashed in the pool."""
+    return pool.run(make_password, password)
+
+
+def check_password(password, encoded):
+    """Return whether ``password`` matches ``encoded`` and whether to rehash it."""
+    return pool.run(verify_password, password, encoded)
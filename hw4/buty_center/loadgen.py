@@ -0,0 +1,374 @@
+import asyncio
+import ipaddress
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from .models import Center
+from .synthetic import USERNAME_PREFIX
+
+# Сетевые ошибки соединения, после которых оно открывается заново
+CONNECTION_ERRORS = (OSError, asyncio.IncompleteReadError, ValueError)
+
+# Сколько самых комментируемых центров выбирают сценарии
+POPULAR_CENTERS = 10000
+
+
+def is_loopback_url(url):
+    """Return whether ``url`` points at localhost or a loopback address.
+
+    Load commands write data and open hundreds of connections, so they only
+    target local servers.
+    """
+    host = urlsplit(url).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response.
+
+    Returns:
+        Tuple of the status, the keep-alive flag and the body.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip().lower()
+
+    body = b""
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            body += (await reader.readexactly(size + 2))[:size]
+            if size == 0:
+                break
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        return status, False, await reader.read()
+    return status, headers.get("connection") != "close", body
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection to the server of ``base_url``."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.netloc = parts.netloc
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=None):
+        data = b"" if body is None else json.dumps(body).encode()
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.netloc}",
+            "Accept: application/json",
+            "Connection: keep-alive",
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(data)}"]
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        try:
+            self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+            await self.writer.drain()
+            status, keep_alive, content = await read_response(self.reader)
+        except CONNECTION_ERRORS:
+            self.close()
+            raise
+        if not keep_alive:
+            self.close()
+        return status, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Recorder:
+    """Latencies and statuses of requests per endpoint."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+
+    def add(self, endpoint, latency, status):
+        if latency is not None:
+            self.latencies.setdefault(endpoint, []).append(latency)
+        self.statuses.setdefault(endpoint, Counter())[status] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, statuses in sorted(self.statuses.items()):
+            latencies = self.latencies.get(endpoint, [])
+            requests = sum(statuses.values())
+            endpoints[endpoint] = {
+                "requests": requests,
+                "errors": sum(
+                    count
+                    for status, count in statuses.items()
+                    if status == "error" or status >= 400
+                ),
+                "statuses": {str(status): count for status, count in statuses.items()},
+                "requests_per_sec": round(requests / elapsed, 1),
+                **{
+                    name: (
+                        round(percentile(latencies, fraction) * 1000, 2)
+                        if latencies
+                        else None
+                    )
+                    for name, fraction in [
+                        ("p50_ms", 0.50),
+                        ("p95_ms", 0.95),
+                        ("p99_ms", 0.99),
+                        ("max_ms", 1.0),
+                    ]
+                },
+            }
+        return endpoints
+
+
+class Context:
+    """Ids and tokens the scenarios need, read from the local database."""
+
+    def __init__(self, users):
+        page_size = api_settings.PAGE_SIZE or 20
+        self.first_page = [
+            str(pk)
+            for pk in Center.objects.order_by("name", "id").values_list(
+                "id", flat=True
+            )[:page_size]
+        ]
+        # Центры выбираются пропорционально числу отзывов, как реальные
+        # посетители чаще открывают популярные
+        popular = Center.objects.order_by("-rating_count", "id").values_list(
+            "id", "rating_count"
+        )[:POPULAR_CENTERS]
+        self.centers = [str(pk) for pk, _ in popular]
+        self.center_weights = []
+        total = 0
+        for _, count in popular:
+            total += count + 1
+            self.center_weights.append(total)
+
+        users = User.objects.filter(username__startswith=USERNAME_PREFIX).order_by(
+            "username"
+        )[:users]
+        self.tokens = [Token.objects.get_or_create(user=user)[0].key for user in users]
+
+
+class Session:
+    """A virtual user running a scenario over its own connection."""
+
+    def __init__(self, client, recorder, context, rng, token=None):
+        self.client = client
+        self.recorder = recorder
+        self.context = context
+        self.rng = rng
+        self.token = token
+
+    def popular_center(self):
+        return self.rng.choices(
+            self.context.centers, cum_weights=self.context.center_weights
+        )[0]
+
+    async def call(self, endpoint, method, path, body=None, auth=False):
+        headers = {}
+        if auth and self.token:
+            headers["Authorization"] = f"Token {self.token}"
+        started = time.perf_counter()
+        try:
+            status, _ = await self.client.request(method, path, headers, body)
+        except CONNECTION_ERRORS:
+            self.recorder.add(endpoint, None, "error")
+            return None
+        self.recorder.add(endpoint, time.perf_counter() - started, status)
+        return status
+
+
+# Сценарии повторяют запросы страниц фронтенда; имена эндпоинтов совпадают
+# с маршрутами buty_center.profiling, чтобы подставить число SQL-запросов.
+
+APP_LISTS = [
+    ("GET center-list", "/api/centers/"),
+    ("GET service-list", "/api/services/"),
+    ("GET address-list", "/api/addresses/"),
+    ("GET centerservice-list", "/api/center-services/"),
+    ("GET comments-list", "/api/comments/"),
+]
+
+
+async def app_scenario(session):
+    # App.js: списки при загрузке приложения
+    for endpoint, path in APP_LISTS:
+        await session.call(endpoint, "GET", path)
+
+
+async def _center_comments(session):
+    for center_id in session.context.first_page:
+        await session.call(
+            "GET comment-list", "GET", f"/api/centers/{center_id}/comments/", auth=True
+        )
+
+
+async def home_scenario(session):
+    # Home.js: центры из App.js и отзывы каждого из них
+    await app_scenario(session)
+    await _center_comments(session)
+
+
+async def catalog_scenario(session):
+    # Catalog.js: свой запрос центров и отзывы каждого из них
+    await session.call("GET center-list", "GET", "/api/centers/")
+    await _center_comments(session)
+
+
+async def center_page_scenario(session):
+    # CenterPage.js: страница центра одним запросом профиля
+    center_id = session.popular_center()
+    await session.call(
+        "GET center-profile", "GET", f"/api/centers/{center_id}/profile/"
+    )
+
+
+async def comment_scenario(session):
+    # CenterPage.js: отправка отзыва; упирается в THROTTLE_BUCKETS["comments"]
+    await session.call(
+        "POST comments-list",
+        "POST",
+        "/api/comments/",
+        body={
+            "center_id": session.popular_center(),
+            "content": "Отзыв нагрузочного теста",
+            "mark": session.rng.randint(1, 5),
+        },
+        auth=True,
+    )
+
+
+SCENARIOS = {
+    "app": app_scenario,
+    "home": home_scenario,
+    "catalog": catalog_scenario,
+    "center_page": center_page_scenario,
+    "comment": comment_scenario,
+}
+
+READ_SCENARIOS = ["app", "home", "catalog", "center_page"]
+
+
+async def run_scenario(base_url, scenario, context, concurrency, iterations, seed=0):
+    """Run ``scenario`` ``iterations`` times in each of ``concurrency`` users.
+
+    Returns:
+        Dict with iterations per second and per endpoint stats.
+    """
+    recorder = Recorder()
+
+    async def user(num):
+        client = Client(base_url)
+        token = context.tokens[num % len(context.tokens)] if context.tokens else None
+        session = Session(
+            client, recorder, context, random.Random(f"{seed}-{num}"), token
+        )
+        try:
+            for _ in range(iterations):
+                await scenario(session)
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(num) for num in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "iterations": concurrency * iterations,
+        "elapsed_s": round(elapsed, 3),
+        "iterations_per_sec": round(concurrency * iterations / elapsed, 1),
+        "endpoints": recorder.summary(elapsed),
+    }
+
+
+async def fetch_profiling_stats(base_url, token):
+    """Return ``/api/profiling-stats/`` of the server or ``None``."""
+    client = Client(base_url)
+    try:
+        status, content = await client.request(
+            "GET", "/api/profiling-stats/", {"Authorization": f"Token {token}"}
+        )
+    except CONNECTION_ERRORS:
+        return None
+    finally:
+        client.close()
+    return json.loads(content) if status == 200 else None
+
+
+def queries_per_request(before, after, endpoint):
+    """Mean SQL queries of ``endpoint`` between two profiling snapshots."""
+    if before is None or after is None or endpoint not in after:
+        return None
+    old = before.get(endpoint, {"requests": 0, "sql_queries": {"mean": 0}})
+    new = after[endpoint]
+    requests = new["requests"] - old["requests"]
+    if requests <= 0:
+        return None
+    total = (
+        new["sql_queries"]["mean"] * new["requests"]
+        - old["sql_queries"]["mean"] * old["requests"]
+    )
+    return round(total / requests, 2)
+
+
+def compare_results(old, new, threshold):
+    """Compare two result files endpoint by endpoint.
+
+    Returns:
+        Tuple of report lines and the number of regressions: endpoints whose
+        p95 latency grew or throughput fell by more than ``threshold``.
+    """
+    lines, regressions = [], 0
+    for scenario, result in new["scenarios"].items():
+        previous = old.get("scenarios", {}).get(scenario)
+        if previous is None:
+            continue
+        for endpoint, stats in result["endpoints"].items():
+            before = previous["endpoints"].get(endpoint)
+            if before is None or not before["p95_ms"] or not stats["p95_ms"]:
+                continue
+            latency = stats["p95_ms"] / before["p95_ms"] - 1
+            throughput = stats["requests_per_sec"] / before["requests_per_sec"] - 1
+            regressed = latency > threshold or throughput < -threshold
+            regressions += regressed
+            lines.append(
+                f"{scenario} {endpoint}: p95 {before['p95_ms']} -> "
+                f"{stats['p95_ms']} ms ({latency:+.0%}), "
+                f"{before['requests_per_sec']} -> {stats['requests_per_sec']} "
+                f"req/s ({throughput:+.0%})" + (" REGRESSION" if regressed else "")
+            )
+    return lines, regressions
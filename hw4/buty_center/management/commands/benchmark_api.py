@@ -0,0 +1,163 @@
+import asyncio
+import json
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from buty_center.loadgen import (
+    READ_SCENARIOS,
+    SCENARIOS,
+    Context,
+    compare_results,
+    fetch_profiling_stats,
+    is_loopback_url,
+    queries_per_request,
+    run_scenario,
+)
+from buty_center.models import Center, CenterService, Comments, Service
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(settings.BASE_DIR),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the frontend's request scenarios against a local server filled "
+        "by 'manage.py generate_data' and report throughput, latency "
+        "percentiles and SQL queries per endpoint. Query counts need the "
+        "server to run with PROFILING_ENABLED=1 and an --admin user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help=f"Scenario to run, can be repeated; {', '.join(READ_SCENARIOS)} "
+            "by default.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Virtual users."
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Scenario runs per virtual user.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--admin", help="Staff username to read /api/profiling-stats/ as."
+        )
+        parser.add_argument("--output", help="Write results as JSON to this file.")
+        parser.add_argument("--compare", help="JSON results of an earlier run.")
+        parser.add_argument(
+            "--regression-threshold",
+            type=float,
+            default=0.2,
+            help="Relative p95 or throughput change counted as a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if --compare finds regressions.",
+        )
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/")
+        if not base_url.startswith("http://"):
+            raise CommandError(f"Expected http://..., got {base_url!r}.")
+        # Сценарии пишут данные и выдают токен администратора: только локально
+        if not is_loopback_url(base_url):
+            raise CommandError(
+                f"{base_url!r} is not a loopback address, benchmark a local server."
+            )
+        if not Center.objects.exists():
+            raise CommandError("No centers, run 'manage.py generate_data' first.")
+
+        admin_token = None
+        if options["admin"]:
+            try:
+                admin = User.objects.get(username=options["admin"], is_staff=True)
+            except User.DoesNotExist:
+                raise CommandError(f"No staff user {options['admin']!r}.")
+            admin_token = Token.objects.get_or_create(user=admin)[0].key
+
+        context = Context(options["concurrency"])
+        results = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "commit": _git_commit(),
+                "base_url": base_url,
+                "concurrency": options["concurrency"],
+                "iterations": options["iterations"],
+                "seed": options["seed"],
+                "dataset": {
+                    "centers": Center.objects.count(),
+                    "services": Service.objects.count(),
+                    "center_services": CenterService.objects.count(),
+                    "users": User.objects.count(),
+                    "comments": Comments.objects.count(),
+                },
+            },
+            "scenarios": {},
+        }
+
+        for name in options["scenario"] or READ_SCENARIOS:
+            before = after = None
+            if admin_token:
+                before = asyncio.run(fetch_profiling_stats(base_url, admin_token))
+            result = asyncio.run(
+                run_scenario(
+                    base_url,
+                    SCENARIOS[name],
+                    context,
+                    options["concurrency"],
+                    options["iterations"],
+                    seed=options["seed"],
+                )
+            )
+            if admin_token:
+                after = asyncio.run(fetch_profiling_stats(base_url, admin_token))
+            for endpoint, stats in result["endpoints"].items():
+                stats["sql_queries"] = queries_per_request(before, after, endpoint)
+            results["scenarios"][name] = result
+
+            self.stdout.write(f"{name}: {result['iterations_per_sec']} iterations/s")
+            for endpoint, stats in result["endpoints"].items():
+                self.stdout.write(
+                    f"  {endpoint}: {stats['requests_per_sec']} req/s, "
+                    f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                    f"p99 {stats['p99_ms']} ms, {stats['sql_queries']} queries, "
+                    f"{stats['errors']} errors"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2, ensure_ascii=False)
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as baseline:
+                lines, regressions = compare_results(
+                    json.load(baseline), results, options["regression_threshold"]
+                )
+            for line in lines:
+                self.stdout.write(line)
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{regressions} endpoints regressed.")
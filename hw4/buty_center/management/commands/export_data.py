@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from buty_center.export import (
+    FORMATS,
+    RESOURCES,
+    ExportError,
+    export_rows,
+    render_lines,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream comments, centers or center-services as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=list(RESOURCES))
+        parser.add_argument("--output", choices=list(FORMATS), default="ndjson")
+        parser.add_argument("--file", help="Write to this path instead of stdout.")
+        parser.add_argument("--center", help="Only rows of this center.")
+        parser.add_argument("--created-after", help="ISO date or datetime.")
+        parser.add_argument("--created-before", help="ISO date or datetime.")
+
+    def handle(self, *args, **options):
+        try:
+            columns, rows = export_rows(
+                options["resource"],
+                center=options["center"],
+                created_after=options["created_after"],
+                created_before=options["created_before"],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        lines = render_lines(columns, rows, options["output"])
+        if options["file"]:
+            with open(options["file"], "w", encoding="utf-8", newline="") as target:
+                target.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from buty_center.models import Center
+from buty_center.synthetic import BATCH_SIZE, Dataset, generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty local database with a synthetic catalog for load tests. "
+        "The same options and --seed give the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--centers", type=int, default=1000)
+        parser.add_argument("--services", type=int, default=100)
+        parser.add_argument(
+            "--links",
+            type=int,
+            default=10,
+            help="Mean number of services per center.",
+        )
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of center, user and service popularity.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert with bulk_create instead of COPY on PostgreSQL.",
+        )
+        parser.add_argument(
+            "--no-rebuild",
+            action="store_true",
+            help="Only load rows; run rebuild_ratings, rebuild_search_index and "
+            "rebuild_center_profiles later.",
+        )
+
+    def handle(self, *args, **options):
+        if Center.objects.exists():
+            raise CommandError(
+                "The database already has centers, run 'manage.py flush' first."
+            )
+        if min(options["centers"], options["services"], options["users"]) < 1:
+            raise CommandError("--centers, --services and --users must be positive.")
+        if options["links"] < 1:
+            raise CommandError("--links must be positive.")
+
+        dataset = Dataset(
+            options["centers"],
+            options["services"],
+            options["links"],
+            options["users"],
+            options["comments"],
+            seed=options["seed"],
+            skew=options["skew"],
+        )
+        started = time.perf_counter()
+        counts = generate_dataset(
+            dataset,
+            options["batch_size"],
+            use_copy=False if options["no_copy"] else None,
+            rebuild=not options["no_rebuild"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            ", ".join(f"{count} {table}" for table, count in counts.items())
+        )
+        self.stdout.write(
+            f"Loaded in {elapsed:.1f} s, "
+            f"{round(counts['comments'] / elapsed * 60)} comments per minute."
+        )
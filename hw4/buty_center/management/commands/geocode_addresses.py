@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from buty_center.geo import GazetteerGeocoder, geocode_addresses
+from buty_center.models import Address
+
+
+class Command(BaseCommand):
+    help = "Fill address coordinates from a local CSV gazetteer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--gazetteer",
+            default=settings.GEOCODER_GAZETTEER,
+            help="Path to the gazetteer CSV, GEOCODER_GAZETTEER by default.",
+        )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Geocode addresses that already have coordinates too.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["gazetteer"]:
+            raise CommandError("Pass --gazetteer or set GEOCODER_GAZETTEER.")
+        try:
+            geocoder = GazetteerGeocoder(options["gazetteer"])
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Cannot read gazetteer: {e}")
+
+        addresses = Address.objects.order_by("pk")
+        if not options["overwrite"]:
+            addresses = addresses.filter(latitude__isnull=True)
+        geocoded = geocode_addresses(geocoder, addresses)
+        self.stdout.write(self.style.SUCCESS(f"Geocoded {geocoded} addresses."))
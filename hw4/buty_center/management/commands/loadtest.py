@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from buty_center.loadgen import is_loopback_url, percentile, read_response
+
+
+async def run_load(url, concurrency, total):
+    """Send ``total`` GET requests over ``concurrency`` keep-alive connections.
+
+    Returns:
+        Dict with requests per second, latency percentiles in ms and errors.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    request = (
+        f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        "Accept: application/json\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal errors, remaining
+        reader = writer = None
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                writer.write(request)
+                await writer.drain()
+                status, keep_alive, _ = await read_response(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors += 1
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers with concurrent keep-alive GET requests. "
+        "Compare the sync and async read paths, e.g. with "
+        "'gunicorn hw4.wsgi -w 4 --threads 8 -b :8000' and "
+        "'uvicorn hw4.asgi:application --workers 4 --port 8001': "
+        "--target wsgi=http://127.0.0.1:8000/api/centers/ "
+        "--target asgi=http://127.0.0.1:8001/api/async/centers/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            help="NAME=URL to load, can be repeated.",
+        )
+        parser.add_argument("--concurrency", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=10000)
+        parser.add_argument("--output", help="Write results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, sep, url = target.partition("=")
+            if not sep or not url.startswith("http://"):
+                raise CommandError(f"Expected NAME=http://..., got {target!r}.")
+            if not is_loopback_url(url):
+                raise CommandError(
+                    f"{url!r} is not a loopback address, load a local server."
+                )
+            targets.append((name, url))
+
+        results = {}
+        for name, url in targets:
+            results[name] = asyncio.run(
+                run_load(url, options["concurrency"], options["requests"])
+            )
+            result = results[name]
+            self.stdout.write(
+                f"{name}: {result['requests_per_sec']} req/s, "
+                f"p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, "
+                f"{result['errors']} errors"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2)
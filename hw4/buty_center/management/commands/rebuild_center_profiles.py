@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from buty_center.profiles import update_profiles
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed profile documents of centers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--center",
+            action="append",
+            dest="centers",
+            help="Center id to rebuild, can be repeated. All centers by default.",
+        )
+
+    def handle(self, *args, **options):
+        updated = update_profiles(options["centers"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {updated} center profiles."))
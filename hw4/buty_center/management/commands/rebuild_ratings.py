@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from buty_center.cache import invalidate_model
+from buty_center.models import Center
+from buty_center.profiles import update_profiles
+from buty_center.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Rebuild rating_avg and rating_count of centers from comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--center",
+            action="append",
+            dest="centers",
+            help="Center id to rebuild, can be repeated. All centers by default.",
+        )
+
+    def handle(self, *args, **options):
+        centers = Center.objects.all()
+        if options["centers"]:
+            centers = centers.filter(pk__in=options["centers"])
+        updated = rebuild_ratings(centers)
+        invalidate_model(Center)
+        # Рейтинг входит в профиль, а update() сигналов не отправляет
+        update_profiles(centers.values_list("id", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {updated} centers."))
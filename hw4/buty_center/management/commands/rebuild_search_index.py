@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from buty_center.search import update_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search document of centers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--center",
+            action="append",
+            dest="centers",
+            help="Center id to reindex, can be repeated. All centers by default.",
+        )
+
+    def handle(self, *args, **options):
+        updated = update_search_index(options["centers"])
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {updated} centers."))
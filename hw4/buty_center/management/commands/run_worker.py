@@ -0,0 +1,50 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from buty_center.tasks import process_jobs
+
+
+class Command(BaseCommand):
+    help = "Process jobs of the database task queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_BATCH_SIZE,
+            help="Jobs claimed at once, TASK_BATCH_SIZE by default.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no jobs are due instead of waiting for new ones.",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        # SIGTERM дает доделать текущую пачку: иначе ее задачи ждали бы
+        # окончания visibility timeout
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        processed = 0
+        while not self.stopping:
+            claimed = process_jobs(options["batch_size"])
+            processed += claimed
+            if claimed:
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
+
+    def stop(self, signum, frame):
+        self.stopping = True
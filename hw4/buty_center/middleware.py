@@ -0,0 +1,81 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from .cache import get_cache
+from .routers import replica_reads
+
+
+def _sticky_key(identity):
+    return "db-primary:" + hashlib.sha256(identity.encode()).hexdigest()
+
+
+def client_keys(request):
+    """Return sticky keys of the request client, the most specific first.
+
+    A client is identified by its credentials (token or session) and by its
+    address, so the first request after logging in is matched as well.
+    """
+    keys = []
+    credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if credentials:
+        keys.append(_sticky_key(credentials))
+    keys.append(_sticky_key(request.META.get("REMOTE_ADDR", "")))
+    return keys
+
+
+class ReplicaRoutingMiddleware:
+    """Serve safe requests from read replicas with read-your-writes.
+
+    A successful request with an unsafe method marks its client in the API
+    cache for ``REPLICA_STICKY_SECONDS``; until the mark expires all requests
+    of that client read from the primary, so they see their own writes
+    despite the replication lag. Rejected writes change nothing and do not
+    mark the client. Only the most specific key is marked, so anonymous
+    writes behind a shared address do not pin other clients. The cache must
+    be shared between the processes for the marks to be seen by all of them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.READ_REPLICAS:
+            return self.get_response(request)
+
+        keys = client_keys(request)
+        cache = get_cache()
+        if request.method in SAFE_METHODS:
+            with replica_reads(not cache.get_many(keys)):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            cache.set(keys[0], True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.READ_REPLICAS:
+            return await self.get_response(request)
+
+        keys = client_keys(request)
+        cache = get_cache()
+        if request.method in SAFE_METHODS:
+            with replica_reads(not await cache.aget_many(keys)):
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if response.status_code < 400:
+            await cache.aset(keys[0], True, settings.REPLICA_STICKY_SECONDS)
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="center",
+            name="rating_avg",
+            field=models.FloatField(
+                db_index=True, default=0, verbose_name="average mark"
+            ),
+        ),
+        migrations.AddField(
+            model_name="center",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="comments count"),
+        ),
+    ]
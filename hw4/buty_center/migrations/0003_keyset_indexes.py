@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0002_center_rating"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="center",
+            index=models.Index(fields=["name", "id"], name="center_name_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="comments",
+            index=models.Index(
+                fields=["created_at", "id"], name="comment_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comments",
+            index=models.Index(
+                fields=["center", "created_at", "id"],
+                name="comment_center_created_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(fields=["name", "id"], name="service_name_id_idx"),
+        ),
+    ]
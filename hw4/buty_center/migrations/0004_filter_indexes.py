@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0003_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="centerservice",
+            index=models.Index(
+                fields=["center", "id"], name="center_service_center_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="centerservice",
+            index=models.Index(
+                fields=["service", "id"], name="center_service_service_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["category", "name"], name="service_category_name_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def updated_at_field(model_name):
+    return migrations.AddField(
+        model_name=model_name,
+        name="updated_at",
+        field=models.DateTimeField(
+            auto_now=True,
+            default=django.utils.timezone.now,
+            verbose_name="updated at",
+        ),
+        preserve_default=False,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0004_filter_indexes"),
+    ]
+
+    operations = [
+        updated_at_field("address"),
+        updated_at_field("center"),
+        updated_at_field("centerservice"),
+        updated_at_field("comments"),
+        updated_at_field("service"),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:03
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# GIN-индексы есть только в PostgreSQL; на SQLite поиск идет через
+# резервный скоринг в buty_center.search
+INDEXES = {
+    "center_search_vector_idx": "USING gin (search_vector)",
+    "center_name_trgm_idx": "USING gin (name gin_trgm_ops)",
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, definition in INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON api_data_center {definition}"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0005_updated_at"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="center",
+            name="search_document",
+            field=models.TextField(
+                blank=True, default="", editable=False, verbose_name="search document"
+            ),
+        ),
+        migrations.AddField(
+            model_name="center",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="search vector"
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:08
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0006_center_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="latitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+                verbose_name="latitude",
+            ),
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="longitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+                verbose_name="longitude",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="address_lat_lon_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0007_address_coordinates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CenterProfile",
+            fields=[
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="updated at"),
+                ),
+                (
+                    "center",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="profile",
+                        serialize=False,
+                        to="buty_center.center",
+                        verbose_name="center",
+                    ),
+                ),
+                ("document", models.TextField(verbose_name="document")),
+            ],
+            options={
+                "verbose_name": "center profile",
+                "verbose_name_plural": "center profiles",
+                "db_table": "api_data_center_profile",
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicate_links(apps, schema_editor):
+    # Перед уникальным ограничением оставляем по одной связи на пару
+    CenterService = apps.get_model("buty_center", "CenterService")
+    duplicates = (
+        CenterService.objects.values_list("center", "service")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for center, service, _ in duplicates:
+        links = CenterService.objects.filter(center=center, service=service)
+        extra = list(links.order_by("id").values_list("id", flat=True))[1:]
+        CenterService.objects.filter(pk__in=extra).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("buty_center", "0009_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="center",
+            options={
+                "ordering": ["name", "id"],
+                "verbose_name": "center",
+                "verbose_name_plural": "centers",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="comments",
+            options={
+                "ordering": ["created_at", "id"],
+                "verbose_name": "comment",
+                "verbose_name_plural": "comments",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="service",
+            options={
+                "ordering": ["name", "id"],
+                "verbose_name": "service",
+                "verbose_name_plural": "services",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="comments",
+            index=models.Index(
+                fields=["center", "mark", "id"], name="comment_center_mark_id_idx"
+            ),
+        ),
+        migrations.RunPython(remove_duplicate_links, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="centerservice",
+            constraint=models.UniqueConstraint(
+                fields=("center", "service"), name="center_service_unique"
+            ),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from uuid import uuid4
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
+from django.core.validators import MaxValueValidator, MinValueValidator
 import re
 from django.core.exceptions import ValidationError
 
@@ -13,14 +16,36 @@ class UUIDMixin(models.Model):
         abstract = True
 
 
-class Address(UUIDMixin):
+class UpdatedAtMixin(models.Model):
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class Address(UUIDMixin, UpdatedAtMixin):
     street = models.TextField(_("street"), null=False, blank=False)
     city = models.TextField(_("city"), null=False, blank=False)
     state = models.TextField(_("state"), null=False, blank=False)
     number = models.IntegerField(_("number"), null=False, blank=False)
+    latitude = models.FloatField(
+        _("latitude"),
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        _("longitude"),
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
 
     class Meta:
         db_table = "api_data_address"
+        indexes = [
+            models.Index(fields=["latitude", "longitude"], name="address_lat_lon_idx")
+        ]
         verbose_name = _("address")
         verbose_name_plural = _("addresses")
 
@@ -33,12 +58,20 @@ class Address(UUIDMixin):
             raise ValidationError(_("Number cannot be negative."))
 
 
-class Center(UUIDMixin):
+class Center(UUIDMixin, UpdatedAtMixin):
     name = models.TextField(_("name"), null=False, blank=False)
     address = models.OneToOneField(
         "Address", verbose_name=_("address"), on_delete=models.CASCADE
     )
     phone = models.CharField(_("phone number"), max_length=15, null=False, blank=False)
+    rating_avg = models.FloatField(_("average mark"), default=0, db_index=True)
+    rating_count = models.PositiveIntegerField(_("comments count"), default=0)
+    # Поисковый документ поддерживается buty_center.search; GIN-индексы
+    # создаются миграцией 0006 только на PostgreSQL
+    search_document = models.TextField(
+        _("search document"), blank=True, default="", editable=False
+    )
+    search_vector = SearchVectorField(_("search vector"), null=True, editable=False)
 
     def clean(self):
         super().clean()
@@ -47,12 +80,14 @@ class Center(UUIDMixin):
 
     class Meta:
         db_table = "api_data_center"
-        ordering = ["name"]
+        # Порядок совпадает с индексом (name, id)
+        ordering = ["name", "id"]
+        indexes = [models.Index(fields=["name", "id"], name="center_name_id_idx")]
         verbose_name = _("center")
         verbose_name_plural = _("centers")
 
 
-class Service(UUIDMixin):
+class Service(UUIDMixin, UpdatedAtMixin):
     name = models.TextField(_("name"), null=False, blank=False)
     category = models.TextField(_("category"), null=False, blank=False)
     centers = models.ManyToManyField(
@@ -61,7 +96,11 @@ class Service(UUIDMixin):
 
     class Meta:
         db_table = "api_data_service"
-        ordering = ["name"]
+        ordering = ["name", "id"]
+        indexes = [
+            models.Index(fields=["name", "id"], name="service_name_id_idx"),
+            models.Index(fields=["category", "name"], name="service_category_name_idx"),
+        ]
         verbose_name = _("service")
         verbose_name_plural = _("services")
 
@@ -69,7 +108,7 @@ class Service(UUIDMixin):
         return f"{self.name}, {self.category}, {self.centers}"
 
 
-class Comments(UUIDMixin):
+class Comments(UUIDMixin, UpdatedAtMixin):
     content = models.TextField(_("content"), null=False, blank=False)
     mark = models.FloatField(_("mark"), null=False, blank=False)
     center = models.ForeignKey(
@@ -80,7 +119,19 @@ class Comments(UUIDMixin):
 
     class Meta:
         db_table = "api_data_comment"
-        ordering = ["mark"]
+        # Сортировка по mark шла без индекса; новые и старые отзывы центра
+        # читаются одним индексом (center, created_at, id) в обе стороны
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="comment_created_id_idx"),
+            models.Index(
+                fields=["center", "created_at", "id"],
+                name="comment_center_created_id_idx",
+            ),
+            models.Index(
+                fields=["center", "mark", "id"], name="comment_center_mark_id_idx"
+            ),
+        ]
         verbose_name = _("comment")
         verbose_name_plural = _("comments")
 
@@ -93,7 +144,7 @@ class Comments(UUIDMixin):
             raise ValidationError(_("Mark must be between 1 and 5."))
 
 
-class CenterService(UUIDMixin):
+class CenterService(UUIDMixin, UpdatedAtMixin):
     center = models.ForeignKey(
         "Center", verbose_name=_("center"), on_delete=models.CASCADE
     )
@@ -107,5 +158,66 @@ class CenterService(UUIDMixin):
 
     class Meta:
         db_table = "api_data_center_service"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["center", "service"], name="center_service_unique"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["center", "id"], name="center_service_center_id_idx"),
+            models.Index(fields=["service", "id"], name="center_service_service_idx"),
+        ]
         verbose_name = _("center_service")
         verbose_name_plural = _("center_services")
+
+
+class CenterProfile(UpdatedAtMixin):
+    # Готовый JSON страницы центра, поддерживается buty_center.profiles
+    center = models.OneToOneField(
+        "Center",
+        verbose_name=_("center"),
+        primary_key=True,
+        related_name="profile",
+        on_delete=models.CASCADE,
+    )
+    document = models.TextField(_("document"))
+
+    class Meta:
+        db_table = "api_data_center_profile"
+        verbose_name = _("center profile")
+        verbose_name_plural = _("center profiles")
+
+
+class Job(models.Model):
+    # Задача очереди buty_center.tasks: name - обработчик, key - его аргумент
+    name = models.CharField(_("name"), max_length=100)
+    key = models.CharField(_("key"), max_length=255)
+    available_at = models.DateTimeField(_("available at"), default=timezone.now)
+    locked_until = models.DateTimeField(_("locked until"), null=True, blank=True)
+    attempts = models.PositiveIntegerField(_("attempts"), default=0)
+    last_error = models.TextField(_("last error"), blank=True)
+    failed_at = models.DateTimeField(_("failed at"), null=True, blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        db_table = "api_data_job"
+        constraints = [
+            # Ожидающая задача на ключ одна: повторные постановки сливаются
+            models.UniqueConstraint(
+                fields=["name", "key"],
+                condition=models.Q(locked_until__isnull=True, failed_at__isnull=True),
+                name="job_pending_unique",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["available_at", "id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="job_available_idx",
+            )
+        ]
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+
+    def __str__(self) -> str:
+        return f"{self.name}({self.key})"
@@ -0,0 +1,200 @@
+import base64
+import json
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+from uuid import UUID
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _field(model, name):
+    # Поле сортировки, в том числе через связи: address__city
+    *relations, name = name.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def _row_value(row, name):
+    # Страницы бывают и из словарей .values()
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a composite ordering.
+
+    Unlike ``CursorPagination`` from DRF the cursor stores the values of every
+    ordering field of the boundary row, so the next page is fetched with a
+    ``(a, b) > (x, y)`` predicate and costs one index range scan whatever the
+    page number is: the predicate is expanded to ``a >= x AND (a > x OR
+    (a = x AND b > y))``, whose leading conjunct bounds the scan. The ordering
+    is taken from ``cursor_ordering`` of the view or from its
+    ``OrderingFilter``; ``id`` is always appended as a tiebreaker. Cursor
+    values are converted with ``to_python`` of the ordering fields.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(page))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Same as ``paginate_queryset`` for async views."""
+        page = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in page])
+
+    def get_page_queryset(self, queryset, request, view):
+        """Return the lazy queryset of the requested page plus one extra row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.base_url = request.build_absolute_uri()
+        self.cursor_values, self.cursor_reverse = self.decode_cursor(
+            request, queryset.model
+        )
+
+        ordering = self.ordering
+        if self.cursor_reverse:
+            ordering = [self._invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor_values is not None:
+            queryset = queryset.filter(self._after(ordering, self.cursor_values))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        values, reverse = self.cursor_values, self.cursor_reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if not request.query_params.get(backend.ordering_param):
+                    ordering = None
+        if not ordering:
+            ordering = getattr(view, "cursor_ordering", self.ordering)
+        ordering = list(ordering)
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("id")
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        values = [
+            _encode_value(_row_value(row, field.lstrip("-"))) for field in self.ordering
+        ]
+        payload = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, reverse = payload["v"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        # Значения из URL приводятся к типам полей, иначе до ORM доходит мусор
+        try:
+            values = [
+                _field(model, name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (DjangoValidationError, FieldDoesNotExist, TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if any(value is None for value in values):
+            raise NotFound("Invalid cursor")
+        return values, reverse
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, values):
+        # (a, b) > (x, y)  =>  a >= x AND (a > x OR (a = x AND b > y))
+        # Без ведущего a >= x PostgreSQL не выводит из OR границу диапазона
+        first = ordering[0].lstrip("-")
+        bound = "lte" if ordering[0].startswith("-") else "gte"
+        conditions = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {ordering[prev].lstrip("-"): values[prev] for prev in range(index)}
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": values[index]}))
+        return Q(**{f"{first}__{bound}": values[0]}) & reduce(or_, conditions)
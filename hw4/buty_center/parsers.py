@@ -0,0 +1,33 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` decoding with orjson.
+
+    orjson rejects NaN and Infinity as ``STRICT_JSON`` does. Without orjson
+    the parser behaves as ``JSONParser``.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            # orjson читает только UTF-8
+            if codecs.lookup(encoding).name != "utf-8":
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
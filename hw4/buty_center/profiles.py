@@ -0,0 +1,145 @@
+import json
+
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from .models import Center, CenterProfile, CenterService, Comments
+from .pagination import KeysetPagination
+from .serializers import CenterSerializer, CommentsSerializer
+from .tasks import enqueue, task
+
+BATCH_SIZE = 500
+
+# Первая страница отзывов такая же, как у CommentsViewSet без параметров
+COMMENT_ORDERING = ("created_at", "id")
+
+
+def _first_comment_pages(center_ids, page_size):
+    """Return ``{center_id: comments}`` with up to ``page_size + 1`` rows."""
+    rows = (
+        Comments.objects.filter(center_id__in=center_ids)
+        .select_related("user")
+        .annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F("center_id"),
+                order_by=[F(field).asc() for field in COMMENT_ORDERING],
+            )
+        )
+        .filter(row_number__lte=page_size + 1)
+        .order_by("center_id", "row_number")
+    )
+    pages = {}
+    for row in rows:
+        pages.setdefault(row.center_id, []).append(row)
+    return pages
+
+
+def _next_link(center_id, last):
+    # Ссылка относительная: документ строится вне запроса и без хоста
+    paginator = KeysetPagination()
+    paginator.ordering = list(COMMENT_ORDERING)
+    paginator.base_url = reverse("comment-list", kwargs={"center_id": center_id})
+    return paginator.encode_cursor(last, reverse=False)
+
+
+def build_documents(center_ids):
+    """Return ``{center_id: json}`` profile documents of the given centers.
+
+    A document holds the center as served by ``CenterViewSet`` (with the
+    address and services), its rating and the first page of its comments.
+    """
+    centers = (
+        Center.objects.filter(pk__in=center_ids)
+        .select_related("address")
+        .prefetch_related(
+            Prefetch(
+                "centerservice_set",
+                queryset=CenterService.objects.select_related("service"),
+            )
+        )
+        .defer("search_document", "search_vector")
+    )
+    page_size = KeysetPagination.page_size
+    pages = _first_comment_pages(center_ids, page_size)
+
+    documents = {}
+    for center in centers:
+        comments = pages.get(center.pk, [])
+        document = {
+            "center": CenterSerializer(center).data,
+            "rating": {"average": center.rating_avg, "count": center.rating_count},
+            "comments": {
+                "next": (
+                    _next_link(center.pk, comments[page_size - 1])
+                    if len(comments) > page_size
+                    else None
+                ),
+                "results": CommentsSerializer(comments[:page_size], many=True).data,
+            },
+        }
+        documents[center.pk] = json.dumps(
+            document, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        )
+    return documents
+
+
+@task("profiles.update")
+def update_profiles(center_ids=None):
+    """Rebuild profile documents of centers.
+
+    Args:
+        center_ids: Ids of centers to rebuild, all centers by default.
+
+    Returns:
+        Number of rebuilt profiles.
+    """
+    if center_ids is None:
+        center_ids = Center.objects.values_list("id", flat=True)
+    center_ids = list(dict.fromkeys(center_ids))
+
+    updated = 0
+    for start in range(0, len(center_ids), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        documents = build_documents(center_ids[start:end])
+        now = timezone.now()
+        CenterProfile.objects.bulk_create(
+            [
+                CenterProfile(center_id=pk, document=document, updated_at=now)
+                for pk, document in documents.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["center"],
+            update_fields=["document", "updated_at"],
+        )
+        updated += len(documents)
+    return updated
+
+
+def get_profile(center_id):
+    """Return ``(document, updated_at)`` of a center with one pk lookup.
+
+    A missing profile, e.g. of a center created before profiles existed, is
+    built on the spot.
+
+    Returns:
+        The tuple or ``None`` if there is no such center.
+    """
+    queryset = CenterProfile.objects.filter(pk=center_id).values_list(
+        "document", "updated_at"
+    )
+    profile = queryset.first()
+    if profile is None and update_profiles([center_id]):
+        profile = queryset.first()
+    return profile
+
+
+def schedule_profile_update(center_ids):
+    """Queue rebuilding of center profiles with the current transaction.
+
+    Like ``search.schedule_reindex``, a center changed many times before a
+    worker picks the job up is rebuilt once, from the committed state.
+    """
+    enqueue("profiles.update", center_ids)
@@ -0,0 +1,294 @@
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Сколько повторяющихся SQL помнить на маршрут
+MAX_DUPLICATES = 10
+
+MAX_ROUTES = 500
+
+_current = ContextVar("profiling_request", default=None)
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers, as in HdrHistogram.
+
+    Each power of two is split into ``sub_buckets`` linear buckets, so a
+    quantile is off by less than ``1 / sub_buckets`` of its value while the
+    memory is fixed by ``max_value``: values above it are recorded as it.
+    """
+
+    def __init__(self, sub_buckets=16, max_value=2**36):
+        self.sub_buckets = sub_buckets
+        self.max_value = max_value
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.sub_buckets.bit_length()
+        return self.sub_buckets * shift + (value >> shift)
+
+    def _upper(self, index):
+        if index < self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        return ((index - self.sub_buckets * shift + 1) << shift) - 1
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction):
+        """Return the upper bound of the bucket holding the quantile."""
+        if not self.count:
+            return 0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+
+class RouteStats:
+    # Метрика Prometheus: (поле запроса, множитель к единице метрики)
+    METRICS = {
+        "request_duration_seconds": ("latency", 1e-6),
+        "sql_queries": ("queries", 1),
+        "sql_duration_seconds": ("sql_time", 1e-6),
+        "serializer_duration_seconds": ("serializer_time", 1e-6),
+        "response_size_bytes": ("response_size", 1),
+    }
+
+    def __init__(self):
+        self.histograms = {name: Histogram() for name in self.METRICS}
+        self.errors = 0
+        self.duplicate_requests = 0
+        self.duplicates = Counter()
+
+    def add(self, values, status_code, duplicates):
+        for name, (field, _) in self.METRICS.items():
+            if values.get(field) is not None:
+                self.histograms[name].record(values[field])
+        if status_code >= 500:
+            self.errors += 1
+        if duplicates:
+            self.duplicate_requests += 1
+            self.duplicates.update(duplicates)
+            # Держим только самые частые повторы
+            for sql, _ in self.duplicates.most_common()[MAX_DUPLICATES:]:
+                del self.duplicates[sql]
+
+    @property
+    def requests(self):
+        return self.histograms["request_duration_seconds"].count
+
+
+class Registry:
+    """Aggregated stats of all routes of this process."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, route, values, status_code, duplicates=()):
+        with self._lock:
+            if route not in self._routes and len(self._routes) >= MAX_ROUTES:
+                route = "<other>"
+            stats = self._routes.setdefault(route, RouteStats())
+            stats.add(values, status_code, duplicates)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def as_dict(self):
+        with self._lock:
+            routes = {}
+            for route, stats in sorted(self._routes.items()):
+                metrics = {}
+                for name, (_, scale) in RouteStats.METRICS.items():
+                    histogram = stats.histograms[name]
+                    if name.endswith("_seconds"):
+                        name, scale = name.replace("_seconds", "_ms"), scale * 1000
+                    metrics[name] = {
+                        f"p{round(q * 100)}": histogram.quantile(q) * scale
+                        for q in QUANTILES
+                    }
+                    metrics[name]["max"] = histogram.max * scale
+                    metrics[name]["mean"] = (
+                        histogram.total * scale / histogram.count
+                        if histogram.count
+                        else 0
+                    )
+                routes[route] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    **metrics,
+                    "duplicate_query_requests": stats.duplicate_requests,
+                    "duplicate_queries": dict(stats.duplicates.most_common()),
+                }
+            return routes
+
+    def as_prometheus(self, prefix="buty_center"):
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+            for name, (_, scale) in RouteStats.METRICS.items():
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} summary")
+                for route, stats in routes:
+                    histogram = stats.histograms[name]
+                    label = f'route="{_escape(route)}"'
+                    for q in QUANTILES:
+                        value = histogram.quantile(q) * scale
+                        lines.append(f'{metric}{{{label},quantile="{q}"}} {value}')
+                    lines.append(f"{metric}_sum{{{label}}} {histogram.total * scale}")
+                    lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+            for name, attribute in [
+                ("server_errors", "errors"),
+                ("duplicate_query_requests", "duplicate_requests"),
+            ]:
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for route, stats in routes:
+                    value = getattr(stats, attribute)
+                    lines.append(f'{metric}{{route="{_escape(route)}"}} {value}')
+            return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+class RequestProfile:
+    """SQL and serializer time of one request."""
+
+    def __init__(self):
+        self.queries = Counter()
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: SQL приходит с плейсхолдерами, так что одинаковые
+        # запросы с разными параметрами совпадают
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries[sql] += 1
+
+    def duplicates(self, threshold):
+        return [sql for sql, count in self.queries.items() if count >= threshold]
+
+
+def _timed(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        # Вложенные сериализаторы входят во время внешнего
+        if profile is None or profile.serializing:
+            return func(*args, **kwargs)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - started
+            profile.serializing = False
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def install_serializer_hooks():
+    """Time ``serializer.data`` and ``FlatSerializer.to_representation``."""
+    from .flat import FlatSerializer
+
+    if not getattr(BaseSerializer.data.fget, "profiled", False):
+        BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+    if not getattr(FlatSerializer.to_representation, "profiled", False):
+        FlatSerializer.to_representation = _timed(FlatSerializer.to_representation)
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} {match.view_name if match else '<unmatched>'}"
+
+
+class ProfilingMiddleware:
+    """Per-route latency, SQL, serializer time and response size.
+
+    Enabled by ``PROFILING_ENABLED``. Queries of all connections are counted
+    and timed with ``execute_wrapper``; a request running the same SQL
+    ``PROFILING_DUPLICATE_THRESHOLD`` times or more, typically a relation
+    read per row (N+1), is flagged and its SQL kept for the route. Stats are
+    aggregated in bounded histograms of this process, see ``registry``.
+    The middleware is sync only: queries of async views run in other
+    threads and are not seen.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        install_serializer_hooks()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        latency = time.perf_counter() - started
+
+        route = route_name(request)
+        duplicates = profile.duplicates(settings.PROFILING_DUPLICATE_THRESHOLD)
+        for sql in duplicates:
+            logger.warning("%s ran %d times in %s", sql, profile.queries[sql], route)
+        registry.add(
+            route,
+            {
+                "latency": latency * 1e6,
+                "queries": sum(profile.queries.values()),
+                "sql_time": profile.sql_time * 1e6,
+                "serializer_time": profile.serializer_time * 1e6,
+                "response_size": (
+                    None if response.streaming else len(response.content)
+                ),
+            },
+            response.status_code,
+            duplicates,
+        )
+        return response
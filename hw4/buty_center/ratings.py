@@ -0,0 +1,121 @@
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    When,
+    Window,
+)
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+from .models import Center, Comments
+
+
+def add_mark(center_id, mark):
+    """Account a new mark in the center aggregates with a single UPDATE."""
+    Center.objects.filter(pk=center_id).update(
+        rating_avg=(F("rating_avg") * F("rating_count") + mark)
+        / (F("rating_count") + 1),
+        rating_count=F("rating_count") + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def remove_mark(center_id, mark):
+    """Remove a mark from the center aggregates with a single UPDATE."""
+    Center.objects.filter(pk=center_id).update(
+        rating_avg=Case(
+            When(rating_count__lte=1, then=0.0),
+            default=(F("rating_avg") * F("rating_count") - mark)
+            / (F("rating_count") - 1),
+            output_field=FloatField(),
+        ),
+        rating_count=Case(
+            When(rating_count__lte=1, then=0),
+            default=F("rating_count") - 1,
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def replace_mark(old_center_id, old_mark, new_center_id, new_mark):
+    if old_center_id == new_center_id and old_mark == new_mark:
+        return
+    if old_center_id != new_center_id:
+        remove_mark(old_center_id, old_mark)
+        add_mark(new_center_id, new_mark)
+        return
+    Center.objects.filter(pk=new_center_id, rating_count__gt=0).update(
+        rating_avg=F("rating_avg") + (new_mark - old_mark) / F("rating_count"),
+        updated_at=timezone.now(),
+    )
+
+
+def rebuild_ratings(centers=None):
+    """Recalculate aggregates from the comments table.
+
+    Args:
+        centers: queryset of centers to rebuild, all centers by default.
+
+    Returns:
+        Number of updated centers.
+    """
+    if centers is None:
+        centers = Center.objects.all()
+    comments = (
+        Comments.objects.filter(center=OuterRef("pk")).order_by().values("center")
+    )
+    return centers.update(
+        rating_avg=Coalesce(
+            Subquery(comments.annotate(value=Avg("mark")).values("value")),
+            0.0,
+            output_field=FloatField(),
+        ),
+        rating_count=Coalesce(
+            Subquery(comments.annotate(value=Count("pk")).values("value")), 0
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def comment_summaries(center_ids, limit):
+    """Latest ``limit`` comments and mark stats for each of ``center_ids``.
+
+    Stats and row numbers are window functions partitioned by center, so the
+    whole batch is fetched with one SQL statement.
+
+    Returns:
+        Dict of center id to ``{"count", "average", "comments"}`` where
+        ``comments`` are model instances, newest first.
+    """
+    partition = {"partition_by": F("center_id")}
+    rows = (
+        Comments.objects.filter(center_id__in=center_ids)
+        .select_related("user")
+        .annotate(
+            row_number=Window(
+                RowNumber(),
+                order_by=[F("created_at").desc(), F("id").desc()],
+                **partition,
+            ),
+            center_count=Window(Count("id"), **partition),
+            center_average=Window(Avg("mark"), **partition),
+        )
+        # Хотя бы одна строка на центр несет count/average и при limit=0
+        .filter(row_number__lte=max(limit, 1))
+        .order_by("center_id", "row_number")
+    )
+    summaries = {
+        center_id: {"count": 0, "average": None, "comments": []}
+        for center_id in center_ids
+    }
+    for row in rows:
+        summary = summaries[row.center_id]
+        summary["count"] = row.center_count
+        summary["average"] = row.center_average
+        if row.row_number <= limit:
+            summary["comments"].append(row)
+    return summaries
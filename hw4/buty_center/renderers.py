@@ -0,0 +1,37 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` producing the same bytes with orjson.
+
+    Datetimes and types orjson does not know go through ``encoder_class``,
+    as in ``JSONRenderer``. Indented output, non-default ``UNICODE_JSON`` or
+    ``COMPACT_JSON`` and a missing orjson fall back to ``JSONRenderer``.
+    Unlike ``STRICT_JSON`` of ``JSONRenderer``, NaN is rendered as ``null``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+        )
+        # Как и JSONRenderer, экранируем разделители строк для JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
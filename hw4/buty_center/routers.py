@@ -0,0 +1,54 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# По умолчанию все читается с основной базы: реплику на весь запрос выбирает
+# ReplicaRoutingMiddleware для безопасных запросов
+_replica = ContextVar("replica", default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Allow or forbid reads from ``READ_REPLICAS`` inside the block.
+
+    One replica is picked for the whole block, so all reads of a request see
+    the same replication state.
+    """
+    replicas = settings.READ_REPLICAS if enabled else None
+    token = _replica.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def replicas_enabled():
+    return _replica.get() is not None
+
+
+class ReplicaRouter:
+    """Send writes to the primary and, when allowed, reads to a replica.
+
+    Reads go to the replica picked by ``replica_reads()`` only inside that
+    block and outside a transaction of the primary, so reads made while
+    writing see the data being written.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,187 @@
+import re
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Coalesce
+from .models import Center, CenterService, Comments
+from .tasks import enqueue, task
+
+BATCH_SIZE = 1000
+
+# Части документа по весам tsvector: A - название, B - адрес, C - услуги,
+# D - отзывы. Значения совпадают с весами ts_rank по умолчанию.
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+# Отзывов у центра может быть много, tsvector ограничен 1 МБ
+MAX_PART_LENGTH = 100000
+
+# Порог похожести слов названия для опечаток в резервном скоринге
+FUZZY_RATIO = 0.75
+
+
+def _is_postgres():
+    return connection.vendor == "postgresql"
+
+
+def build_documents(center_ids):
+    """Return ``{center_id: [A, B, C, D]}`` search texts of the given centers."""
+    parts = {}
+    centers = Center.objects.filter(pk__in=center_ids).values_list(
+        "id", "name", "address__city", "address__street"
+    )
+    for pk, name, city, street in centers:
+        parts[pk] = ([name], [city, street], [], [])
+
+    links = CenterService.objects.filter(center_id__in=center_ids).values_list(
+        "center_id", "service__name", "service__category"
+    )
+    for center_id, name, category in links:
+        parts[center_id][2].extend((name, category))
+
+    comments = Comments.objects.filter(center_id__in=center_ids).values_list(
+        "center_id", "content"
+    )
+    for center_id, content in comments:
+        parts[center_id][3].append(content)
+
+    return {
+        pk: [" ".join(" ".join(texts).split())[:MAX_PART_LENGTH] for texts in values]
+        for pk, values in parts.items()
+    }
+
+
+def _vector(parts):
+    vector = None
+    for weight, text in zip(WEIGHTS, parts):
+        part = SearchVector(
+            Value(text, output_field=TextField()),
+            weight=weight,
+            config=settings.SEARCH_CONFIG,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+@task("search.reindex")
+def update_search_index(center_ids=None):
+    """Rebuild ``search_document`` and ``search_vector`` of centers.
+
+    Args:
+        center_ids: Ids of centers to reindex, all centers by default.
+
+    Returns:
+        Number of reindexed centers.
+    """
+    if center_ids is None:
+        center_ids = Center.objects.values_list("id", flat=True)
+    center_ids = list(dict.fromkeys(center_ids))
+    fields = ["search_document"]
+    if _is_postgres():
+        fields.append("search_vector")
+
+    updated = 0
+    for start in range(0, len(center_ids), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        documents = build_documents(center_ids[start:end])
+        centers = []
+        for pk, parts in documents.items():
+            # Части разделены переводом строки, внутри частей его нет
+            center = Center(id=pk, search_document="\n".join(parts))
+            if _is_postgres():
+                center.search_vector = _vector(parts)
+            centers.append(center)
+        Center.objects.bulk_update(centers, fields, batch_size=BATCH_SIZE)
+        updated += len(centers)
+    return updated
+
+
+def schedule_reindex(center_ids):
+    """Queue reindexing of centers with the current transaction.
+
+    Pending jobs are coalesced per center, so deleting many comments of a
+    center reindexes it once rather than once per row.
+    """
+    enqueue("search.reindex", center_ids)
+
+
+def _tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _score(terms, parts):
+    """Rank a document like ``ts_rank`` + trigram similarity of the name.
+
+    Terms match words by prefix, which stands in for stemming; every term
+    has to match somewhere in the document.
+    """
+    tokens = [_tokens(part) for part in parts]
+    score = 0.0
+    for term in terms:
+        term_score = sum(
+            weight * sum(token.startswith(term) for token in part_tokens)
+            for weight, part_tokens in zip(WEIGHTS.values(), tokens)
+        )
+        if not term_score and tokens:
+            similarity = max(
+                (SequenceMatcher(None, term, token).ratio() for token in tokens[0]),
+                default=0,
+            )
+            if similarity >= FUZZY_RATIO:
+                term_score = similarity
+        if not term_score:
+            return 0.0
+        score += term_score
+    return score
+
+
+def _fallback_search(query, limit):
+    terms = _tokens(query)
+    if not terms:
+        return []
+    ranked = []
+    documents = Center.objects.values_list("id", "search_document").iterator()
+    for pk, document in documents:
+        score = _score(terms, document.split("\n"))
+        if score:
+            ranked.append((pk, score))
+    ranked.sort(key=lambda item: (-item[1], str(item[0])))
+    return ranked[:limit]
+
+
+def search_centers(query, limit):
+    """Return up to ``limit`` ``(center_id, rank)`` pairs, best match first.
+
+    On PostgreSQL matches come from the GIN index over ``search_vector`` and
+    from the trigram index over ``name`` for misspelled names. Other backends
+    score ``search_document`` in Python.
+    """
+    if not _is_postgres():
+        return _fallback_search(query, limit)
+
+    search_query = SearchQuery(
+        query, config=settings.SEARCH_CONFIG, search_type="websearch"
+    )
+    ranked = (
+        Center.objects.filter(
+            Q(search_vector=search_query) | Q(name__trigram_word_similar=query)
+        )
+        .annotate(
+            # search_vector пуст у центров, еще не попавших в индекс
+            rank=Coalesce(
+                SearchRank(F("search_vector"), search_query),
+                Value(0.0, output_field=FloatField()),
+            )
+            + TrigramWordSimilarity(query, "name")
+        )
+        .order_by("-rank", "id")
+        .values_list("id", "rank")
+    )
+    return list(ranked[:limit])
@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Address, Center, Service, Comments, CenterService
+from .ratings import add_mark, replace_mark
 from django.contrib.auth.models import User
 from rest_framework.exceptions import ValidationError
 
@@ -16,8 +18,16 @@ class AddressSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class NestedServiceSerializer(serializers.ModelSerializer):
+    # Без списка centers: внутри связи центр уже известен, а список растет
+    # вместе с таблицей связей
+    class Meta:
+        model = Service
+        fields = ["id", "name", "category"]
+
+
 class CenterServiceSerializer(serializers.ModelSerializer):
-    service = ServiceSerializer()
+    service = NestedServiceSerializer()
 
     class Meta:
         model = CenterService
@@ -30,7 +40,8 @@ class CenterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Center
-        fields = "__all__"
+        exclude = ["search_document", "search_vector"]
+        read_only_fields = ["rating_avg", "rating_count"]
 
     def create(self, validated_data):
         address_data = validated_data.pop("address")
@@ -39,7 +50,8 @@ class CenterSerializer(serializers.ModelSerializer):
         return center
 
     def get_services(self, obj):
-        center_services = CenterService.objects.filter(center=obj)
+        # Использует кэш prefetch_related из CenterViewSet, если он заполнен
+        center_services = obj.centerservice_set.all()
         return CenterServiceSerializer(center_services, many=True).data
 
     def update(self, instance, validated_data):
@@ -77,7 +89,18 @@ class CommentsSerializer(serializers.ModelSerializer):
             raise ValidationError("Invalid Center ID.")
 
         user = self.context["request"].user
-        comment = Comments.objects.create(center=center, user=user, **validated_data)
+        with transaction.atomic():
+            comment = Comments.objects.create(
+                center=center, user=user, **validated_data
+            )
+            add_mark(center.pk, comment.mark)
+        return comment
+
+    def update(self, instance, validated_data):
+        old_center_id, old_mark = instance.center_id, instance.mark
+        with transaction.atomic():
+            comment = super().update(instance, validated_data)
+            replace_mark(old_center_id, old_mark, comment.center_id, comment.mark)
         return comment
 
 
@@ -0,0 +1,139 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from .authentication import forget_token, forget_user
+from .cache import invalidate_model
+from .models import Address, Center, Service, Comments, CenterService
+from .profiles import schedule_profile_update
+from .ratings import rebuild_ratings
+from .search import schedule_reindex
+
+CACHED_MODELS = (Address, Center, Service, Comments, CenterService)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        invalidate_model(sender)
+
+
+# Представление центра включает адрес и услуги, поэтому их изменения
+# сдвигают updated_at центра, на котором построены ETag и Last-Modified.
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def touch_address_center(sender, instance, **kwargs):
+    Center.objects.filter(address_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=CenterService)
+@receiver(post_delete, sender=CenterService)
+def touch_center_service_parents(sender, instance, **kwargs):
+    now = timezone.now()
+    Center.objects.filter(pk=instance.center_id).update(updated_at=now)
+    Service.objects.filter(pk=instance.service_id).update(updated_at=now)
+
+
+@receiver(post_save, sender=Service)
+def touch_service_links(sender, instance, created, **kwargs):
+    if created:
+        return
+    now = timezone.now()
+    CenterService.objects.filter(service=instance).update(updated_at=now)
+    Center.objects.filter(centerservice__service=instance).update(updated_at=now)
+
+
+# Поисковый документ и профиль центра собираются из адреса, услуг и
+# отзывов, поэтому их изменения перестраивают оба у затронутых центров.
+
+
+def refresh_centers(center_ids):
+    center_ids = list(center_ids)
+    schedule_reindex(center_ids)
+    schedule_profile_update(center_ids)
+
+
+@receiver(post_save, sender=Center)
+def refresh_center(sender, instance, **kwargs):
+    refresh_centers([instance.pk])
+
+
+@receiver(post_save, sender=Address)
+def refresh_address_center(sender, instance, **kwargs):
+    refresh_centers(
+        Center.objects.filter(address_id=instance.pk).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Service)
+def refresh_service_centers(sender, instance, created, **kwargs):
+    if created:
+        return
+    refresh_centers(
+        CenterService.objects.filter(service=instance).values_list(
+            "center_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=CenterService)
+@receiver(post_delete, sender=CenterService)
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def refresh_related_center(sender, instance, **kwargs):
+    refresh_centers([instance.center_id])
+
+
+# Профиль и отзывы показывают имена авторов; вход пользователя меняет только
+# last_login.
+
+
+@receiver(post_save, sender=User)
+def refresh_commented_centers(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    invalidate_model(User)
+    schedule_profile_update(
+        Comments.objects.filter(user=instance)
+        .values_list("center_id", flat=True)
+        .distinct()
+    )
+
+
+# Удаление пользователя каскадом удаляет его отзывы мимо add_mark/remove_mark,
+# поэтому рейтинги затронутых центров пересчитываются по таблице отзывов.
+
+
+@receiver(pre_delete, sender=User)
+def remember_commented_centers(sender, instance, **kwargs):
+    instance._commented_center_ids = list(
+        Comments.objects.filter(user=instance)
+        .values_list("center_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=User)
+def rebuild_commented_center_ratings(sender, instance, **kwargs):
+    center_ids = getattr(instance, "_commented_center_ids", None)
+    if center_ids:
+        rebuild_ratings(Center.objects.filter(pk__in=center_ids))
+
+
+# Кеш токенов: отозванный токен или измененный пользователь (is_active,
+# is_staff) не должны дальше браться из кеша этого процесса.
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_changed_user(sender, instance, created, **kwargs):
+    if not created:
+        forget_user(instance.pk)
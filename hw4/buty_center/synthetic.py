@@ -0,0 +1,398 @@
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from .cache import invalidate_model
+from .models import Address, Center, CenterService, Comments, Service
+from .profiles import update_profiles
+from .ratings import rebuild_ratings
+from .search import update_search_index
+
+BATCH_SIZE = 5000
+
+USERNAME_PREFIX = "synthetic"
+
+# Пароль всех сгенерированных пользователей, для сценариев со входом
+PASSWORD = "synthetic-password"
+
+# Даты отзывов равномерно за год от EPOCH, чтобы данные не зависели от дня
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+PERIOD_SECONDS = 365 * 24 * 3600
+
+# Поля строк, которые выдает Dataset, в порядке значений
+FIELDS = {
+    Address: [
+        "id",
+        "street",
+        "city",
+        "state",
+        "number",
+        "latitude",
+        "longitude",
+        "updated_at",
+    ],
+    Center: ["id", "name", "phone", "address_id", "updated_at"],
+    Service: ["id", "name", "category", "updated_at"],
+    CenterService: ["id", "center_id", "service_id", "description", "updated_at"],
+    User: ["username", "email", "password", "date_joined"],
+    Comments: [
+        "id",
+        "content",
+        "mark",
+        "center_id",
+        "user_id",
+        "created_at",
+        "updated_at",
+    ],
+}
+
+CITIES = [
+    ("Москва", 55.7558, 37.6173),
+    ("Санкт-Петербург", 59.9343, 30.3351),
+    ("Новосибирск", 55.0084, 82.9357),
+    ("Екатеринбург", 56.8389, 60.6057),
+    ("Казань", 55.7961, 49.1064),
+    ("Нижний Новгород", 56.3269, 44.0059),
+]
+
+STREETS = ["Ленина", "Мира", "Гагарина", "Пушкина", "Садовая", "Лесная", "Школьная"]
+
+CENTER_KINDS = ["Салон", "Студия", "Центр красоты", "Бьюти-бар", "Клиника"]
+
+CENTER_NAMES = ["Лотос", "Орхидея", "Аура", "Гармония", "Шарм", "Сияние", "Венера"]
+
+SERVICES = {
+    "Волосы": ["Стрижка", "Окрашивание", "Укладка", "Кератин"],
+    "Ногти": ["Маникюр", "Педикюр", "Наращивание ногтей"],
+    "Лицо": ["Чистка лица", "Пилинг", "Массаж лица"],
+    "Тело": ["Массаж", "Обертывание", "Эпиляция"],
+    "Брови и ресницы": ["Коррекция бровей", "Ламинирование ресниц"],
+}
+
+COMMENTS = {
+    1: ["Ужасно, больше не приду.", "Мастер опоздал на час."],
+    2: ["Не понравилось.", "Дорого и долго."],
+    3: ["Нормально, но есть вопросы.", "Средне."],
+    4: ["Хороший мастер.", "Понравилось, приду еще."],
+    5: ["Отлично, рекомендую!", "Лучший салон в городе."],
+}
+
+
+def zipf_weights(count, skew):
+    """Return cumulative weights of ranks ``0..count - 1`` under Zipf's law."""
+    return list(accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+@contextmanager
+def explicit_timestamps():
+    """Let ``bulk_create`` keep generated ``created_at``/``updated_at``."""
+    fields = [
+        field
+        for model in (Address, Center, Service, CenterService, Comments)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Dataset:
+    """Synthetic catalog generated from a seed.
+
+    The same arguments give the same rows. Popularity is skewed as in real
+    catalogs: centers get comments, users write them and services are
+    offered by centers with Zipf-distributed frequencies of exponent
+    ``skew``, and each center has its own typical mark.
+    """
+
+    def __init__(self, centers, services, links, users, comments, seed=0, skew=1.1):
+        self.counts = {
+            "centers": centers,
+            "services": services,
+            "links": links,
+            "users": users,
+            "comments": comments,
+        }
+        self.seed = seed
+        self.skew = skew
+        self.rng = random.Random(seed)
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self):
+        return EPOCH + timedelta(seconds=self.rng.randrange(PERIOD_SECONDS))
+
+    def addresses_and_centers(self):
+        cities = zipf_weights(len(CITIES), self.skew)
+        self.center_ids = []
+        self.qualities = []
+        for num in range(self.counts["centers"]):
+            city, latitude, longitude = self.rng.choices(CITIES, cum_weights=cities)[0]
+            address_id, updated_at = self.uuid(), self.timestamp()
+            address = (
+                address_id,
+                self.rng.choice(STREETS),
+                city,
+                "Россия",
+                self.rng.randint(1, 200),
+                round(latitude + self.rng.gauss(0, 0.05), 6),
+                round(longitude + self.rng.gauss(0, 0.08), 6),
+                updated_at,
+            )
+            center = (
+                self.uuid(),
+                f"{self.rng.choice(CENTER_KINDS)} "
+                f"«{self.rng.choice(CENTER_NAMES)}» {num + 1}",
+                f"+7{self.rng.randrange(10**10):010d}",
+                address_id,
+                updated_at,
+            )
+            self.center_ids.append(center[0])
+            # Средняя оценка центра, отзывы разбросаны вокруг нее
+            self.qualities.append(self.rng.uniform(2.5, 4.9))
+            yield address, center
+
+    def services(self):
+        names = [
+            (category, name)
+            for category, services in SERVICES.items()
+            for name in services
+        ]
+        self.service_ids = []
+        for num in range(self.counts["services"]):
+            category, name = names[num % len(names)]
+            if num >= len(names):
+                name = f"{name} {num // len(names) + 1}"
+            service_id = self.uuid()
+            self.service_ids.append(service_id)
+            yield service_id, name, category, EPOCH
+
+    def center_services(self):
+        weights = zipf_weights(len(self.service_ids), self.skew)
+        for center_id in self.center_ids:
+            count = min(
+                len(self.service_ids),
+                max(1, round(self.rng.expovariate(1 / self.counts["links"]))),
+            )
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(self.rng.choices(self.service_ids, cum_weights=weights)[0])
+            for service_id in sorted(chosen):
+                yield (
+                    self.uuid(),
+                    center_id,
+                    service_id,
+                    f"Услуга центра, {self.rng.randint(5, 100) * 100} ₽",
+                    EPOCH,
+                )
+
+    def users(self):
+        encoded = make_password(PASSWORD)
+        for num in range(self.counts["users"]):
+            yield (
+                f"{USERNAME_PREFIX}{num:07d}",
+                f"{USERNAME_PREFIX}{num}@example.com",
+                encoded,
+                EPOCH,
+            )
+
+    def comments(self, user_ids):
+        # Самый горячий цикл загрузки: центры и авторы выбираются пачками,
+        # методы rng берутся в локальные имена
+        choices, gauss, choice = self.rng.choices, self.rng.gauss, self.rng.choice
+        getrandbits, randrange = self.rng.getrandbits, self.rng.randrange
+        centers = zipf_weights(len(self.center_ids), self.skew)
+        users = zipf_weights(len(user_ids), self.skew)
+        ranks = range(len(self.center_ids))
+        total = self.counts["comments"]
+        for start in range(0, total, BATCH_SIZE):
+            size = min(BATCH_SIZE, total - start)
+            picked = zip(
+                choices(ranks, cum_weights=centers, k=size),
+                choices(user_ids, cum_weights=users, k=size),
+            )
+            for rank, user_id in picked:
+                mark = min(5, max(1, round(gauss(self.qualities[rank], 1))))
+                created_at = EPOCH + timedelta(seconds=randrange(PERIOD_SECONDS))
+                yield (
+                    uuid.UUID(int=getrandbits(128), version=4),
+                    choice(COMMENTS[mark]),
+                    mark,
+                    self.center_ids[rank],
+                    user_id,
+                    created_at,
+                    created_at,
+                )
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_create(model, rows, batch_size):
+    fields = FIELDS[model]
+    count = 0
+    for batch in _batches(rows, batch_size):
+        model.objects.bulk_create([model(**dict(zip(fields, row))) for row in batch])
+        count += len(batch)
+    return count
+
+
+def _copy(model, rows, batch_size):
+    """Stream ``rows`` into the table of ``model`` with ``COPY FROM STDIN``.
+
+    Columns missing from the rows get their field defaults, as
+    ``bulk_create`` would set them.
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    fields = [opts.get_field(name) for name in FIELDS[model]]
+    defaults = [
+        field
+        for field in opts.concrete_fields
+        if field not in fields and not field.primary_key
+    ]
+    extra = tuple(field.get_default() for field in defaults)
+    columns = ", ".join(qn(field.column) for field in fields + defaults)
+    count = 0
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY {qn(opts.db_table)} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row + extra)
+                count += 1
+    return count
+
+
+def _secondary_indexes(table):
+    """Return ``(drop, create)`` SQL of non-unique indexes and foreign keys."""
+    qn = connection.ops.quote_name
+    drop, create = [], []
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [table],
+            )
+            for name, definition in cursor.fetchall():
+                drop.append(f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(name)}")
+                create.append(
+                    f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}"
+                )
+            cursor.execute(
+                "SELECT i.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x "
+                "JOIN pg_class i ON i.oid = x.indexrelid "
+                "WHERE x.indrelid = %s::regclass AND NOT x.indisunique",
+                [table],
+            )
+        else:
+            # Индексы уникальных ограничений SQLite создает сам, без sql
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = %s AND sql LIKE 'CREATE INDEX%%'",
+                [table],
+            )
+        for name, definition in cursor.fetchall():
+            drop.append(f"DROP INDEX {qn(name)}")
+            create.append(definition)
+    return drop, create
+
+
+@contextmanager
+def deferred_indexes(models):
+    """Drop secondary indexes of ``models`` and build them again on exit.
+
+    Building an index once over loaded rows is much cheaper than updating
+    it per row, and so is validating foreign keys in one pass on
+    PostgreSQL. Unique indexes are kept. Must run inside
+    ``transaction.atomic()``: DDL is transactional in PostgreSQL and
+    SQLite, so a failed load rolls the drop back.
+    """
+    tables = [model._meta.db_table for model in models]
+    statements = [_secondary_indexes(table) for table in tables]
+    with connection.cursor() as cursor:
+        for drop, _ in statements:
+            for sql in drop:
+                cursor.execute(sql)
+    yield
+    with connection.cursor() as cursor:
+        for _, create in statements:
+            for sql in create:
+                cursor.execute(sql)
+        if connection.vendor == "postgresql":
+            for table in tables:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+
+def generate_dataset(dataset, batch_size=BATCH_SIZE, use_copy=None, rebuild=True):
+    """Load ``dataset`` and rebuild derived data.
+
+    Rows are streamed with ``COPY`` on PostgreSQL and inserted with
+    ``bulk_create`` elsewhere, with secondary indexes dropped for the load.
+    Ratings, search documents and profiles are rebuilt once at the end
+    instead of per row by signals.
+
+    Args:
+        dataset: ``Dataset`` to load.
+        batch_size: rows per ``bulk_create``.
+        use_copy: force or disable ``COPY``, by default used on PostgreSQL.
+        rebuild: rebuild derived data; otherwise it is left to the
+            ``rebuild_*`` commands.
+
+    Returns:
+        Dict of row counts of the loaded tables.
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == "postgresql"
+    load = _copy if use_copy else _bulk_create
+    models = [Address, Center, Service, CenterService, User, Comments]
+
+    with transaction.atomic(), explicit_timestamps():
+        with deferred_indexes(models):
+            for batch in _batches(dataset.addresses_and_centers(), batch_size):
+                load(Address, (address for address, _ in batch), batch_size)
+                load(Center, (center for _, center in batch), batch_size)
+            load(Service, dataset.services(), batch_size)
+            load(CenterService, dataset.center_services(), batch_size)
+            load(User, dataset.users(), batch_size)
+            user_ids = list(
+                User.objects.filter(username__startswith=USERNAME_PREFIX)
+                .order_by("username")
+                .values_list("id", flat=True)
+            )
+            load(Comments, dataset.comments(user_ids), batch_size)
+
+        if rebuild:
+            rebuild_ratings()
+            update_search_index()
+            update_profiles()
+        for model in (Address, Center, Service, CenterService, Comments):
+            invalidate_model(model)
+
+    return {
+        "addresses": Address.objects.count(),
+        "centers": Center.objects.count(),
+        "services": Service.objects.count(),
+        "center_services": CenterService.objects.count(),
+        "users": User.objects.count(),
+        "comments": Comments.objects.count(),
+    }
@@ -0,0 +1,135 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+handlers = {}
+
+
+def task(name):
+    """Register the decorated function as the handler of ``name`` jobs.
+
+    A handler gets the list of distinct keys of a batch and must be
+    idempotent: a job is delivered at least once, so a key may be handled
+    again after a worker crash or a failed batch.
+    """
+
+    def register(func):
+        handlers[name] = func
+        return func
+
+    return register
+
+
+def enqueue(name, keys):
+    """Queue a ``name`` job per key in the current transaction.
+
+    Jobs are written with the change that caused them, so they become
+    visible to workers on commit and vanish on rollback. A key that already
+    has a pending job is not queued again. With ``TASK_QUEUE_EAGER`` the
+    keys are handled in this process once the transaction commits instead;
+    they are bound to their own commit hook, so keys queued in a savepoint
+    that was rolled back are dropped with it.
+    """
+    keys = list(dict.fromkeys(str(key) for key in keys))
+    if not keys:
+        return
+    if settings.TASK_QUEUE_EAGER:
+        transaction.on_commit(lambda: handlers[name](keys))
+        return
+    Job.objects.bulk_create(
+        [Job(name=name, key=key) for key in keys], ignore_conflicts=True
+    )
+
+
+def _claimable(now):
+    return Job.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lte=now),
+        failed_at__isnull=True,
+        available_at__lte=now,
+    )
+
+
+def claim_jobs(limit, now=None):
+    """Lock up to ``limit`` due jobs for ``TASK_VISIBILITY_TIMEOUT`` seconds.
+
+    A job whose lock expired, e.g. because its worker died, is claimed
+    again. On PostgreSQL concurrent workers skip each other's rows.
+    """
+    now = now or timezone.now()
+    locked_until = now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+    with transaction.atomic():
+        jobs = list(
+            _claimable(now)
+            .order_by("available_at", "id")
+            .select_for_update(skip_locked=True)[:limit]
+        )
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            locked_until=locked_until, attempts=F("attempts") + 1
+        )
+    for job in jobs:
+        job.locked_until = locked_until
+        job.attempts += 1
+    return jobs
+
+
+def _fail(job, error, now):
+    job.last_error = error
+    if job.attempts >= settings.TASK_MAX_ATTEMPTS or job.name not in handlers:
+        job.failed_at = now
+    else:
+        # Повтор с экспоненциальной задержкой
+        delay = settings.TASK_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.available_at = now + timedelta(seconds=delay)
+        job.locked_until = None
+    try:
+        with transaction.atomic():
+            job.save(
+                update_fields=[
+                    "last_error",
+                    "failed_at",
+                    "available_at",
+                    "locked_until",
+                ]
+            )
+    except IntegrityError:
+        # С тех пор ключ поставлен снова: повтор сольется с новой задачей
+        Job.objects.filter(pk=job.pk).delete()
+
+
+def process_jobs(limit=None, now=None):
+    """Claim one batch of jobs and run their handlers.
+
+    Jobs of a batch are grouped by name, so each handler is called once with
+    the distinct keys of its jobs. Jobs of a handler that succeeded are
+    deleted; otherwise they are retried with a backoff until
+    ``TASK_MAX_ATTEMPTS`` and then kept as failed.
+
+    Returns:
+        Number of claimed jobs.
+    """
+    now = now or timezone.now()
+    jobs = claim_jobs(limit or settings.TASK_BATCH_SIZE, now)
+    batches = {}
+    for job in jobs:
+        batches.setdefault(job.name, []).append(job)
+
+    for name, batch in batches.items():
+        handler = handlers.get(name)
+        try:
+            if handler is None:
+                raise LookupError(f"Unknown task {name!r}.")
+            handler(list(dict.fromkeys(job.key for job in batch)))
+        except Exception as e:
+            logger.exception("Task %s failed for %d jobs", name, len(batch))
+            for job in batch:
+                _fail(job, f"{type(e).__name__}: {e}", now)
+        else:
+            Job.objects.filter(pk__in=[job.pk for job in batch]).delete()
+    return len(jobs)
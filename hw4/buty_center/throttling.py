@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Return tokens per second of a ``"<count>/<period>"`` rate, e.g. ``5/min``.
+
+    Raises:
+        ValueError: if ``rate`` is malformed or not positive.
+    """
+    try:
+        count, period = rate.split("/")
+        tokens = int(count) / DURATIONS[period[0]]
+    except (AttributeError, IndexError, KeyError, ValueError):
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. '5/min'.")
+    if tokens <= 0:
+        raise ValueError(f"Rate {rate!r} must be positive.")
+    return tokens
+
+
+def check_buckets(buckets):
+    """Validate ``THROTTLE_BUCKETS`` once at startup instead of per request."""
+    for scope, bucket in buckets.items():
+        try:
+            parse_rate(bucket["rate"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ImproperlyConfigured(f"THROTTLE_BUCKETS[{scope!r}]: {e}")
+        burst = bucket.get("burst", 1)
+        if not isinstance(burst, int) or burst < 1:
+            raise ImproperlyConfigured(
+                f"THROTTLE_BUCKETS[{scope!r}]: burst must be a positive integer."
+            )
+
+
+def take_token(state, now, rate, capacity):
+    """Refill a bucket up to ``now`` and take one token from it.
+
+    Args:
+        state: ``(tokens, updated_at)`` of the bucket or ``None`` for a full one.
+
+    Returns:
+        Tuple of seconds to wait for a token (0 if it was taken) and the new
+        state of the bucket.
+    """
+    tokens, updated_at = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(now - updated_at, 0) * rate)
+    if tokens >= 1:
+        return 0, (tokens - 1, now)
+    return (1 - tokens) / rate, (tokens, now)
+
+
+class LocalBucketStore:
+    """Buckets in the memory of this process.
+
+    The least recently used buckets are dropped beyond ``max_size``; a
+    dropped bucket comes back full, as it would have refilled anyway if the
+    client has been idle.
+    """
+
+    max_size = 100000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, now, rate, capacity):
+        with self._lock:
+            wait, self._buckets[key] = take_token(
+                self._buckets.get(key), now, rate, capacity
+            )
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Buckets in a Django cache shared by all processes.
+
+    Read-modify-write of a bucket is guarded by a short lock taken with the
+    atomic ``cache.add``. A client whose bucket stays locked is already
+    sending requests in parallel, so it is throttled instead of waiting.
+    The lock holds a random token and is released only while it still holds
+    it, so a lock that expired and was taken by another process is kept.
+    """
+
+    lock_attempts = 5
+    lock_delay = 0.002
+    lock_timeout = 1
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def consume(self, key, now, rate, capacity):
+        lock = f"{key}:lock"
+        token = uuid4().hex
+        for _ in range(self.lock_attempts):
+            if self.cache.add(lock, token, self.lock_timeout):
+                break
+            time.sleep(self.lock_delay)
+        else:
+            return 1 / rate
+
+        try:
+            wait, state = take_token(self.cache.get(key), now, rate, capacity)
+            # Полное ведро хранить незачем: отсутствующее ведро и есть полное
+            self.cache.set(key, state, int(capacity / rate) + 1)
+        finally:
+            # API кеша Django не умеет удалять по значению, окно между get и
+            # delete остается, но чужая блокировка после истечения не снимается
+            if self.cache.get(lock) == token:
+                self.cache.delete(lock)
+        return wait
+
+
+local_store = LocalBucketStore()
+
+
+def get_store():
+    alias = settings.THROTTLE_CACHE_ALIAS
+    return CacheBucketStore(caches[alias]) if alias else local_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Token bucket per client and ``scope``.
+
+    ``THROTTLE_BUCKETS[scope]`` gives the refill ``rate`` and the ``burst``
+    capacity of the bucket; a scope without settings is not throttled.
+    Clients are authenticated users or, for anonymous requests, addresses.
+    A check costs one bucket update in the store of ``get_store()``, and a
+    throttled request gets ``Retry-After`` with the time to the next token.
+    """
+
+    scope = None
+    timer = time.time
+
+    def allow_request(self, request, view):
+        bucket = settings.THROTTLE_BUCKETS.get(self.scope)
+        if not bucket:
+            return True
+        rate = parse_rate(bucket["rate"])
+        capacity = bucket.get("burst", 1)
+        key = f"throttle:{self.scope}:{self.get_client(request)}"
+        self.wait_time = get_store().consume(key, self.timer(), rate, capacity)
+        return self.wait_time == 0
+
+    def get_client(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def wait(self):
+        return self.wait_time
+
+
+class CommentThrottle(TokenBucketThrottle):
+    scope = "comments"
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = "register"
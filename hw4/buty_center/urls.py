@@ -6,10 +6,16 @@ from .views import (
     ServiceViewSet,
     CommentsViewSet,
     CenterServiceViewSet,
+    cache_stats,
+    auth_cache_stats,
+    db_pool_stats,
+    export,
+    metrics,
+    profiling_stats,
 )
+from .async_views import AsyncCenterView, AsyncServiceView, AsyncCommentsView
 from rest_framework.authtoken.views import obtain_auth_token
 
-
 router = DefaultRouter()
 router.register(r"addresses", AddressViewSet)
 router.register(r"centers", CenterViewSet)
@@ -22,16 +28,35 @@ router.register(
 
 urlpatterns = [
     path("api-token-auth/", obtain_auth_token, name="api_token_auth"),
-    path("", include(router.urls)),
+    path("cache-stats/", cache_stats, name="cache-stats"),
+    path("auth-cache-stats/", auth_cache_stats, name="auth-cache-stats"),
+    path("db-pool-stats/", db_pool_stats, name="db-pool-stats"),
+    path("profiling-stats/", profiling_stats, name="profiling-stats"),
+    path("metrics/", metrics, name="metrics"),
+    path("export/<slug:resource>/", export, name="export"),
+    # Асинхронные эндпоинты только для чтения, запись идет через viewset-ы
+    path("async/centers/", AsyncCenterView.as_view(), name="async-center-list"),
+    path(
+        "async/centers/<uuid:pk>/",
+        AsyncCenterView.as_view(),
+        name="async-center-detail",
+    ),
     path(
-        "centers/<uuid:pk>/services/",
-        CenterViewSet.as_view({"get": "services"}),
-        name="center-services",
+        "async/centers/<uuid:center_id>/comments/",
+        AsyncCommentsView.as_view(),
+        name="async-center-comments",
     ),
+    path("async/services/", AsyncServiceView.as_view(), name="async-service-list"),
     path(
-        "centers/<uuid:center_id>/comments/",
-        CommentsViewSet.as_view({"get": "retrieve_comments"}),
-        name="center-comments",
+        "async/services/<uuid:pk>/",
+        AsyncServiceView.as_view(),
+        name="async-service-detail",
     ),
-    path("create_comment/", CommentsViewSet.create, name="create-comment"),
+    path("async/comments/", AsyncCommentsView.as_view(), name="async-comments-list"),
+    path(
+        "async/comments/<uuid:pk>/",
+        AsyncCommentsView.as_view(),
+        name="async-comments-detail",
+    ),
+    path("", include(router.urls)),
 ]
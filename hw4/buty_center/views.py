@@ -1,4 +1,14 @@
-from rest_framework import viewsets
+import hashlib
+from uuid import UUID
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import filters, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
 from .models import Address, Center, Service, Comments, CenterService
 from .serializers import (
     AddressSerializer,
@@ -7,22 +17,208 @@ from .serializers import (
     CommentsSerializer,
     CenterServiceSerializer,
 )
+from .filters import (
+    QueryParamFilter,
+    CENTER_FILTERS,
+    SERVICE_FILTERS,
+    CENTER_SERVICE_FILTERS,
+    COMMENT_FILTERS,
+)
+from .authentication import stats as auth_cache_stats_counter, token_cache
+from .bulk import (
+    BulkUpsertMixin,
+    BulkCenterServiceSerializer,
+    check_link_references,
+    upsert_centers,
+    upsert_services,
+    upsert_center_services,
+)
+from .cache import CachedResponseMixin, stats as cache_stats_counter
+from .conditional import ConditionalResponseMixin
+from .export import FORMATS, ExportError, export_rows, render_lines
+from .flat import FlatListMixin
+from .geo import nearest_centers
+from .parsers import ORJSONParser
+from .profiles import get_profile
+from .profiling import registry as profiling_registry
+from .ratings import comment_summaries, remove_mark
+from .renderers import ORJSONRenderer
+from .search import search_centers
+from .throttling import CommentThrottle
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 
+# JSON через orjson; Browsable API, формы и multipart как по умолчанию в DRF
+API_RENDERERS = [ORJSONRenderer, BrowsableAPIRenderer]
+API_PARSERS = [ORJSONParser, FormParser, MultiPartParser]
 
-class AddressViewSet(viewsets.ModelViewSet):
+
+class AddressViewSet(
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    FlatListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Address.objects.all()
     serializer_class = AddressSerializer
+    flat_serializer_class = AddressSerializer
+    renderer_classes = API_RENDERERS
+    parser_classes = API_PARSERS
     permission_classes = [AllowAny]
+    cursor_ordering = ("id",)
+    cache_dependencies = (Address,)
 
 
-class CenterViewSet(viewsets.ModelViewSet):
-    queryset = Center.objects.all()
+class CenterViewSet(
+    BulkUpsertMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = (
+        Center.objects.select_related("address")
+        .prefetch_related(
+            Prefetch(
+                "centerservice_set",
+                queryset=CenterService.objects.select_related("service"),
+            )
+        )
+        .defer("search_document", "search_vector")
+    )
     serializer_class = CenterSerializer
+    renderer_classes = API_RENDERERS
+    parser_classes = API_PARSERS
     permission_classes = [AllowAny]
+    cursor_ordering = ("name", "id")
+    filter_backends = [QueryParamFilter, filters.OrderingFilter]
+    query_filters = CENTER_FILTERS
+    ordering_fields = ["name", "rating_avg", "rating_count"]
+    # Comments входят в зависимости из-за rating_avg/rating_count
+    cache_dependencies = (Center, Address, CenterService, Service, Comments)
+    bulk_serializer_class = CenterSerializer
+    search_max_limit = 50
+    nearby_max_radius_km = 100
+    nearby_max_limit = 100
+
+    def bulk_upsert(self, items):
+        return upsert_centers(items)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not query:
+            return Response(
+                {"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), self.search_max_limit)
+
+        ranked = search_centers(query, limit)
+        centers = self.get_queryset().in_bulk([pk for pk, _ in ranked])
+        results = []
+        for pk, rank in ranked:
+            if pk not in centers:
+                continue
+            data = self.get_serializer(centers[pk]).data
+            data["rank"] = rank
+            results.append(data)
+        return Response({"results": results})
+
+    @action(detail=False, methods=["get"])
+    def nearby(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            latitude = float(params["lat"])
+            longitude = float(params["lon"])
+            radius = float(params.get("radius", 5))
+            limit = int(params.get("limit", 20))
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "lat and lon are required, radius and limit numbers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return Response(
+                {"error": "lat or lon is out of range."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 0 < radius <= self.nearby_max_radius_km:
+            return Response(
+                {"error": f"radius must be in (0, {self.nearby_max_radius_km}] km."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = min(max(limit, 1), self.nearby_max_limit)
+
+        ranked = nearest_centers(latitude, longitude, radius, limit)
+        centers = self.get_queryset().in_bulk([pk for pk, _ in ranked])
+        results = []
+        for pk, distance in ranked:
+            if pk not in centers:
+                continue
+            data = self.get_serializer(centers[pk]).data
+            data["distance_km"] = round(distance, 3)
+            results.append(data)
+        return Response({"results": results})
+
+    @action(detail=True, methods=["get"])
+    def profile(self, request, *args, **kwargs):
+        # Документ хранится готовым JSON и отдается без сериализации
+        try:
+            profile = get_profile(UUID(kwargs["pk"]))
+        except ValueError:
+            profile = None
+        if profile is None:
+            raise NotFound("No Center matches the given query.")
+
+        document, updated_at = profile
+        raw = f"profile|{kwargs['pk']}|{updated_at.isoformat()}"
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        last_modified = int(updated_at.timestamp())
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(document, content_type="application/json")
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        serializer_class=CenterServiceSerializer,
+        filter_backends=[],
+        cursor_ordering=("id",),
+    )
+    def services(self, request, *args, **kwargs):
+        # Один запрос по индексу (center_id, id) с JOIN услуги; центр
+        # не читается, его наличие проверяется только для пустой страницы
+        try:
+            center_id = UUID(kwargs["pk"])
+        except ValueError:
+            raise NotFound("No Center matches the given query.")
+        queryset = CenterService.objects.filter(center_id=center_id).select_related(
+            "service"
+        )
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        if not rows and not Center.objects.filter(pk=center_id).exists():
+            raise NotFound("No Center matches the given query.")
+
+        serializer = self.get_serializer(rows, many=True)
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -31,16 +227,50 @@ class CenterViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
-    queryset = Service.objects.all()
+class ServiceViewSet(
+    BulkUpsertMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    FlatListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Service.objects.prefetch_related(
+        Prefetch("centers", queryset=Center.objects.only("id"))
+    )
     serializer_class = ServiceSerializer
+    flat_serializer_class = ServiceSerializer
+    renderer_classes = API_RENDERERS
+    parser_classes = API_PARSERS
     permission_classes = [AllowAny]
+    cursor_ordering = ("name", "id")
+    filter_backends = [QueryParamFilter]
+    query_filters = SERVICE_FILTERS
+    cache_dependencies = (Service, CenterService)
+    bulk_serializer_class = ServiceSerializer
 
+    def bulk_upsert(self, items):
+        return upsert_services(items)
 
-class CommentsViewSet(viewsets.ModelViewSet):
-    queryset = Comments.objects.all()
+
+class CommentsViewSet(ConditionalResponseMixin, FlatListMixin, viewsets.ModelViewSet):
+    queryset = Comments.objects.select_related("user")
     serializer_class = CommentsSerializer
+    flat_serializer_class = CommentsSerializer
+    renderer_classes = API_RENDERERS
+    parser_classes = API_PARSERS
     permission_classes = [AllowAny]
+    cursor_ordering = ("created_at", "id")
+    filter_backends = [QueryParamFilter]
+    query_filters = COMMENT_FILTERS
+    validator_dependencies = (Comments, User)
+    summary_max_centers = 100
+    summary_max_limit = 20
+
+    def get_throttles(self):
+        # Ограничивается только создание: вставка и пересчет рейтинга центра
+        if self.action == "create":
+            return [CommentThrottle()]
+        return super().get_throttles()
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(
@@ -55,10 +285,60 @@ class CommentsViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         if "center_id" in self.kwargs:
-            center_id = self.kwargs["center_id"]
-            return Comments.objects.filter(center_id=center_id)
-        return super().get_queryset()
+            try:
+                center_id = UUID(str(self.kwargs["center_id"]))
+            except ValueError:
+                raise NotFound("No Center matches the given query.")
+            return queryset.filter(center_id=center_id)
+        return queryset
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            remove_mark(instance.center_id, instance.mark)
+
+    @action(detail=False, methods=["get", "post"])
+    def summary(self, request, *args, **kwargs):
+        if request.method == "POST":
+            if not isinstance(request.data, dict):
+                return Response(
+                    {"error": "Expected a JSON object."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            raw_ids = request.data.get("centers", [])
+            raw_limit = request.data.get("limit", 3)
+        else:
+            raw_ids = [
+                value
+                for param in request.query_params.getlist("centers")
+                for value in param.split(",")
+                if value
+            ]
+            raw_limit = request.query_params.get("limit", 3)
+
+        try:
+            center_ids = list(dict.fromkeys(UUID(str(value)) for value in raw_ids))
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "centers must be UUIDs and limit an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not center_ids or len(center_ids) > self.summary_max_centers:
+            return Response(
+                {"error": f"Pass 1 to {self.summary_max_centers} centers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = min(max(limit, 0), self.summary_max_limit)
+
+        summaries = comment_summaries(center_ids, limit)
+        for summary in summaries.values():
+            summary["comments"] = CommentsSerializer(
+                summary["comments"], many=True, context={"request": request}
+            ).data
+        return Response({str(key): value for key, value in summaries.items()})
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
@@ -75,7 +355,97 @@ class CommentsViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CenterServiceViewSet(viewsets.ModelViewSet):
-    queryset = CenterService.objects.all()
+class CenterServiceViewSet(
+    BulkUpsertMixin,
+    ConditionalResponseMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = CenterService.objects.select_related("service")
     serializer_class = CenterServiceSerializer
+    renderer_classes = API_RENDERERS
+    parser_classes = API_PARSERS
     permission_classes = [AllowAny]
+    cursor_ordering = ("id",)
+    filter_backends = [QueryParamFilter]
+    query_filters = CENTER_SERVICE_FILTERS
+    cache_dependencies = (CenterService, Service)
+    bulk_serializer_class = BulkCenterServiceSerializer
+
+    def check_bulk_references(self, items):
+        return check_link_references(items)
+
+    def bulk_upsert(self, items):
+        return upsert_center_services(items)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    return Response(cache_stats_counter.as_dict())
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_pool_stats(request):
+    databases = {}
+    for connection in connections.all():
+        # pool есть только у PostgreSQL с OPTIONS["pool"]
+        pool = getattr(connection, "pool", None)
+        databases[connection.alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "pool": pool.get_stats() if pool is not None else None,
+        }
+    return Response(databases)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profiling_stats(request):
+    return Response(profiling_registry.as_dict())
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    # Текстовый формат Prometheus, минуя рендереры DRF
+    return HttpResponse(
+        profiling_registry.as_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def auth_cache_stats(request):
+    return Response({**auth_cache_stats_counter.as_dict(), "size": len(token_cache)})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def export(request, resource):
+    params = request.query_params
+    file_format = params.get("output", "ndjson")
+    if file_format not in FORMATS:
+        return Response(
+            {"error": f"output must be one of: {', '.join(FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        columns, rows = export_rows(
+            resource,
+            center=params.get("center"),
+            created_after=params.get("created_after"),
+            created_before=params.get("created_before"),
+        )
+    except ExportError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(
+        render_lines(columns, rows, file_format), content_type=FORMATS[file_format]
+    )
+    filename = f"{resource}.{file_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
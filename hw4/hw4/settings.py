@@ -1,3 +1,4 @@
+import copy
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -19,6 +20,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "buty_center",
     "rest_framework",
     "rest_framework.authtoken",
@@ -27,6 +29,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "buty_center.middleware.ReplicaRoutingMiddleware",
+    "buty_center.profiling.ProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -57,6 +61,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "hw4.wsgi.application"
 
+# Пул соединений psycopg 3 на процесс (DATABASE_POOL=1). Без пула соединения
+# постоянные и живут DATABASE_CONN_MAX_AGE секунд; вместе их Django не допускает.
+DATABASE_POOL = os.environ.get("DATABASE_POOL", "0") == "1"
+
+# hw4/asgi.py выставляет DJANGO_ASGI=1. Под ASGI синхронный код выполняется
+# в потоках sync_to_async, и постоянное соединение держалось бы каждым из них,
+# поэтому по умолчанию соединения закрываются после запроса (или берется пул).
+ASGI = os.environ.get("DJANGO_ASGI", "0") == "1"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -65,9 +78,124 @@ DATABASES = {
         "PASSWORD": os.environ.get("DATABASE_PASSWORD", "postgres"),
         "HOST": os.environ.get("DATABASE_HOST", "db"),
         "PORT": os.environ.get("DATABASE_PORT", "5432"),
+        "CONN_MAX_AGE": (
+            0
+            if DATABASE_POOL
+            else int(os.environ.get("DATABASE_CONN_MAX_AGE", 0 if ASGI else 60))
+        ),
+        "CONN_HEALTH_CHECKS": os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "1") == "1",
+        "OPTIONS": {},
+    }
+}
+
+if DATABASE_POOL:
+    # Размеры на один процесс: всего соединений workers * max_size
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+        "max_idle": float(os.environ.get("DATABASE_POOL_MAX_IDLE", 300)),
+    }
+
+# Реплики только для чтения: DATABASE_REPLICAS=host1[:port],host2[:port].
+# В тестах реплики - зеркала основной базы.
+for number, replica in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICAS", "").split(",")), 1
+):
+    host, _, port = replica.strip().partition(":")
+    DATABASES[f"replica{number}"] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+DATABASE_ROUTERS = ["buty_center.routers.ReplicaRouter"]
+
+# Сколько секунд после записи клиент читает с основной базы: не меньше
+# задержки репликации
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "buty-center"),
     }
 }
 
+API_CACHE_ALIAS = "default"
+
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", 300))
+
+# Кеш токенов авторизации: размер LRU процесса, TTL в секундах (0 - без кеша)
+# и необязательный общий кеш из CACHES
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", 10000))
+
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", 60))
+
+AUTH_TOKEN_CACHE_ALIAS = os.environ.get("AUTH_TOKEN_CACHE_ALIAS", "")
+
+# Token bucket на клиента и эндпоинт: rate пополняет ведро емкостью burst.
+# Ведра хранятся в кеше THROTTLE_CACHE_ALIAS из CACHES, общем для процессов;
+# пустая строка - в памяти процесса.
+THROTTLE_BUCKETS = {
+    "comments": {
+        "rate": os.environ.get("THROTTLE_COMMENTS_RATE", "30/min"),
+        "burst": int(os.environ.get("THROTTLE_COMMENTS_BURST", 20)),
+    },
+    "register": {
+        "rate": os.environ.get("THROTTLE_REGISTER_RATE", "20/hour"),
+        "burst": int(os.environ.get("THROTTLE_REGISTER_BURST", 10)),
+    },
+}
+
+THROTTLE_CACHE_ALIAS = os.environ.get("THROTTLE_CACHE_ALIAS", "default")
+
+# Очередь задач в базе (buty_center.tasks), ее разбирает manage.py run_worker.
+# TASK_QUEUE_EAGER=1 выполняет задачи в процессе после коммита, без воркера.
+TASK_QUEUE_EAGER = os.environ.get("TASK_QUEUE_EAGER", "0") == "1"
+
+TASK_BATCH_SIZE = int(os.environ.get("TASK_BATCH_SIZE", 100))
+
+# Сколько секунд взятая задача скрыта от других воркеров
+TASK_VISIBILITY_TIMEOUT = int(os.environ.get("TASK_VISIBILITY_TIMEOUT", 300))
+
+TASK_MAX_ATTEMPTS = int(os.environ.get("TASK_MAX_ATTEMPTS", 5))
+
+# Задержка первого повтора в секундах, дальше удваивается
+TASK_RETRY_DELAY = int(os.environ.get("TASK_RETRY_DELAY", 10))
+
+# Профилирование запросов по маршрутам (buty_center.profiling): задержка,
+# SQL, сериализация и размер ответа. Запрос, выполнивший один SQL не меньше
+# PROFILING_DUPLICATE_THRESHOLD раз, отмечается как N+1.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+
+PROFILING_DUPLICATE_THRESHOLD = int(
+    os.environ.get("PROFILING_DUPLICATE_THRESHOLD", 5)
+)
+
+SEARCH_CONFIG = os.environ.get("SEARCH_CONFIG", "russian")
+
+GEOCODER_GAZETTEER = os.environ.get("GEOCODER_GAZETTEER", "")
+
+# Пароли хешируются в пуле процессов: число процессов в каждом процессе
+# сервера (0 - хешировать в потоке запроса), сколько паролей может ждать
+# свободный процесс, прежде чем запросы получат 503, и сколько секунд ждать
+# результата
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
+PASSWORD_HASHING_QUEUE = int(os.environ.get("PASSWORD_HASHING_QUEUE", 32))
+
+PASSWORD_HASHING_TIMEOUT = int(os.environ.get("PASSWORD_HASHING_TIMEOUT", 10))
+
+AUTHENTICATION_BACKENDS = ["buty_center.backends.PooledModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -98,11 +226,13 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "buty_center.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_PAGINATION_CLASS": "buty_center.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
 CORS_ALLOWED_ORIGINS = [
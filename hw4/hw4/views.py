@@ -1,14 +1,17 @@
 from django.contrib.auth.models import User
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from buty_center.hashing import hash_password
+from buty_center.throttling import RegisterThrottle
 
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterThrottle])
 def register(request):
     username = request.data.get("username")
     password = request.data.get("password")
@@ -26,9 +29,13 @@ def register(request):
             {"error": "Invalid email format."}, status=status.HTTP_400_BAD_REQUEST
         )
 
+    # Хеш считается в пуле процессов; при перегрузке пула ответ - 503
+    encoded = hash_password(password)
     try:
-        user = User.objects.create_user(
-            username=username, password=password, email=email
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            password=encoded,
         )
         user.save()
         return Response(
@@ -0,0 +1,35 @@
+"""Helpers for benchmarks kept in the test suite.
+
+Benchmarks are slow, so they run only when ``RUN_BENCHMARKS=1`` is set:
+
+    RUN_BENCHMARKS=1 python manage.py test tests.test_filters
+"""
+
+import os
+import time
+import unittest
+
+
+def benchmark(test_item):
+    """Skip the decorated test or test case unless benchmarks are enabled."""
+    enabled = os.environ.get("RUN_BENCHMARKS") == "1"
+    return unittest.skipUnless(enabled, "set RUN_BENCHMARKS=1 to run")(test_item)
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def best_time(func, repeat=5):
+    """Return the best wall time of ``repeat`` calls of ``func`` in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(name, **values):
+    line = ", ".join(f"{key}={value}" for key, value in values.items())
+    print(f"\n[benchmark] {name}: {line}")
@@ -0,0 +1,49 @@
+"""EXPLAIN-based assertions on query plans.
+
+Planners read small tables with sequential scans whatever the indexes are.
+Plans are checked on tables filled with ``generate_data`` and analyzed, and
+on PostgreSQL with ``enable_seqscan`` off, so a test-sized table still shows
+whether a usable index exists; a missing one still gives a scan or a sort.
+"""
+
+import re
+
+from django.db import connections
+
+# Строки плана с полным чтением таблицы или сортировкой в памяти
+UNINDEXED = {
+    "postgresql": [r"Seq Scan on \S+", r"\bSort\b"],
+    "sqlite": [r"\bSCAN \S+$", r"USE TEMP B-TREE FOR .*"],
+}
+
+
+def analyze(using="default"):
+    """Refresh planner statistics after loading test data."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+class QueryPlanMixin:
+    """Assertions for ``TestCase`` classes checking plans of querysets."""
+
+    def assertIndexScan(self, queryset, index):
+        """Assert ``queryset`` reads ``index`` without table scans or sorts."""
+        connection = connections[queryset.db]
+        vendor = connection.vendor
+        if vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            try:
+                plan = queryset.explain()
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("RESET enable_seqscan")
+        else:
+            plan = queryset.explain()
+        for pattern in UNINDEXED.get(vendor, []):
+            match = re.search(pattern, plan, re.MULTILINE)
+            if match:
+                self.fail(
+                    f"{match.group(0)!r} in the plan of {queryset.query}:\n{plan}"
+                )
+        self.assertIn(index, plan)
@@ -0,0 +1,44 @@
+"""Builders of centers shared by the test modules."""
+
+from buty_center.models import Address, Center, CenterService
+
+PHONE = "+71234567890"
+
+
+def address_data(number=123, city="Anytown", street="Main St", **fields):
+    """Return address fields, as stored or as sent in a payload."""
+    return {
+        "street": street,
+        "city": city,
+        "state": "State",
+        "number": number,
+        **fields,
+    }
+
+
+def center_item(num, city="Anytown"):
+    """Return the payload of ``Center <num>`` for the center endpoints."""
+    return {
+        "name": f"Center {num}",
+        "phone": PHONE,
+        "address": address_data(num, city=city),
+    }
+
+
+def create_center(name, phone=PHONE, **address):
+    """Create a center with its own address built by ``address_data``."""
+    address = Address.objects.create(**address_data(**address))
+    return Center.objects.create(name=name, phone=phone, address=address)
+
+
+def create_centers(count, services=()):
+    """Create ``count`` centers, each linked to all ``services``."""
+    centers = []
+    for num in range(count):
+        center = create_center(f"Center {num}", number=num, street=f"Street {num}")
+        for service in services:
+            CenterService.objects.create(
+                center=center, service=service, description="Description"
+            )
+        centers.append(center)
+    return centers
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from buty_center.ratings import rebuild_ratings
+from django.contrib.auth.models import User
+
+
+class AsyncReadViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        service = Service.objects.create(name="Haircut", category="Hair")
+        self.centers = []
+        for num in range(5):
+            address = Address.objects.create(
+                street="Main St", city="Anytown", state="State", number=num
+            )
+            center = Center.objects.create(
+                name=f"Center {num}", phone="+71234567890", address=address
+            )
+            CenterService.objects.create(
+                center=center, service=service, description="Description"
+            )
+            Comments.objects.create(
+                content=f"Comment {num}",
+                mark=num % 5 + 1,
+                center=center,
+                user=self.user,
+            )
+            self.centers.append(center)
+        rebuild_ratings()
+        self.service = service
+
+    def assertSameResults(self, sync_url, async_url, params=None):
+        expected = self.client.get(sync_url, params)
+        actual = self.client.get(async_url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual["Content-Type"], "application/json")
+        expected, actual = expected.json(), actual.json()
+        if "results" in expected:
+            self.assertEqual(actual["results"], expected["results"])
+            self.assertEqual(actual["next"] is None, expected["next"] is None)
+        else:
+            self.assertEqual(actual, expected)
+        return actual
+
+    def test_lists_match_sync_viewsets(self):
+        self.assertSameResults(reverse("center-list"), reverse("async-center-list"))
+        self.assertSameResults(reverse("service-list"), reverse("async-service-list"))
+        self.assertSameResults(reverse("comments-list"), reverse("async-comments-list"))
+
+    def test_details_match_sync_viewsets(self):
+        center = self.centers[2]
+        self.assertSameResults(
+            reverse("center-detail", args=[center.pk]),
+            reverse("async-center-detail", args=[center.pk]),
+        )
+        self.assertSameResults(
+            reverse("service-detail", args=[self.service.pk]),
+            reverse("async-service-detail", args=[self.service.pk]),
+        )
+
+    def test_filters_ordering_and_cursor(self):
+        params = {"rating_min": 2, "ordering": "-rating_avg", "page_size": 2}
+        page = self.assertSameResults(
+            reverse("center-list"), reverse("async-center-list"), params
+        )
+        following = self.client.get(page["next"]).json()
+        self.assertEqual(
+            [center["rating_avg"] for center in following["results"]], [3.0, 2.0]
+        )
+
+    def test_comments_of_center(self):
+        center = self.centers[1]
+        url = reverse("async-center-comments", args=[center.pk])
+        results = self.client.get(url).json()["results"]
+        self.assertEqual([comment["content"] for comment in results], ["Comment 1"])
+
+    def test_errors(self):
+        response = self.client.get(reverse("async-center-detail", args=[uuid4()]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            response.json(), {"detail": "No Center matches the given query."}
+        )
+        response = self.client.get(reverse("async-comments-list"), {"mark_min": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"mark_min": ["Invalid value."]})
+        response = self.client.get(reverse("async-center-list"), {"cursor": "bad"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_list_follows_writes(self):
+        url = reverse("async-center-list")
+        self.client.get(url)
+        self.client.patch(
+            reverse("center-detail", args=[self.centers[0].pk]),
+            {"name": "Renamed"},
+            format="json",
+        )
+        names = [center["name"] for center in self.client.get(url).json()["results"]]
+        self.assertIn("Renamed", names)
+
+    def test_writes_are_not_served(self):
+        response = self.client.post(reverse("async-center-list"), {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_concurrent_requests_on_one_loop(self):
+        client = AsyncClient()
+        urls = [
+            reverse("async-center-list"),
+            reverse("async-service-list"),
+            reverse("async-comments-list"),
+        ] * 10
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertEqual(len(json.loads(responses[0].content)["results"]), 5)
@@ -0,0 +1,152 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from buty_center.authentication import (
+    CachedTokenAuthentication,
+    TokenCache,
+    _shared_key,
+    stats,
+    token_cache,
+)
+from buty_center.cache import get_cache
+from django.contrib.auth.models import User
+
+
+class TokenCacheTest(SimpleTestCase):
+    @override_settings(AUTH_TOKEN_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=10)
+    def test_entry_expires_after_ttl(self):
+        now = [100.0]
+        cache = TokenCache(clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] += 9
+        self.assertEqual(cache.get("a"), 1)
+        now[0] += 1
+        self.assertIsNone(cache.get("a"))
+
+
+@override_settings(AUTH_TOKEN_CACHE_TTL=60)
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        stats.reset()
+        get_cache().clear()
+        self.user = User.objects.create(username="testuser", password="password")
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("center-list")
+
+    def get(self):
+        return self.client.get(self.url)
+
+    def auth_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if "authtoken_token" in query["sql"] or "auth_user" in query["sql"]
+        ]
+
+    def test_steady_state_requests_do_not_query_tokens(self):
+        self.assertEqual(len(self.auth_queries()), 1)
+        for _ in range(3):
+            self.assertEqual(self.auth_queries(), [])
+        self.assertEqual(stats.as_dict()["hits"], 3)
+        self.assertEqual(stats.as_dict()["misses"], 1)
+
+    def test_requests_get_own_user_instances(self):
+        authentication = CachedTokenAuthentication()
+        first, _ = authentication.authenticate_credentials(self.token.key)
+        first.username = "changed"
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+        self.assertIsNot(user, first)
+        self.assertEqual(user.username, "testuser")
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertIs(token.user, user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_rejected_immediately(self):
+        self.get()
+        self.token.delete()
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_in_another_process_applies_after_ttl(self):
+        now = [1000.0]
+        self.addCleanup(setattr, token_cache, "clock", token_cache.clock)
+        token_cache.clock = lambda: now[0]
+        self.get()
+
+        # Токен отозван другим процессом: сигнал до этого кеша не доходит
+        with mock.patch("buty_center.signals.forget_token"):
+            self.token.delete()
+        now[0] += 59
+        self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+        now[0] += 1
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_zero_ttl_disables_cache(self):
+        self.get()
+        self.assertEqual(len(self.auth_queries()), 1)
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS="default")
+    def test_password_hash_is_not_cached(self):
+        self.get()
+        local = token_cache.get(self.token.key)
+        shared = caches["default"].get(_shared_key(self.token.key))
+        for resolved in (local, shared):
+            self.assertEqual(resolved["user"]["username"], "testuser")
+            self.assertNotIn("password", resolved["user"])
+
+        user, _ = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertEqual(user.password, self.user.password)
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS="default")
+    def test_shared_cache(self):
+        self.get()
+        token_cache.clear()
+        self.assertEqual(self.auth_queries(), [])
+
+        self.token.delete()
+        token_cache.clear()
+        self.assertEqual(self.get().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stats_endpoint(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.get()
+        self.get()
+        response = self.client.get(reverse("auth-cache-stats"))
+        self.assertEqual(response.data["misses"], 1)
+        self.assertEqual(response.data["hits"], 2)
+        self.assertEqual(response.data["size"], 1)
@@ -0,0 +1,147 @@
+import time
+from uuid import uuid4
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Service, CenterService
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, env_int, report
+from tests.factories import center_item
+
+
+class BulkAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, name, items):
+        return self.client.post(reverse(name), items, format="json")
+
+    def test_bulk_create_centers(self):
+        response = self.post("center-bulk", [center_item(num) for num in range(5)])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(Center.objects.count(), 5)
+        self.assertEqual(Address.objects.count(), 5)
+        center = Center.objects.get(pk=response.data["ids"][2])
+        self.assertEqual(center.address.number, 2)
+
+    def test_upsert_by_name_and_phone(self):
+        first = self.post("center-bulk", [center_item(1), center_item(2)])
+        items = [center_item(2, city="Newtown"), center_item(3), center_item(3)]
+        response = self.post("center-bulk", items)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["ids"][0], first.data["ids"][1])
+        self.assertEqual(response.data["ids"][1], response.data["ids"][2])
+        self.assertEqual(Center.objects.count(), 3)
+        center = Center.objects.get(pk=first.data["ids"][1])
+        self.assertEqual(center.address.city, "Newtown")
+
+        detail = self.client.get(reverse("center-detail", args=[center.pk]))
+        self.assertEqual(detail.data["address"]["city"], "Newtown")
+
+    def test_upsert_moves_coordinates(self):
+        def nearby(latitude, longitude):
+            response = self.client.get(
+                reverse("center-nearby"), {"lat": latitude, "lon": longitude}
+            )
+            return [center["name"] for center in response.data["results"]]
+
+        item = center_item(1)
+        item["address"] |= {"latitude": 55.75, "longitude": 37.61}
+        self.post("center-bulk", [item])
+        self.assertEqual(nearby(55.75, 37.61), ["Center 1"])
+
+        item["address"] |= {"latitude": 59.93, "longitude": 30.33}
+        response = self.post("center-bulk", [item])
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(nearby(55.75, 37.61), [])
+        self.assertEqual(nearby(59.93, 30.33), ["Center 1"])
+
+        # Без координат в элементе сохраняются прежние
+        response = self.post("center-bulk", [center_item(1)])
+        self.assertEqual(response.data["updated"], 0)
+        self.assertEqual(nearby(59.93, 30.33), ["Center 1"])
+
+    def test_invalid_item_rejects_whole_batch(self):
+        broken = center_item(2)
+        del broken["address"]["city"]
+        response = self.post("center-bulk", [center_item(1), broken])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNone(response.data["errors"][0])
+        self.assertIn("address", response.data["errors"][1])
+        self.assertEqual(Center.objects.count(), 0)
+
+    def test_payload_must_be_a_list(self):
+        response = self.post("center-bulk", center_item(1))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.post("center-bulk", [])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_services(self):
+        Service.objects.create(name="Haircut", category="Hair")
+        items = [
+            {"name": "Haircut", "category": "Hair"},
+            {"name": "Manicure", "category": "Nails"},
+        ]
+        response = self.post("service-bulk", items)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["updated"], 0)
+        self.assertEqual(Service.objects.count(), 2)
+
+    def test_bulk_center_service_links(self):
+        centers = self.post("center-bulk", [center_item(1)]).data["ids"]
+        service = Service.objects.create(name="Haircut", category="Hair")
+        item = {"center": centers[0], "service": str(service.id), "description": "A"}
+
+        response = self.post("centerservice-bulk", [item])
+        self.assertEqual(response.data["created"], 1)
+        response = self.post("centerservice-bulk", [item | {"description": "B"}])
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(CenterService.objects.get().description, "B")
+        response = self.post("centerservice-bulk", [item | {"description": "B"}])
+        self.assertEqual(response.data["updated"], 0)
+
+        unknown = item | {"service": str(uuid4())}
+        response = self.post("centerservice-bulk", [item, unknown])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], None)
+        self.assertIn("service", response.data["errors"][1])
+
+
+@benchmark
+class BulkImportBenchmark(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="password")
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_is_faster_than_per_item(self):
+        total = env_int("BENCHMARK_CENTERS", 10000)
+        single = min(total, env_int("BENCHMARK_SINGLE_CENTERS", 500))
+
+        started = time.perf_counter()
+        for num in range(single):
+            self.client.post(reverse("center-list"), center_item(num), format="json")
+        single_rate = single / (time.perf_counter() - started)
+
+        items = [center_item(single + num) for num in range(total)]
+        started = time.perf_counter()
+        response = self.client.post(reverse("center-bulk"), items, format="json")
+        bulk_seconds = time.perf_counter() - started
+
+        self.assertEqual(response.data["created"], total)
+        bulk_rate = total / bulk_seconds
+        report(
+            "center import",
+            per_item_rows_per_sec=round(single_rate),
+            bulk_rows_per_sec=round(bulk_rate),
+            bulk_seconds=round(bulk_seconds, 2),
+        )
+        self.assertGreater(bulk_rate, single_rate * 2)
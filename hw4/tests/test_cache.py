@@ -0,0 +1,120 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.cache import stats
+from buty_center.models import Address, Center, Service, CenterService
+from django.contrib.auth.models import User
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        stats.reset()
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=123
+        )
+        self.center = Center.objects.create(
+            name="Main Center", phone="+71234567890", address=self.address
+        )
+        self.detail_url = reverse("center-detail", args=[self.center.id])
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(self.detail_url)
+
+        # Валидаторы ETag/Last-Modified тоже берутся из кеша
+        self.assertEqual(context.captured_queries, [])
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(stats.as_dict()["hits"], 1)
+        self.assertEqual(stats.as_dict()["misses"], 1)
+
+    def test_nested_address_update_invalidates_center(self):
+        list_url = reverse("center-list")
+        self.client.get(self.detail_url)
+        self.client.get(list_url)
+
+        data = {
+            "name": "Main Center",
+            "phone": "+71234567890",
+            "address": {
+                "street": "Main St",
+                "city": "Newtown",
+                "state": "State",
+                "number": 123,
+            },
+        }
+        response = self.client.put(self.detail_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        detail = self.client.get(self.detail_url)
+        listing = self.client.get(list_url)
+        self.assertEqual(detail.data["address"]["city"], "Newtown")
+        self.assertEqual(listing.data["results"][0]["address"]["city"], "Newtown")
+        self.assertEqual(stats.as_dict()["hits"], 0)
+
+    def test_related_writes_invalidate_center(self):
+        self.client.get(self.detail_url)
+        service = Service.objects.create(name="Haircut", category="Hair")
+        CenterService.objects.create(
+            center=self.center, service=service, description="Description"
+        )
+        response = self.client.get(self.detail_url)
+        self.assertEqual(len(response.data["services"]), 1)
+
+        self.client.post(
+            reverse("comments-list"),
+            {"content": "Nice", "mark": 5, "center_id": self.center.id},
+            format="json",
+        )
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data["rating_count"], 1)
+
+    def test_delete_invalidates_list(self):
+        url = reverse("address-list")
+        self.assertEqual(len(self.client.get(url).data["results"]), 1)
+        self.address.delete()
+        self.assertEqual(len(self.client.get(url).data["results"]), 0)
+
+    def test_unrelated_write_keeps_cache(self):
+        url = reverse("address-list")
+        self.client.get(url)
+        Service.objects.create(name="Haircut", category="Hair")
+        self.client.get(url)
+        self.assertEqual(stats.as_dict()["hits"], 1)
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "api": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "api-test",
+            },
+        },
+        API_CACHE_ALIAS="api",
+    )
+    def test_cache_alias_is_configurable(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.assertEqual(stats.as_dict()["hits"], 1)
+        caches["api"].clear()
+        self.client.get(self.detail_url)
+        self.assertEqual(stats.as_dict()["misses"], 2)
+
+    def test_stats_endpoint_requires_admin(self):
+        url = reverse("cache-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(self.detail_url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["misses"], 1)
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.cache import get_cache
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from buty_center.serializers import CenterSerializer
+from django.contrib.auth.models import User
+
+
+class ConditionalRequestTest(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=123
+        )
+        self.center = Center.objects.create(
+            name="Main Center", phone="+71234567890", address=self.address
+        )
+        self.service = Service.objects.create(name="Haircut", category="Hair")
+        self.link = CenterService.objects.create(
+            center=self.center, service=self.service, description="Description"
+        )
+        self.list_url = reverse("center-list")
+        self.detail_url = reverse("center-detail", args=[self.center.id])
+        self.comments_url = reverse(
+            "comment-list", kwargs={"center_id": self.center.id}
+        )
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def post_comment(self):
+        response = self.client.post(
+            reverse("comments-list"),
+            {"content": "Nice", "mark": 5, "center_id": self.center.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def test_validators_are_sent(self):
+        response = self.client.get(self.list_url)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_not_modified_skips_serializer(self):
+        response = self.client.get(self.list_url)
+        with mock.patch.object(CenterSerializer, "to_representation") as serialize:
+            again = self.revalidate(self.list_url, response)
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again["ETag"], response["ETag"])
+        self.assertEqual(again.content, b"")
+        serialize.assert_not_called()
+
+    def test_etag_depends_on_query(self):
+        first = self.client.get(self.list_url)
+        second = self.client.get(self.list_url, {"ordering": "-rating_avg"})
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_comment_changes_center_and_comments(self):
+        center = self.client.get(self.detail_url)
+        self.post_comment()
+        comments = self.client.get(self.comments_url)
+        self.assertEqual(
+            self.revalidate(self.detail_url, center).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.revalidate(self.comments_url, comments).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.post_comment()
+        again = self.revalidate(self.comments_url, comments)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(again.data["results"]), 2)
+
+    def test_validators_are_cached_until_a_write(self):
+        response = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            again = self.revalidate(self.list_url, response)
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.center.save()
+        again = self.revalidate(self.list_url, response)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+
+    def test_author_rename_changes_comments(self):
+        self.post_comment()
+        comments = self.client.get(self.comments_url)
+        self.user.username = "renamed"
+        self.user.save()
+        again = self.revalidate(self.comments_url, comments)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data["results"][0]["user"], "renamed")
+
+    def test_comment_update_and_delete(self):
+        comment_id = self.post_comment()
+        comments = self.client.get(self.comments_url)
+        Comments.objects.filter(pk=comment_id).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        url = reverse("comments-detail", args=[comment_id])
+        self.client.patch(url, {"content": "Changed"}, format="json")
+        changed = self.revalidate(self.comments_url, comments)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+        self.client.delete(url)
+        self.assertEqual(
+            self.revalidate(self.comments_url, changed).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_nested_address_update_changes_center(self):
+        response = self.client.get(self.detail_url)
+        self.address.city = "Newtown"
+        self.address.save()
+        again = self.revalidate(self.detail_url, response)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data["address"]["city"], "Newtown")
+
+    def test_service_link_delete_changes_center(self):
+        response = self.client.get(self.detail_url)
+        self.link.delete()
+        again = self.revalidate(self.detail_url, response)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data["services"], [])
+
+    def test_service_rename_changes_center_services(self):
+        url = reverse("centerservice-list")
+        response = self.client.get(url, {"center": self.center.id})
+        self.service.name = "Coloring"
+        self.service.save()
+        again = self.client.get(
+            url, {"center": self.center.id}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+
+    def test_center_delete_changes_list(self):
+        other = Center.objects.create(
+            name="Other Center",
+            phone="+71234567890",
+            address=Address.objects.create(
+                street="Main St", city="Anytown", state="State", number=1
+            ),
+        )
+        response = self.client.get(self.list_url)
+        Center.objects.filter(pk=other.pk).delete()
+        again = self.revalidate(self.list_url, response)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(again.data["results"]), 1)
+
+    def test_if_modified_since(self):
+        later = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        earlier = http_date((timezone.now() - timedelta(minutes=1)).timestamp())
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=later)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=earlier)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_object_is_not_found(self):
+        url = reverse("center-detail", args=["not-a-uuid"])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        url = reverse("comments-detail", args=[self.center.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.export import CHUNK_SIZE
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from django.contrib.auth.models import User
+
+
+class ExportTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="admin", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.center = self.create_center("Main Center")
+        self.other = self.create_center("Other Center")
+
+    def create_center(self, name):
+        address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=123
+        )
+        return Center.objects.create(name=name, phone="+71234567890", address=address)
+
+    def create_comments(self, center, count):
+        Comments.objects.bulk_create(
+            Comments(content=f"Comment {num}", mark=5, center=center, user=self.user)
+            for num in range(count)
+        )
+
+    def export(self, resource, **params):
+        url = reverse("export", kwargs={"resource": resource})
+        return self.client.get(url, params)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_comments_ndjson_with_filters(self):
+        self.create_comments(self.center, 3)
+        self.create_comments(self.other, 2)
+        old = Comments.objects.filter(center=self.center).first()
+        Comments.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+
+        response = self.export("comments", center=self.center.id)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["id"], str(old.id))
+        self.assertEqual(rows[0]["user"], "admin")
+
+        after = (timezone.now() - timedelta(days=1)).date().isoformat()
+        response = self.export("comments", center=self.center.id, created_after=after)
+        self.assertEqual(len(self.read(response).splitlines()), 2)
+
+    def test_centers_csv_with_addresses(self):
+        response = self.export("centers", output="csv")
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([row["name"] for row in rows], ["Main Center", "Other Center"])
+        self.assertEqual(rows[0]["city"], "Anytown")
+
+    def test_center_service_links(self):
+        service = Service.objects.create(name="Haircut", category="Hair")
+        CenterService.objects.create(
+            center=self.other, service=service, description="Description"
+        )
+        response = self.export("center-services", center=self.other.id)
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(rows[0]["service_name"], "Haircut")
+
+    def test_invalid_requests(self):
+        for response in (
+            self.export("users"),
+            self.export("comments", output="xml"),
+            self.export("comments", center="42"),
+            self.export("centers", created_after="2024-01-01"),
+        ):
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_admin(self):
+        self.user.is_staff = False
+        self.user.save()
+        response = self.export("comments")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        self.create_comments(self.center, 2)
+        out = io.StringIO()
+        call_command("export_data", "comments", "--output", "csv", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "centers.ndjson")
+            call_command("export_data", "centers", "--file", path)
+            with open(path, encoding="utf-8") as target:
+                self.assertEqual(len(target.readlines()), 2)
+
+    def peak_memory(self, rows):
+        Comments.objects.all().delete()
+        self.create_comments(self.center, rows)
+        tracemalloc.start()
+        try:
+            response = self.export("comments")
+            for _ in response.streaming_content:
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_memory_does_not_grow_with_rows(self):
+        # Первый прогон прогревает импорты и кеши, его не учитываем
+        self.peak_memory(10)
+        small = self.peak_memory(CHUNK_SIZE * 2)
+        large = self.peak_memory(CHUNK_SIZE * 10)
+        self.assertLess(large, small * 1.5)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+from tests.factories import create_center
+
+
+class FilterAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.center = create_center("Main Center")
+        self.other = create_center("Other Center")
+        self.hair = Service.objects.create(name="Haircut", category="Hair")
+        self.nails = Service.objects.create(name="Manicure", category="Nails")
+        for center in (self.center, self.other):
+            CenterService.objects.create(
+                center=center, service=self.hair, description="Description"
+            )
+        CenterService.objects.create(
+            center=self.center, service=self.nails, description="Description"
+        )
+
+    def names(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_center_services_by_center(self):
+        url = reverse("centerservice-list")
+        response = self.client.get(url, {"center": self.other.id})
+        self.assertEqual(len(self.names(response)), 1)
+        self.assertEqual(response.data["results"][0]["center"], self.other.id)
+
+    def test_center_services_by_category(self):
+        url = reverse("centerservice-list")
+        response = self.client.get(url, {"center": self.center.id, "category": "Nails"})
+        results = response.data["results"]
+        self.assertEqual(len(self.names(response)), 1)
+        self.assertEqual(results[0]["service"]["name"], "Manicure")
+
+    def test_services_by_center_and_category(self):
+        url = reverse("service-list")
+        response = self.client.get(url, {"center": self.other.id})
+        self.assertEqual(self.names(response), [str(self.hair.id)])
+        response = self.client.get(url, {"category": "Nails"})
+        self.assertEqual(self.names(response), [str(self.nails.id)])
+
+    def test_comments_by_mark_and_created_at(self):
+        now = timezone.now()
+        for num, mark in enumerate((1, 3, 5)):
+            comment = Comments.objects.create(
+                content="Text", mark=mark, center=self.center, user=self.user
+            )
+            Comments.objects.filter(pk=comment.pk).update(
+                created_at=now - timedelta(days=num)
+            )
+        Comments.objects.create(
+            content="Text", mark=4, center=self.other, user=self.user
+        )
+        url = reverse("comments-list")
+
+        response = self.client.get(
+            url, {"center": self.center.id, "mark_min": 2, "mark_max": 5}
+        )
+        self.assertEqual(len(self.names(response)), 2)
+
+        after = (now - timedelta(days=1, hours=1)).isoformat()
+        response = self.client.get(
+            url, {"center": self.center.id, "created_after": after}
+        )
+        self.assertEqual(
+            sorted(item["mark"] for item in response.data["results"]), [1, 3]
+        )
+
+        response = self.client.get(url, {"created_before": now.date().isoformat()})
+        self.assertEqual(len(self.names(response)), 2)
+
+    def test_invalid_filter_values(self):
+        response = self.client.get(reverse("comments-list"), {"mark_min": "high"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("mark_min", response.data)
+        response = self.client.get(reverse("centerservice-list"), {"center": "42"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@benchmark
+class CenterServicesPageBenchmark(APITestCase):
+    """Per-center services page must not slow down as the join table grows."""
+
+    services_per_center = 100
+
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.services = Service.objects.bulk_create(
+            Service(name=f"Service {num}", category=f"Category {num % 10}")
+            for num in range(self.services_per_center)
+        )
+
+    def grow(self, centers):
+        addresses = Address.objects.bulk_create(
+            (
+                Address(street="Street", city="City", state="State", number=num)
+                for num in range(centers)
+            ),
+            batch_size=5000,
+        )
+        created = Center.objects.bulk_create(
+            (
+                Center(name=f"Center {num}", phone="+71234567890", address=address)
+                for num, address in enumerate(addresses)
+            ),
+            batch_size=5000,
+        )
+        CenterService.objects.bulk_create(
+            (
+                CenterService(center=center, service=service, description="Text")
+                for center in created
+                for service in self.services
+            ),
+            batch_size=10000,
+        )
+        return created[0]
+
+    def test_page_time_is_flat(self):
+        total = env_int("BENCHMARK_LINKS", 1_000_000)
+        url = reverse("centerservice-list")
+        timings = {}
+        grown = 0
+        for links in (total // 100, total // 10, total):
+            center = self.grow((links - grown) // self.services_per_center)
+            grown = links
+            timings[links] = best_time(
+                lambda: self.client.get(url, {"center": center.id, "page_size": 20})
+            )
+            report("center-services page", links=links, seconds=timings[links])
+
+        smallest, largest = timings[total // 100], timings[total]
+        self.assertLess(largest, smallest * 3)
@@ -0,0 +1,202 @@
+import os
+import random
+import tempfile
+import unittest
+from functools import partial
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center import geo
+from buty_center.models import Address, Center
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+from tests.factories import create_center
+
+# Адреса совпадают со строками тестового справочника геокодера
+moscow_center = partial(create_center, city="Moscow", street="Tverskaya", number=1)
+
+
+class HaversineTest(SimpleTestCase):
+    def test_known_distance(self):
+        # Москва - Санкт-Петербург, около 634 км
+        distance = geo.haversine_km(55.7558, 37.6173, [59.9343], [30.3351])[0]
+        self.assertAlmostEqual(distance, 634, delta=2)
+
+    @unittest.skipIf(geo.numpy is None, "numpy is not installed")
+    def test_numpy_matches_plain_loop(self):
+        points = [
+            (random.uniform(-90, 90), random.uniform(-180, 180)) for _ in range(50)
+        ]
+        latitudes, longitudes = zip(*points)
+        vectorized = geo.haversine_km(10, 20, latitudes, longitudes)
+        plain = [geo._haversine(10, 20, lat, lon) for lat, lon in points]
+        for fast, slow in zip(vectorized, plain):
+            self.assertAlmostEqual(fast, slow, places=6)
+
+    def test_bounding_box_covers_radius(self):
+        (min_lat, max_lat), lon_ranges = geo.bounding_box(55.75, 37.61, 10)
+        self.assertEqual(len(lon_ranges), 1)
+        min_lon, max_lon = lon_ranges[0]
+        self.assertAlmostEqual(
+            geo.haversine_km(55.75, 37.61, [max_lat], [37.61])[0], 10
+        )
+        self.assertGreaterEqual(
+            geo.haversine_km(55.75, 37.61, [55.75], [max_lon])[0], 10 - 1e-6
+        )
+
+    def test_bounding_box_across_antimeridian_and_pole(self):
+        _, lon_ranges = geo.bounding_box(0, 179.99, 10)
+        self.assertEqual(len(lon_ranges), 2)
+        _, lon_ranges = geo.bounding_box(89.99, 0, 10)
+        self.assertEqual(lon_ranges, [(-180, 180)])
+
+
+class NearbyAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("center-nearby")
+        moscow_center("Kremlin", latitude=55.7520, longitude=37.6175)
+        moscow_center("Arbat", latitude=55.7494, longitude=37.5912)
+        moscow_center("Khimki", latitude=55.8970, longitude=37.4297)
+        moscow_center("Petersburg", latitude=59.9343, longitude=30.3351)
+        moscow_center("Unknown")
+
+    def nearby(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_nearest_first_within_radius(self):
+        results = self.nearby(lat=55.7558, lon=37.6173, radius=5)
+        self.assertEqual([result["name"] for result in results], ["Kremlin", "Arbat"])
+        self.assertLess(results[0]["distance_km"], results[1]["distance_km"])
+        self.assertEqual(results[0]["address"]["latitude"], 55.7520)
+
+        results = self.nearby(lat=55.7558, lon=37.6173, radius=30)
+        self.assertEqual(results[-1]["name"], "Khimki")
+
+    def test_limit(self):
+        results = self.nearby(lat=55.7558, lon=37.6173, radius=30, limit=1)
+        self.assertEqual([result["name"] for result in results], ["Kremlin"])
+
+    def test_across_antimeridian(self):
+        moscow_center("East", latitude=0, longitude=179.99)
+        moscow_center("West", latitude=0, longitude=-179.99)
+        results = self.nearby(lat=0, lon=179.995, radius=5)
+        self.assertEqual(len(results), 2)
+
+    def test_query_count_is_fixed(self):
+        with CaptureQueriesContext(connection) as context:
+            self.nearby(lat=55.7558, lon=37.6173, radius=30)
+        self.assertEqual(len(context.captured_queries), 3)
+
+    def test_invalid_requests(self):
+        for params in (
+            {},
+            {"lat": 55.75},
+            {"lat": "north", "lon": 37.61},
+            {"lat": 95, "lon": 37.61},
+            {"lat": 55.75, "lon": 37.61, "radius": 0},
+            {"lat": 55.75, "lon": 37.61, "radius": 1000},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_address_coordinates_are_validated(self):
+        response = self.client.post(
+            reverse("address-list"),
+            {"street": "S", "city": "C", "state": "S", "number": 1, "latitude": 91},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("latitude", response.data)
+
+
+class GeocodeCommandTest(APITestCase):
+    def setUp(self):
+        self.moscow = moscow_center("Moscow Center").address
+        self.kazan = moscow_center("Kazan Center", city="Kazan").address
+        self.tver = moscow_center("Tver Center", city="Tver").address
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "gazetteer.csv")
+        with open(self.path, "w", encoding="utf-8") as gazetteer:
+            gazetteer.write(
+                "city,street,number,latitude,longitude\n"
+                "Moscow,,,55.75,37.61\n"
+                "moscow,Tverskaya,1,55.76,37.60\n"
+                "Kazan,,,55.79,49.12\n"
+            )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_backfills_most_specific_match(self):
+        out = StringIO()
+        call_command("geocode_addresses", "--gazetteer", self.path, stdout=out)
+        self.assertIn("Geocoded 2 addresses", out.getvalue())
+        self.moscow.refresh_from_db()
+        self.kazan.refresh_from_db()
+        self.tver.refresh_from_db()
+        self.assertEqual((self.moscow.latitude, self.moscow.longitude), (55.76, 37.60))
+        self.assertEqual(self.kazan.latitude, 55.79)
+        self.assertIsNone(self.tver.latitude)
+
+    def test_keeps_existing_coordinates_unless_overwrite(self):
+        Address.objects.filter(pk=self.kazan.pk).update(latitude=1, longitude=1)
+        call_command("geocode_addresses", "--gazetteer", self.path, stdout=StringIO())
+        self.kazan.refresh_from_db()
+        self.assertEqual(self.kazan.latitude, 1)
+
+        call_command(
+            "geocode_addresses",
+            "--gazetteer",
+            self.path,
+            "--overwrite",
+            stdout=StringIO(),
+        )
+        self.kazan.refresh_from_db()
+        self.assertEqual(self.kazan.latitude, 55.79)
+
+
+@benchmark
+class NearbyBenchmark(APITestCase):
+    def test_radius_query_on_many_addresses(self):
+        total = env_int("BENCHMARK_ADDRESSES", 1000000)
+        rng = random.Random(42)
+        addresses = Address.objects.bulk_create(
+            (
+                Address(
+                    street="Main St",
+                    city="City",
+                    state="S",
+                    number=num,
+                    latitude=rng.uniform(41, 70),
+                    longitude=rng.uniform(20, 180),
+                )
+                for num in range(total)
+            ),
+            batch_size=10000,
+        )
+        Center.objects.bulk_create(
+            (
+                Center(name=f"Center {num}", phone="+71234567890", address=address)
+                for num, address in enumerate(addresses)
+            ),
+            batch_size=10000,
+        )
+
+        seconds = best_time(lambda: geo.nearest_centers(55.75, 37.61, 10, 20))
+        report(
+            "nearby centers",
+            addresses=total,
+            numpy=geo.numpy is not None,
+            query_ms=round(seconds * 1000, 2),
+        )
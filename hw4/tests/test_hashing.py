@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center import hashing
+from buty_center.hashing import HashingPool, pool
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE=0)
+class PasswordHashingTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(pool.shutdown)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="secret")
+
+    def login(self, password="secret", username="testuser"):
+        return self.client.post(
+            reverse("api_token_auth"),
+            {"username": username, "password": password},
+            format="json",
+        )
+
+    def test_token_login(self):
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("token", response.json())
+
+        for password, username in [("wrong", "testuser"), ("secret", "nobody")]:
+            response = self.login(password, username)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_register_hashes_in_pool(self):
+        response = self.client.post(
+            reverse("register"),
+            {"username": "newuser", "password": "pass", "email": "A@EXAMPLE.COM"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username="newuser")
+        self.assertEqual(user.email, "A@example.com")
+        self.assertTrue(user.check_password("pass"))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.user.password = make_password("secret", hasher="pbkdf2_sha1")
+        self.user.save()
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+    def test_saturated_pool_sheds_load(self):
+        _, slots = pool.get_executor()
+        slots.acquire()
+        self.addCleanup(slots.release)
+
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+        response = self.client.post(
+            reverse("register"),
+            {"username": "newuser", "password": "pass", "email": "a@example.com"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(username="newuser").exists())
+
+    @override_settings(PASSWORD_HASHING_TIMEOUT=0)
+    def test_slow_pool_times_out(self):
+        executor, _ = pool.get_executor()
+        pending = Future()
+        self.addCleanup(pending.cancel)
+        with mock.patch.object(executor, "submit", return_value=pending):
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=0)
+    def test_inline_hashing_without_workers(self):
+        with mock.patch.object(pool, "get_executor") as get_executor:
+            self.assertTrue(check_password("pass", hashing.hash_password("pass")))
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        get_executor.assert_not_called()
+
+
+@benchmark
+class PasswordHashingBenchmark(SimpleTestCase):
+    def test_logins_per_second(self):
+        logins = env_int("BENCHMARK_LOGINS", 64)
+        encoded = make_password("secret")
+        cpu_count = os.cpu_count() or 1
+        counts = [count for count in [1, 2, 4, 8, 16] if count < cpu_count]
+        for workers in [0, *counts, cpu_count]:
+            with override_settings(
+                PASSWORD_HASHING_WORKERS=workers, PASSWORD_HASHING_QUEUE=logins
+            ):
+                hashing_pool = HashingPool()
+                self.addCleanup(hashing_pool.shutdown)
+                hashing_pool.run(check_password, "secret", encoded)
+
+                # Потоки изображают параллельные запросы одного процесса сервера
+                def login_all():
+                    with ThreadPoolExecutor(max_workers=max(workers, 1) * 2) as ex:
+                        list(
+                            ex.map(
+                                lambda _: hashing_pool.run(
+                                    check_password, "secret", encoded
+                                ),
+                                range(logins),
+                            )
+                        )
+
+                elapsed = best_time(login_all, repeat=3)
+                hashing_pool.shutdown()
+            report(
+                "PasswordHashing",
+                workers=workers or "inline",
+                cpu_count=cpu_count,
+                logins=logins,
+                logins_per_sec=round(logins / elapsed, 1),
+            )
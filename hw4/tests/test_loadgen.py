@@ -0,0 +1,201 @@
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import LiveServerTestCase, TestCase, override_settings
+from buty_center.loadgen import compare_results, is_loopback_url, queries_per_request
+from buty_center.models import Center, CenterProfile, CenterService, Comments
+from buty_center.profiling import registry
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, env_int, report
+
+COUNTS = ["--centers=30", "--services=12", "--links=4", "--users=40"]
+
+
+class GenerateDataTest(TestCase):
+    def generate(self, *args):
+        call_command("generate_data", *COUNTS, *args, stdout=StringIO())
+
+    def snapshot(self):
+        return list(
+            Comments.objects.order_by("id").values_list(
+                "id", "center_id", "user__username", "mark", "created_at"
+            )
+        )
+
+    def test_same_seed_gives_same_rows(self):
+        self.generate("--comments=300", "--seed=7")
+        first = self.snapshot()
+        call_command("flush", interactive=False, verbosity=0)
+        self.generate("--comments=300", "--seed=7")
+        self.assertEqual(self.snapshot(), first)
+
+        call_command("flush", interactive=False, verbosity=0)
+        self.generate("--comments=300", "--seed=8")
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_counts_and_derived_data(self):
+        self.generate("--comments=2000")
+        self.assertEqual(Center.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(Comments.objects.count(), 2000)
+        self.assertTrue(CenterService.objects.exists())
+        links = CenterService.objects.values_list("center_id", "service_id")
+        self.assertEqual(len(set(links)), len(links))
+
+        # Рейтинги, профили и поиск перестроены после загрузки
+        center = Center.objects.order_by("-rating_count").first()
+        self.assertEqual(
+            center.rating_count, Comments.objects.filter(center=center).count()
+        )
+        self.assertEqual(CenterProfile.objects.count(), 30)
+        self.assertFalse(Center.objects.filter(search_document="").exists())
+
+    def test_popularity_is_skewed(self):
+        self.generate("--comments=3000")
+        counts = sorted(
+            Center.objects.annotate(count=Count("comments")).values_list(
+                "count", flat=True
+            ),
+            reverse=True,
+        )
+        # Первые 10% центров собирают больше трети отзывов
+        top = sum(counts[: len(counts) // 10])
+        self.assertGreater(top, 3000 / 3)
+
+    def test_secondary_indexes_are_rebuilt(self):
+        def indexes():
+            with connection.cursor() as cursor:
+                return {
+                    table: connection.introspection.get_constraints(cursor, table)
+                    for table in ["api_data_comment", "api_data_center", "auth_user"]
+                }
+
+        before = indexes()
+        self.generate("--comments=100")
+        self.assertEqual(indexes(), before)
+        self.assertIn("comment_center_created_id_idx", before["api_data_comment"])
+
+    def test_rejects_non_positive_counts(self):
+        for option in ["--centers=0", "--links=0"]:
+            with self.subTest(option), self.assertRaises(CommandError):
+                self.generate(option)
+        self.assertFalse(Center.objects.exists())
+
+    def test_refuses_non_empty_database(self):
+        self.generate("--comments=10")
+        with self.assertRaises(CommandError):
+            self.generate("--comments=10")
+
+
+@benchmark
+class GenerateDataBenchmark(TestCase):
+    def test_load_rate(self):
+        comments = env_int("BENCHMARK_COMMENTS", 200000)
+        out = StringIO()
+        started = time.perf_counter()
+        call_command(
+            "generate_data",
+            "--centers=10000",
+            "--users=10000",
+            f"--comments={comments}",
+            "--no-rebuild",
+            stdout=out,
+        )
+        elapsed = time.perf_counter() - started
+        report(
+            f"generate_data on {connection.vendor}",
+            comments=comments,
+            seconds=round(elapsed, 1),
+            comments_per_minute=round(comments / elapsed * 60),
+        )
+
+
+class CompareResultsTest(TestCase):
+    def result(self, p95, rate):
+        endpoint = {"p95_ms": p95, "requests_per_sec": rate}
+        return {"scenarios": {"home": {"endpoints": {"GET center-list": endpoint}}}}
+
+    def test_regressions(self):
+        old = self.result(10, 100)
+        self.assertEqual(compare_results(old, self.result(11, 95), 0.2)[1], 0)
+        self.assertEqual(compare_results(old, self.result(13, 100), 0.2)[1], 1)
+        self.assertEqual(compare_results(old, self.result(10, 70), 0.2)[1], 1)
+
+    def test_is_loopback_url(self):
+        for url in ["http://localhost:8000", "http://127.0.0.2/", "http://[::1]:80"]:
+            self.assertTrue(is_loopback_url(url), url)
+        for url in ["http://example.com", "http://10.0.0.1", "http://[::2]"]:
+            self.assertFalse(is_loopback_url(url), url)
+
+    def test_loadtest_rejects_remote_hosts(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "loadtest", "--target=remote=http://example.com/", stdout=StringIO()
+            )
+
+    def test_queries_per_request(self):
+        before = {"GET center-list": {"requests": 2, "sql_queries": {"mean": 3}}}
+        after = {"GET center-list": {"requests": 6, "sql_queries": {"mean": 4}}}
+        self.assertEqual(queries_per_request(before, after, "GET center-list"), 4.5)
+        self.assertEqual(queries_per_request({}, after, "GET center-list"), 4)
+        self.assertIsNone(queries_per_request(None, after, "GET center-list"))
+
+
+@override_settings(PROFILING_ENABLED=True)
+class BenchmarkAPITest(LiveServerTestCase):
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        call_command("generate_data", *COUNTS, "--comments=200", stdout=StringIO())
+        User.objects.create(username="admin", is_staff=True)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, "results.json")
+
+    def benchmark(self, *args):
+        out = StringIO()
+        call_command(
+            "benchmark_api",
+            f"--base-url={self.live_server_url}",
+            "--concurrency=2",
+            "--iterations=2",
+            "--admin=admin",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_rejects_remote_hosts(self):
+        for url in ["http://example.com", "http://10.0.0.1:8000", "http://[::2]"]:
+            with self.subTest(url), self.assertRaises(CommandError):
+                call_command("benchmark_api", f"--base-url={url}", stdout=StringIO())
+
+    def test_scenarios_report_per_endpoint_stats(self):
+        self.benchmark(f"--output={self.output}")
+        with open(self.output, encoding="utf-8") as output:
+            results = json.load(output)
+
+        self.assertEqual(results["meta"]["dataset"]["centers"], 30)
+        self.assertEqual(
+            set(results["scenarios"]), {"app", "home", "catalog", "center_page"}
+        )
+        home = results["scenarios"]["home"]
+        self.assertEqual(home["iterations"], 4)
+        comments = home["endpoints"]["GET comment-list"]
+        self.assertEqual(comments["requests"], 4 * 20)
+        self.assertEqual(comments["errors"], 0)
+        self.assertLessEqual(comments["p50_ms"], comments["p99_ms"])
+        self.assertGreater(comments["sql_queries"], 0)
+        for result in results["scenarios"].values():
+            for stats in result["endpoints"].values():
+                self.assertEqual(stats["errors"], 0)
+
+        out = self.benchmark("--scenario=center_page", f"--compare={self.output}")
+        self.assertIn("center_page GET center-profile: p95", out)
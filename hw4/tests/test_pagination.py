@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Service, Comments
+from django.contrib.auth.models import User
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_center(self, name):
+        address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=123
+        )
+        return Center.objects.create(name=name, phone="+71234567890", address=address)
+
+    def create_comments(self, center, count):
+        # Одинаковое время у пар комментариев проверяет разрешение по id
+        now = timezone.now()
+        comments = [
+            Comments(
+                content=f"Comment {num}",
+                mark=num % 5 + 1,
+                center=center,
+                user=self.user,
+            )
+            for num in range(count)
+        ]
+        Comments.objects.bulk_create(comments)
+        for num, comment in enumerate(comments):
+            Comments.objects.filter(pk=comment.pk).update(
+                created_at=now + timedelta(seconds=num // 2)
+            )
+
+    def collect(self, url, params=None):
+        pages, ids = 0, []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages += 1
+            ids.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                return pages, ids, response
+            response = self.client.get(response.data["next"])
+
+    def test_comments_pages_cover_table_once_in_order(self):
+        center = self.create_center("Main Center")
+        self.create_comments(center, 25)
+
+        pages, ids, _ = self.collect(reverse("comments-list"), {"page_size": 10})
+
+        expected = [
+            str(pk)
+            for pk in Comments.objects.order_by("created_at", "id").values_list(
+                "id", flat=True
+            )
+        ]
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, expected)
+
+    def test_nested_center_comments_are_paginated(self):
+        center = self.create_center("Main Center")
+        other = self.create_center("Other Center")
+        self.create_comments(center, 7)
+        self.create_comments(other, 3)
+        url = reverse("comment-list", kwargs={"center_id": center.id})
+
+        pages, ids, _ = self.collect(url, {"page_size": 5})
+
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(Comments.objects.filter(pk__in=ids, center=other).count(), 0)
+
+    def test_previous_link_returns_same_page(self):
+        for num in range(6):
+            Service.objects.create(name=f"Service {num}", category="Category")
+        url = reverse("service-list")
+        first = self.client.get(url, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(
+            [item["name"] for item in second.data["results"]],
+            ["Service 2", "Service 3"],
+        )
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_page_size_is_bounded(self):
+        for num in range(3):
+            Service.objects.create(name=f"Service {num}", category="Category")
+        response = self.client.get(reverse("service-list"), {"page_size": 100000})
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("service-list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        def cursor(values):
+            payload = json.dumps({"v": values, "r": False}).encode()
+            return base64.urlsafe_b64encode(payload).decode()
+
+        for name, values in [
+            ("comments-list", ["abc", "x"]),
+            ("center-list", [["abc"], "x"]),
+            ("center-list", ["abc", "x"]),
+            ("address-list", [None]),
+            ("address-list", ["x"]),
+        ]:
+            with self.subTest(name=name, values=values):
+                response = self.client.get(reverse(name), {"cursor": cursor(values)})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_cost_does_not_depend_on_position(self):
+        center = self.create_center("Main Center")
+        self.create_comments(center, 30)
+        url = reverse("comments-list")
+        response = self.client.get(url, {"page_size": 5})
+        counts = []
+        while response.data["next"]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(response.data["next"])
+            counts.append(len(context.captured_queries))
+            self.assertNotIn("OFFSET", context.captured_queries[0]["sql"])
+        self.assertEqual(len(set(counts)), 1)
@@ -0,0 +1,75 @@
+from django.db import connection, connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+
+
+class PoolStatsAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="admin", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("db-pool-stats")
+
+    def test_requires_admin(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reports_every_database(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        default = response.data["default"]
+        self.assertEqual(default["vendor"], connection.vendor)
+        self.assertEqual(
+            default["conn_max_age"], connection.settings_dict["CONN_MAX_AGE"]
+        )
+        if getattr(connection, "pool", None) is not None:
+            self.assertIn("pool_size", default["pool"])
+        else:
+            self.assertIsNone(default["pool"])
+
+
+def run_query(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+@benchmark
+class ConnectionReuseBenchmark(APITestCase):
+    def test_connect_time_savings(self):
+        requests = env_int("BENCHMARK_REQUESTS", 200)
+
+        def fresh_connections():
+            # Как без CONN_MAX_AGE: соединение на каждый запрос
+            for _ in range(requests):
+                wrapper = connections.create_connection("default")
+                wrapper.settings_dict = {
+                    **wrapper.settings_dict,
+                    "OPTIONS": {
+                        key: value
+                        for key, value in wrapper.settings_dict["OPTIONS"].items()
+                        if key != "pool"
+                    },
+                }
+                run_query(wrapper)
+                wrapper.close()
+
+        def reused_connection():
+            # Постоянное соединение или соединение из пула
+            for _ in range(requests):
+                run_query(connection)
+
+        fresh = best_time(fresh_connections, repeat=3) / requests
+        reused = best_time(reused_connection, repeat=3) / requests
+        report(
+            "connection reuse",
+            backend=connection.vendor,
+            pooled=getattr(connection, "pool", None) is not None,
+            fresh_ms=round(fresh * 1000, 3),
+            reused_ms=round(reused * 1000, 3),
+        )
+        self.assertLess(reused, fresh)
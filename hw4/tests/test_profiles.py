@@ -0,0 +1,194 @@
+from io import StringIO
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.cache import get_cache
+from buty_center.models import (
+    Address,
+    Center,
+    CenterProfile,
+    CenterService,
+    Comments,
+    Service,
+)
+from buty_center.pagination import KeysetPagination
+from django.contrib.auth.models import User
+
+
+# Индекс и профили перестраиваются после коммита, без воркера очереди
+@override_settings(TASK_QUEUE_EAGER=True)
+class CenterProfileTest(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.address = Address.objects.create(
+                street="Main St", city="Anytown", state="State", number=1
+            )
+            self.center = Center.objects.create(
+                name="Main Center", phone="+71234567890", address=self.address
+            )
+            self.service = Service.objects.create(name="Haircut", category="Hair")
+            self.link = CenterService.objects.create(
+                center=self.center, service=self.service, description="Short"
+            )
+        self.url = reverse("center-profile", args=[self.center.pk])
+
+    def profile(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        return response.json()
+
+    def add_comment(self, content, mark=5):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("comments-list"),
+                {"content": content, "mark": mark, "center_id": str(self.center.pk)},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()["id"]
+
+    def test_matches_separate_endpoints(self):
+        self.add_comment("Great")
+        profile = self.profile()
+        center = self.client.get(reverse("center-detail", args=[self.center.pk]))
+        comments = self.client.get(
+            reverse("comment-list", kwargs={"center_id": self.center.pk})
+        )
+        self.assertEqual(profile["center"], center.json())
+        self.assertEqual(profile["comments"]["results"], comments.json()["results"])
+        self.assertEqual(profile["rating"], {"average": 5.0, "count": 1})
+        self.assertEqual(profile["center"]["services"][0]["description"], "Short")
+
+    def test_served_with_one_query(self):
+        self.profile()
+        with self.assertNumQueries(1):
+            self.profile()
+
+    def test_missing_profile_is_built_on_request(self):
+        CenterProfile.objects.all().delete()
+        self.assertEqual(self.profile()["center"]["name"], "Main Center")
+        self.assertTrue(CenterProfile.objects.filter(pk=self.center.pk).exists())
+
+    def test_unknown_center(self):
+        for pk in [uuid4(), "not-a-uuid"]:
+            response = self.client.get(reverse("center-profile", args=[pk]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.add_comment("Great")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_address_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.address.city = "Othertown"
+            self.address.save()
+        self.assertEqual(self.profile()["center"]["address"]["city"], "Othertown")
+
+    def test_center_service_changes(self):
+        other = Service.objects.create(name="Manicure", category="Nails")
+        with self.captureOnCommitCallbacks(execute=True):
+            CenterService.objects.create(
+                center=self.center, service=other, description="Nails"
+            )
+        descriptions = {
+            link["description"] for link in self.profile()["center"]["services"]
+        }
+        self.assertEqual(descriptions, {"Short", "Nails"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.link.description = "Long"
+            self.link.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        services = self.profile()["center"]["services"]
+        self.assertEqual([link["description"] for link in services], ["Long"])
+
+    def test_service_rename(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.name = "Coloring"
+            self.service.save()
+        services = self.profile()["center"]["services"]
+        self.assertEqual(services[0]["service"]["name"], "Coloring")
+
+    def test_comment_changes(self):
+        comment_id = self.add_comment("Great", mark=5)
+        self.add_comment("Bad", mark=1)
+        profile = self.profile()
+        self.assertEqual(
+            [comment["content"] for comment in profile["comments"]["results"]],
+            ["Great", "Bad"],
+        )
+        self.assertEqual(profile["rating"], {"average": 3.0, "count": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("comments-detail", args=[comment_id]),
+                {"content": "Good", "mark": 4},
+                format="json",
+            )
+        profile = self.profile()
+        self.assertEqual(profile["comments"]["results"][0]["content"], "Good")
+        self.assertEqual(profile["rating"], {"average": 2.5, "count": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse("comments-detail", args=[comment_id]))
+        profile = self.profile()
+        self.assertEqual(
+            [comment["content"] for comment in profile["comments"]["results"]],
+            ["Bad"],
+        )
+        self.assertEqual(profile["rating"], {"average": 1.0, "count": 1})
+
+    def test_bulk_comment_delete(self):
+        self.add_comment("Great")
+        self.add_comment("Bad", mark=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comments.objects.filter(center=self.center).delete()
+        self.assertEqual(self.profile()["comments"]["results"], [])
+
+    def test_author_rename(self):
+        self.add_comment("Great")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "renamed"
+            self.user.save()
+        self.assertEqual(self.profile()["comments"]["results"][0]["user"], "renamed")
+
+    def test_first_page_links_to_the_rest(self):
+        self.addCleanup(
+            setattr, KeysetPagination, "page_size", KeysetPagination.page_size
+        )
+        KeysetPagination.page_size = 2
+        for content in ["First", "Second", "Third"]:
+            self.add_comment(content)
+        comments = self.profile()["comments"]
+        self.assertEqual(
+            [comment["content"] for comment in comments["results"]],
+            ["First", "Second"],
+        )
+        response = self.client.get(comments["next"])
+        self.assertEqual(
+            [comment["content"] for comment in response.json()["results"]],
+            ["Third"],
+        )
+
+    def test_rebuild_command(self):
+        CenterProfile.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_center_profiles", stdout=out)
+        self.assertIn("Rebuilt 1 center profiles", out.getvalue())
+        self.assertTrue(CenterProfile.objects.filter(pk=self.center.pk).exists())
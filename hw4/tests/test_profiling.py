@@ -0,0 +1,124 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import path, reverse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, CenterService, Service
+from buty_center.profiling import Histogram, registry
+from buty_center.serializers import CenterSerializer
+from buty_center.urls import urlpatterns as api_urlpatterns
+from django.contrib.auth.models import User
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def centers_without_prefetch(request):
+    # get_services читает услуги каждого центра отдельным запросом
+    return Response(CenterSerializer(Center.objects.all(), many=True).data)
+
+
+urlpatterns = [
+    path("n-plus-one/", centers_without_prefetch, name="centers-without-prefetch"),
+    *api_urlpatterns,
+]
+
+
+class HistogramTest(SimpleTestCase):
+    def test_quantiles_within_bucket_precision(self):
+        histogram = Histogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        for fraction in [0.5, 0.9, 0.99]:
+            expected = fraction * 10000
+            self.assertAlmostEqual(
+                histogram.quantile(fraction), expected, delta=expected / 16
+            )
+        self.assertEqual(histogram.quantile(1), 10000)
+        self.assertEqual(histogram.total, sum(range(1, 10001)))
+
+    def test_memory_is_bounded(self):
+        histogram = Histogram(max_value=1000)
+        size = len(histogram.counts)
+        histogram.record(10**9)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual(histogram.max, 1000)
+        self.assertEqual(histogram.quantile(0.5), 1000)
+
+
+@override_settings(
+    PROFILING_ENABLED=True,
+    PROFILING_DUPLICATE_THRESHOLD=3,
+    ROOT_URLCONF="tests.test_profiling",
+)
+class ProfilingMiddlewareTest(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        service = Service.objects.create(name="Haircut", category="Hair")
+        for num in range(3):
+            address = Address.objects.create(
+                street="Main St", city="Anytown", state="State", number=num
+            )
+            center = Center.objects.create(
+                name=f"Center {num}", phone="+71234567890", address=address
+            )
+            CenterService.objects.create(
+                center=center, service=service, description="Description"
+            )
+        self.admin = User.objects.create(username="admin", is_staff=True)
+
+    def test_route_stats(self):
+        for _ in range(2):
+            response = self.client.get(reverse("center-list"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = registry.as_dict()["GET center-list"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 0)
+        self.assertGreater(stats["sql_queries"]["max"], 0)
+        self.assertGreater(stats["request_duration_ms"]["p50"], 0)
+        self.assertGreater(stats["serializer_duration_ms"]["max"], 0)
+        self.assertEqual(stats["response_size_bytes"]["max"], len(response.content))
+        self.assertEqual(stats["duplicate_query_requests"], 0)
+
+    def test_repeated_query_is_flagged(self):
+        with self.assertLogs("buty_center.profiling", "WARNING"):
+            self.client.get(reverse("centers-without-prefetch"))
+
+        stats = registry.as_dict()["GET centers-without-prefetch"]
+        self.assertEqual(stats["duplicate_query_requests"], 1)
+        duplicates = stats["duplicate_queries"]
+        [services] = [sql for sql in duplicates if "api_data_center_service" in sql]
+        self.assertEqual(duplicates[services], 1)
+        self.assertGreaterEqual(stats["sql_queries"]["max"], 4)
+
+    def test_endpoints(self):
+        self.client.get(reverse("center-list"))
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("profiling-stats"))
+        self.assertEqual(response.json()["GET center-list"]["requests"], 1)
+
+        response = self.client.get(reverse("metrics"))
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        lines = response.content.decode().splitlines()
+        self.assertIn("# TYPE buty_center_request_duration_seconds summary", lines)
+        self.assertIn(
+            'buty_center_request_duration_seconds_count{route="GET center-list"} 1',
+            lines,
+        )
+        self.assertIn(
+            'buty_center_duplicate_query_requests_total{route="GET center-list"} 0',
+            lines,
+        )
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_by_default(self):
+        self.client.get(reverse("center-list"))
+        self.assertEqual(registry.as_dict(), {})
@@ -0,0 +1,112 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Center, Comments, Service, CenterService
+from django.contrib.auth.models import User
+from tests.factories import create_centers
+
+
+class CenterListQueryCountTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.services = [
+            Service.objects.create(name=f"Service {num}", category="Category")
+            for num in range(3)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("center-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_query_count_does_not_grow_with_centers(self):
+        create_centers(2, self.services)
+        small_count, _ = self.count_list_queries()
+
+        create_centers(10, self.services)
+        large_count, response = self.count_list_queries()
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data["results"]), 12)
+
+    def test_services_are_serialized_from_prefetch(self):
+        create_centers(1, self.services)
+        _, response = self.count_list_queries()
+        services = response.data["results"][0]["services"]
+        self.assertEqual(len(services), 3)
+        self.assertEqual(
+            {item["service"]["name"] for item in services},
+            {"Service 0", "Service 1", "Service 2"},
+        )
+
+
+class CenterRoutesQueryCountTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="password")
+        self.services = [
+            Service.objects.create(name=f"Service {num}", category="Category")
+            for num in range(3)
+        ]
+        create_centers(2, self.services)
+        self.center, self.other = Center.objects.order_by("name")
+
+    def test_services_of_a_center_in_one_query(self):
+        url = reverse("center-services", args=[self.center.pk])
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            {item["service"]["name"] for item in results},
+            {"Service 0", "Service 1", "Service 2"},
+        )
+        self.assertEqual({item["center"] for item in results}, {self.center.pk})
+
+    def test_services_of_center_without_services(self):
+        CenterService.objects.filter(center=self.center).delete()
+        url = reverse("center-services", args=[self.center.pk])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_services_of_unknown_center(self):
+        for pk in ["00000000-0000-0000-0000-000000000000", "not-a-uuid"]:
+            response = self.client.get(reverse("center-services", args=[pk]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comments_of_a_center(self):
+        for num in range(25):
+            Comments.objects.create(
+                content=f"Comment {num}", mark=5, center=self.center, user=self.user
+            )
+        Comments.objects.create(
+            content="Other", mark=1, center=self.other, user=self.user
+        )
+        url = reverse("comment-list", kwargs={"center_id": self.center.pk})
+        # Валидаторы ETag и страница с JOIN автора
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(
+            [item["content"] for item in results],
+            [f"Comment {num}" for num in range(20)],
+        )
+        self.assertEqual(results[0]["user"], "testuser")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(response.json()["next"])
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_comments_of_unknown_center(self):
+        response = self.client.get(
+            reverse("comment-list", kwargs={"center_id": "not-a-uuid"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+from buty_center.models import Center, CenterService, Comments, Service
+from tests.explain import QueryPlanMixin, analyze
+
+PAGE = 21
+
+
+class QueryPlanTest(QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "generate_data",
+            "--centers=300",
+            "--services=40",
+            "--users=50",
+            "--comments=5000",
+            "--no-rebuild",
+            stdout=StringIO(),
+        )
+        analyze()
+        # rating_count не пересчитан из-за --no-rebuild
+        cls.center = (
+            Center.objects.annotate(count=Count("comments"))
+            .order_by("-count", "id")
+            .first()
+        )
+
+    def test_default_orderings(self):
+        self.assertIndexScan(Center.objects.all()[:PAGE], "center_name_id_idx")
+        self.assertIndexScan(Service.objects.all()[:PAGE], "service_name_id_idx")
+        self.assertIndexScan(Comments.objects.all()[:PAGE], "comment_created_id_idx")
+
+    def test_comments_of_a_center(self):
+        comments = Comments.objects.filter(center=self.center)
+        self.assertIndexScan(comments[:PAGE], "comment_center_created_id_idx")
+        # Новые отзывы первыми читаются тем же индексом в обратную сторону
+        self.assertIndexScan(
+            comments.order_by("-created_at", "-id")[:PAGE],
+            "comment_center_created_id_idx",
+        )
+        self.assertIndexScan(
+            comments.order_by("mark", "id")[:PAGE], "comment_center_mark_id_idx"
+        )
+
+    def test_services(self):
+        self.assertIndexScan(
+            Service.objects.filter(category="Волосы").order_by("name")[:PAGE],
+            "service_category_name_idx",
+        )
+        self.assertIndexScan(
+            CenterService.objects.filter(center=self.center).order_by("id")[:PAGE],
+            "center_service_center_id_idx",
+        )
@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from buty_center.cache import get_cache
+from buty_center.models import Center, Comments
+from django.contrib.auth.models import User
+from tests.factories import create_center
+
+
+class CenterRatingAPITest(APITestCase):
+    def setUp(self):
+        # Ведра ограничения отзывов от прошлых тестов с тем же id пользователя
+        get_cache().clear()
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.center = create_center("Main Center")
+        self.client.force_authenticate(user=self.user)
+
+    def post_comment(self, mark, center=None):
+        data = {
+            "content": "Comment",
+            "mark": mark,
+            "center_id": (center or self.center).id,
+        }
+        response = self.client.post(reverse("comments-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def assertRating(self, center, avg, count):
+        center.refresh_from_db()
+        self.assertAlmostEqual(center.rating_avg, avg)
+        self.assertEqual(center.rating_count, count)
+
+    def test_create_comment_updates_rating(self):
+        self.post_comment(4)
+        self.post_comment(5)
+        self.assertRating(self.center, 4.5, 2)
+
+    def test_update_comment_updates_rating(self):
+        comment_id = self.post_comment(4)
+        self.post_comment(2)
+        url = reverse("comments-detail", args=[comment_id])
+        response = self.client.patch(url, {"mark": 5}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRating(self.center, 3.5, 2)
+
+    def test_move_comment_to_other_center(self):
+        other = create_center("Other Center")
+        comment_id = self.post_comment(4)
+        self.post_comment(2)
+        url = reverse("comments-detail", args=[comment_id])
+        data = {"content": "Moved", "mark": 3, "center_id": other.id}
+        response = self.client.put(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRating(self.center, 2, 1)
+        self.assertRating(other, 3, 1)
+
+    def test_delete_comment_updates_rating(self):
+        first = self.post_comment(4)
+        second = self.post_comment(2)
+        self.client.delete(reverse("comments-detail", args=[first]))
+        self.assertRating(self.center, 2, 1)
+        self.client.delete(reverse("comments-detail", args=[second]))
+        self.assertRating(self.center, 0, 0)
+
+    def test_deleting_user_updates_rating(self):
+        self.post_comment(4)
+        other = User.objects.create(username="other", password="password")
+        self.client.force_authenticate(user=other)
+        self.post_comment(2)
+        self.assertRating(self.center, 3, 2)
+
+        # Отзывы удаляются каскадом, мимо представления
+        other.delete()
+        self.assertRating(self.center, 4, 1)
+
+    def test_rating_in_center_detail(self):
+        self.post_comment(3)
+        response = self.client.get(reverse("center-detail", args=[self.center.id]))
+        self.assertEqual(response.data["rating_avg"], 3)
+        self.assertEqual(response.data["rating_count"], 1)
+
+    def test_rating_is_read_only(self):
+        url = reverse("center-detail", args=[self.center.id])
+        response = self.client.patch(url, {"rating_avg": 5}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRating(self.center, 0, 0)
+
+    def test_order_and_filter_by_rating(self):
+        other = create_center("Other Center")
+        self.post_comment(2)
+        self.post_comment(5, center=other)
+        url = reverse("center-list")
+
+        response = self.client.get(url, {"ordering": "-rating_avg"})
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]],
+            ["Other Center", "Main Center"],
+        )
+
+        response = self.client.get(url, {"rating_min": 4})
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]], ["Other Center"]
+        )
+
+        response = self.client.get(url, {"rating_min": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RebuildRatingsCommandTest(APITestCase):
+    def test_rebuild_ratings(self):
+        user = User.objects.create(username="testuser", password="password")
+        center = create_center("Main Center")
+        empty = create_center("Empty Center")
+        Center.objects.filter(pk=empty.pk).update(rating_avg=4, rating_count=7)
+        for mark in (1, 2, 4.5):
+            Comments.objects.create(content="Text", mark=mark, center=center, user=user)
+
+        out = StringIO()
+        call_command("rebuild_ratings", stdout=out)
+
+        self.assertIn("2 centers", out.getvalue())
+        center.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertAlmostEqual(center.rating_avg, 2.5)
+        self.assertEqual(center.rating_count, 3)
+        self.assertEqual((empty.rating_avg, empty.rating_count), (0, 0))
+
+
+class ConcurrentRatingTest(TransactionTestCase):
+    workers = 4
+    comments_per_worker = 5
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("In-memory SQLite locks tables across threads.")
+        get_cache().clear()
+        self.center = create_center("Main Center")
+        self.users = [
+            User.objects.create(username=f"user{num}", password="password")
+            for num in range(self.workers)
+        ]
+
+    def write_comments(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            for num in range(self.comments_per_worker):
+                data = {
+                    "content": "Comment",
+                    "mark": num % 5 + 1,
+                    "center_id": str(self.center.id),
+                }
+                client.post(reverse("comments-list"), data, format="json")
+        finally:
+            connection.close()
+
+    def test_concurrent_comments_keep_rating_consistent(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(self.write_comments, self.users))
+
+        self.center.refresh_from_db()
+        comments = Comments.objects.filter(center=self.center)
+        marks = list(comments.values_list("mark", flat=True))
+        self.assertEqual(self.center.rating_count, len(marks))
+        self.assertGreater(len(marks), 0)
+        self.assertAlmostEqual(self.center.rating_avg, sum(marks) / len(marks))
@@ -0,0 +1,217 @@
+import asyncio
+from contextlib import ExitStack
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APITransactionTestCase
+from buty_center.cache import CachedResponseMixin, get_cache
+from buty_center.middleware import ReplicaRoutingMiddleware
+from buty_center.models import Address, Center
+from buty_center.routers import replica_reads
+from django.contrib.auth.models import User
+
+REPLICAS = ["replica1", "replica2"]
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRouterTest(SimpleTestCase):
+    def test_reads_use_primary_by_default(self):
+        self.assertEqual(Center.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_reads_use_replicas_when_allowed(self):
+        with replica_reads():
+            self.assertIn(Center.objects.all().db, REPLICAS)
+            with replica_reads(False):
+                self.assertEqual(Center.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_one_replica_per_block(self):
+        for _ in range(10):
+            with replica_reads():
+                replica = Center.objects.all().db
+                self.assertEqual(
+                    {Center.objects.all().db for _ in range(20)}, {replica}
+                )
+
+    def test_writes_use_primary(self):
+        with replica_reads():
+            self.assertEqual(router.db_for_write(Center), DEFAULT_DB_ALIAS)
+
+    @override_settings(READ_REPLICAS=[])
+    def test_no_replicas(self):
+        with replica_reads():
+            self.assertEqual(Center.objects.all().db, DEFAULT_DB_ALIAS)
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRouterTransactionTest(TestCase):
+    def test_reads_inside_transaction_use_primary(self):
+        # TestCase держит каждый тест в транзакции основной базы
+        with replica_reads():
+            self.assertEqual(Center.objects.all().db, DEFAULT_DB_ALIAS)
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class CachedResponseReplicaTest(SimpleTestCase):
+    class View(CachedResponseMixin):
+        def get_response_cache_key(self, request):
+            return "replica-test"
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_misses_are_read_from_primary(self):
+        def handler(request):
+            return Response({"db": Center.objects.all().db})
+
+        with replica_reads():
+            response = self.View().cached_response(handler, None)
+            self.assertEqual(response.data, {"db": DEFAULT_DB_ALIAS})
+            # После промаха запрос снова читает с реплики
+            self.assertIn(Center.objects.all().db, REPLICAS)
+
+
+@override_settings(READ_REPLICAS=REPLICAS, REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(self.read_database)
+
+    @staticmethod
+    def read_database(request):
+        return HttpResponse(Center.objects.all().db, status=request.GET.get("status"))
+
+    def request(self, method, token=None, address="10.0.0.1", status=200):
+        headers = {"REMOTE_ADDR": address}
+        if token:
+            headers["HTTP_AUTHORIZATION"] = f"Token {token}"
+        request = getattr(self.factory, method)(f"/api/?status={status}", **headers)
+        return self.middleware(request).content.decode()
+
+    def test_safe_requests_read_from_replicas(self):
+        self.assertIn(self.request("get", "a"), REPLICAS)
+        self.assertIn(self.request("head", "a"), REPLICAS)
+
+    def test_writes_read_from_primary(self):
+        self.assertEqual(self.request("post", "a"), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.request("delete", "a"), DEFAULT_DB_ALIAS)
+
+    def test_writer_reads_from_primary_until_window_expires(self):
+        self.request("post", "a")
+        self.assertEqual(self.request("get", "a"), DEFAULT_DB_ALIAS)
+        self.assertIn(self.request("get", "b"), REPLICAS)
+
+        get_cache().clear()
+        self.assertIn(self.request("get", "a"), REPLICAS)
+
+    def test_failed_write_does_not_pin(self):
+        self.request("post", "a", status=400)
+        self.assertIn(self.request("get", "a"), REPLICAS)
+
+    def test_anonymous_write_pins_its_address(self):
+        # Получение токена: следующий запрос уже с токеном, но с того же адреса
+        self.request("post")
+        self.assertEqual(self.request("get", "new"), DEFAULT_DB_ALIAS)
+        self.assertIn(self.request("get", "new", address="10.0.0.2"), REPLICAS)
+
+    def test_authenticated_write_does_not_pin_shared_address(self):
+        self.request("post", "a")
+        self.assertIn(self.request("get", "b"), REPLICAS)
+        self.assertIn(self.request("get"), REPLICAS)
+
+    @override_settings(READ_REPLICAS=[])
+    def test_disabled_without_replicas(self):
+        self.request("post", "a")
+        self.assertEqual(self.request("get", "b"), DEFAULT_DB_ALIAS)
+
+    def test_async_requests(self):
+        async def read_database(request):
+            return HttpResponse(Center.objects.all().db)
+
+        middleware = ReplicaRoutingMiddleware(read_database)
+
+        def request(method):
+            return asyncio.run(
+                middleware(
+                    getattr(self.factory, method)("/api/", HTTP_AUTHORIZATION="Token a")
+                )
+            )
+
+        self.assertIn(request("get").content.decode(), REPLICAS)
+        self.assertEqual(request("post").content.decode(), DEFAULT_DB_ALIAS)
+        self.assertEqual(request("get").content.decode(), DEFAULT_DB_ALIAS)
+
+
+@skipUnless(settings.READ_REPLICAS, "Read replicas are not configured.")
+class ReplicaRoutingAPITest(APITransactionTestCase):
+    """Requests against real primary and replica connections.
+
+    In tests the replicas mirror the primary, so data written through the
+    API is visible on both and only the connection used differs.
+    """
+
+    databases = "__all__"
+
+    def setUp(self):
+        get_cache().clear()
+        address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=1
+        )
+        self.center = Center.objects.create(
+            name="Main Center", phone="+71234567890", address=address
+        )
+        self.user = User.objects.create(username="writer", password="password")
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse("comment-list", kwargs={"center_id": self.center.pk})
+
+    def get(self, token=None, address="127.0.0.1"):
+        self.client.credentials(
+            **({"HTTP_AUTHORIZATION": f"Token {token}"} if token else {})
+        )
+        with ExitStack() as stack:
+            contexts = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in [DEFAULT_DB_ALIAS, *settings.READ_REPLICAS]
+            }
+            response = self.client.get(self.url, REMOTE_ADDR=address)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = {
+            alias: len(context.captured_queries) for alias, context in contexts.items()
+        }
+        return response, queries
+
+    def test_reader_uses_replica(self):
+        _, queries = self.get()
+        self.assertEqual(queries[DEFAULT_DB_ALIAS], 0)
+        self.assertGreater(sum(queries.values()), 0)
+
+    def test_commenter_reads_own_comment_from_primary(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        response = self.client.post(
+            reverse("comments-list"),
+            {
+                "content": "Great",
+                "mark": 5,
+                "center_id": str(self.center.pk),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, queries = self.get(self.token.key)
+        self.assertEqual(sum(queries.values()), queries[DEFAULT_DB_ALIAS])
+        self.assertEqual(
+            [comment["content"] for comment in response.data["results"]], ["Great"]
+        )
+
+        # Другие клиенты по-прежнему читают с реплик
+        _, queries = self.get(address="10.0.0.2")
+        self.assertEqual(queries[DEFAULT_DB_ALIAS], 0)
@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from buty_center.search import search_centers, update_search_index
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+
+
+# Индекс и профили перестраиваются после коммита, без воркера очереди
+@override_settings(TASK_QUEUE_EAGER=True)
+class SearchAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("center-search")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sunrise = self.create_center("Sunrise Salon", city="Moscow")
+            self.beauty = self.create_center("Beauty Lab", city="Kazan")
+            self.nails = self.create_center("Nail Studio", city="Moscow")
+            service = Service.objects.create(name="Manicure", category="Nails")
+            CenterService.objects.create(
+                center=self.nails, service=service, description="Description"
+            )
+            Comments.objects.create(
+                content="Great sunrise view from the window",
+                mark=5,
+                center=self.beauty,
+                user=self.user,
+            )
+
+    def create_center(self, name, city):
+        address = Address.objects.create(
+            street="Main St", city=city, state="State", number=1
+        )
+        return Center.objects.create(name=name, phone="+71234567890", address=address)
+
+    def search(self, query, **params):
+        response = self.client.get(self.url, {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["name"] for result in response.data["results"]]
+
+    def test_name_ranks_above_comment(self):
+        self.assertEqual(self.search("sunrise"), ["Sunrise Salon", "Beauty Lab"])
+
+    def test_matches_address_and_services(self):
+        self.assertEqual(self.search("kazan"), ["Beauty Lab"])
+        self.assertEqual(self.search("manicure"), ["Nail Studio"])
+        self.assertEqual(self.search("manicure moscow"), ["Nail Studio"])
+
+    def test_misspelled_name(self):
+        self.assertIn("Beauty Lab", self.search("beuty"))
+
+    def test_results_are_serialized_centers(self):
+        response = self.client.get(self.url, {"q": "manicure"})
+        result = response.data["results"][0]
+        self.assertEqual(result["services"][0]["service"]["name"], "Manicure")
+        self.assertGreater(result["rank"], 0)
+        self.assertNotIn("search_document", result)
+
+    def test_index_follows_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.nails.name = "Lotus"
+            self.nails.save()
+            Comments.objects.filter(center=self.beauty).delete()
+        self.assertEqual(self.search("lotus"), ["Lotus"])
+        self.assertEqual(self.search("sunrise"), ["Sunrise Salon"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.filter(name="Manicure").get().save()
+            CenterService.objects.create(
+                center=self.sunrise,
+                service=Service.objects.create(name="Massage", category="Body"),
+                description="Description",
+            )
+        self.assertEqual(self.search("massage"), ["Sunrise Salon"])
+
+    def test_bulk_upsert_is_indexed(self):
+        item = {
+            "name": "Orchid",
+            "phone": "+71234567890",
+            "address": {"street": "Main St", "city": "Tver", "state": "S", "number": 1},
+        }
+        self.client.post(reverse("center-bulk"), [item], format="json")
+        self.assertEqual(self.search("tver"), ["Orchid"])
+
+    def test_query_count_does_not_depend_on_results(self):
+        with CaptureQueriesContext(connection) as context:
+            self.search("moscow")
+        self.assertEqual(len(context.captured_queries), 3)
+
+    def test_limit(self):
+        self.assertEqual(len(self.search("moscow", limit=1)), 1)
+
+    def test_invalid_requests(self):
+        for params in ({}, {"q": " "}, {"q": "salon", "limit": "many"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        Center.objects.update(search_document="", search_vector=None)
+        self.assertEqual(self.search("kazan"), [])
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.search("kazan"), ["Beauty Lab"])
+
+
+@benchmark
+class SearchBenchmark(APITestCase):
+    def test_search_on_many_centers(self):
+        total = env_int("BENCHMARK_CENTERS", 100000)
+        addresses = Address.objects.bulk_create(
+            Address(street="Main St", city=f"City {num % 500}", state="S", number=num)
+            for num in range(total)
+        )
+        Center.objects.bulk_create(
+            Center(name=f"Center {num}", phone="+71234567890", address=address)
+            for num, address in enumerate(addresses)
+        )
+        update_search_index()
+
+        seconds = best_time(lambda: search_centers("city 42", 20))
+        report(
+            "center search",
+            backend=connection.vendor,
+            centers=total,
+            query_ms=round(seconds * 1000, 2),
+        )
+        # Резервный скоринг на SQLite линейный, порог только для PostgreSQL
+        if connection.vendor == "postgresql":
+            self.assertLess(seconds, 0.01)
@@ -0,0 +1,212 @@
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from buty_center.cache import get_cache
+from buty_center.flat import FlatSerializer
+from buty_center.models import Address, Center, Service, Comments, CenterService
+from buty_center.parsers import ORJSONParser
+from buty_center.renderers import ORJSONRenderer
+from buty_center.serializers import (
+    AddressSerializer,
+    CenterSerializer,
+    CommentsSerializer,
+    ServiceSerializer,
+)
+from buty_center.views import AddressViewSet, CommentsViewSet, ServiceViewSet
+from django.contrib.auth.models import User
+from tests.benchmark import benchmark, best_time, env_int, report
+
+
+def create_rows(count, users=3, services=4):
+    """Create ``count`` centers with addresses, comments and services."""
+    users = [
+        User.objects.create(username=f"user{num}", password="password")
+        for num in range(users)
+    ]
+    services = [
+        Service.objects.create(name=f"Service {num}", category="Hair")
+        for num in range(services)
+    ]
+    for num in range(count):
+        address = Address.objects.create(
+            street="Main St",
+            city="Anytown",
+            state="State",
+            number=num,
+            latitude=55.75 if num % 2 else None,
+            longitude=37.61 if num % 2 else None,
+        )
+        center = Center.objects.create(
+            name=f"Center {num}", phone="+71234567890", address=address
+        )
+        # У центров разные наборы услуг, у услуг - центров
+        first = num % len(services)
+        for service in services[first::2]:
+            CenterService.objects.create(
+                center=center, service=service, description="Description"
+            )
+        Comments.objects.create(
+            content=f"Комментарий {num}",
+            mark=num % 5 + 1,
+            center=center,
+            user=users[num % len(users)],
+        )
+
+
+class FlatSerializerTest(APITestCase):
+    def setUp(self):
+        create_rows(6)
+
+    def assertSameOutput(self, serializer_class, queryset):
+        flat = FlatSerializer(serializer_class)
+        expected = serializer_class(queryset, many=True).data
+        self.assertEqual(flat.to_representation(list(flat.values(queryset))), expected)
+
+    def test_matches_model_serializers(self):
+        self.assertSameOutput(AddressSerializer, Address.objects.order_by("number"))
+        self.assertSameOutput(ServiceSerializer, Service.objects.order_by("name"))
+        self.assertSameOutput(
+            CommentsSerializer, Comments.objects.order_by("created_at", "id")
+        )
+
+    def test_datetimes_in_current_timezone(self):
+        with timezone.override(ZoneInfo("Europe/Moscow")):
+            self.assertSameOutput(CommentsSerializer, Comments.objects.all())
+
+    def test_nested_serializer_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            FlatSerializer(CenterSerializer)
+
+    def get(self, viewset, url, flat, params=None):
+        # Ответы не должны браться из кеша другого пути
+        get_cache().clear()
+        flat_serializer_class = viewset.flat_serializer_class if flat else None
+        with mock.patch.object(viewset, "flat_serializer_class", flat_serializer_class):
+            return self.client.get(url, params)
+
+    def test_list_endpoints_match_model_serializers(self):
+        for viewset, name in [
+            (AddressViewSet, "address-list"),
+            (ServiceViewSet, "service-list"),
+            (CommentsViewSet, "comments-list"),
+        ]:
+            url, params = reverse(name), {"page_size": 2}
+            flat = self.get(viewset, url, True, params)
+            expected = self.get(viewset, url, False, params)
+            self.assertEqual(flat.content, expected.content)
+
+            # Курсор из строк .values() ведет на ту же следующую страницу
+            flat = self.get(viewset, flat.json()["next"], True)
+            expected = self.get(viewset, expected.json()["next"], False)
+            self.assertEqual(flat.content, expected.content)
+
+    def test_filters_apply(self):
+        response = self.client.get(reverse("comments-list"), {"mark_min": 5})
+        self.assertEqual(
+            [comment["mark"] for comment in response.json()["results"]], [5.0]
+        )
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data = {
+            "id": uuid4(),
+            "text": 'Салон красоты   "кавычки" \\',
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            "price": Decimal("10.50"),
+            "errors": [ErrorDetail("Invalid value.", code="invalid")],
+            "nested": {"mark": 4.5, "count": 3, "empty": None, "flag": True},
+            1: "int key",
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_falls_back_to_json_renderer(self):
+        data = {"a": [1, 2]}
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_none(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, parser, body, encoding="utf-8"):
+        return parser.parse(io.BytesIO(body), parser_context={"encoding": encoding})
+
+    def test_matches_json_parser(self):
+        body = json.dumps({"content": "Отлично", "mark": 5, "items": [1.5, None]})
+        for encoding in ["utf-8", "utf-16"]:
+            self.assertEqual(
+                self.parse(ORJSONParser(), body.encode(encoding), encoding),
+                self.parse(JSONParser(), body.encode(encoding), encoding),
+            )
+
+    def test_invalid_json(self):
+        for body in [b"{", b'{"mark": NaN}', b"\xff"]:
+            with self.assertRaises(ParseError):
+                self.parse(ORJSONParser(), body)
+
+
+@benchmark
+class SerializationBenchmark(APITestCase):
+    def test_rows_per_second(self):
+        count = env_int("BENCHMARK_ROWS", 2000)
+        create_rows(count)
+        cases = [
+            (AddressSerializer, Address.objects.all()),
+            (ServiceSerializer, Service.objects.prefetch_related("centers")),
+            (CommentsSerializer, Comments.objects.select_related("user")),
+        ]
+        for serializer_class, queryset in cases:
+            flat = FlatSerializer(serializer_class)
+            rows = queryset.count()
+            drf = best_time(lambda: serializer_class(queryset.all(), many=True).data)
+            fast = best_time(
+                lambda: flat.to_representation(list(flat.values(queryset)))
+            )
+            report(
+                serializer_class.__name__,
+                rows=rows,
+                model_serializer_rows_per_sec=round(rows / drf),
+                flat_rows_per_sec=round(rows / fast),
+                speedup=round(drf / fast, 1),
+            )
+
+        data = CommentsSerializer(Comments.objects.select_related("user"), many=True)
+        data = data.data
+        drf = best_time(lambda: JSONRenderer().render(data))
+        fast = best_time(lambda: ORJSONRenderer().render(data))
+        report(
+            "ORJSONRenderer",
+            rows=len(data),
+            json_renderer_rows_per_sec=round(len(data) / drf),
+            orjson_renderer_rows_per_sec=round(len(data) / fast),
+            speedup=round(drf / fast, 1),
+        )
+
+        body = JSONRenderer().render(data)
+        drf = best_time(lambda: JSONParser().parse(io.BytesIO(body)))
+        fast = best_time(lambda: ORJSONParser().parse(io.BytesIO(body)))
+        report(
+            "ORJSONParser",
+            rows=len(data),
+            json_parser_rows_per_sec=round(len(data) / drf),
+            orjson_parser_rows_per_sec=round(len(data) / fast),
+            speedup=round(drf / fast, 1),
+        )
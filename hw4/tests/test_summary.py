@@ -0,0 +1,101 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center.models import Address, Center, Comments
+from django.contrib.auth.models import User
+
+
+class CommentSummaryAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="testuser", password="password", email="test@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("comments-summary")
+        self.centers = []
+        now = timezone.now()
+        for num in range(5):
+            address = Address.objects.create(
+                street="Main St", city="Anytown", state="State", number=num
+            )
+            center = Center.objects.create(
+                name=f"Center {num}", phone="+71234567890", address=address
+            )
+            self.centers.append(center)
+            for mark in range(1, num + 2):
+                comment = Comments.objects.create(
+                    content=f"Comment {mark}",
+                    mark=mark,
+                    center=center,
+                    user=self.user,
+                )
+                Comments.objects.filter(pk=comment.pk).update(
+                    created_at=now + timedelta(minutes=mark)
+                )
+
+    def ids(self, centers):
+        return ",".join(str(center.id) for center in centers)
+
+    def test_latest_comments_and_stats(self):
+        response = self.client.get(
+            self.url, {"centers": self.ids(self.centers), "limit": 2}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = response.data[str(self.centers[3].id)]
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["average"], 2.5)
+        self.assertEqual(
+            [comment["content"] for comment in summary["comments"]],
+            ["Comment 4", "Comment 3"],
+        )
+        self.assertEqual(summary["comments"][0]["user"], "testuser")
+        self.assertEqual(len(response.data[str(self.centers[0].id)]["comments"]), 1)
+
+    def test_single_query_for_any_number_of_centers(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url, {"centers": self.ids(self.centers[:1])})
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url, {"centers": self.ids(self.centers)})
+        self.assertEqual(len(few.captured_queries), 1)
+        self.assertEqual(len(many.captured_queries), 1)
+
+    def test_post_with_unknown_center(self):
+        unknown = uuid4()
+        data = {"centers": [str(self.centers[1].id), str(unknown)], "limit": 5}
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[str(self.centers[1].id)]["count"], 2)
+        self.assertEqual(
+            response.data[str(unknown)],
+            {"count": 0, "average": None, "comments": []},
+        )
+
+    def test_invalid_requests(self):
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        response = self.client.get(self.url, {"centers": "not-a-uuid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = ",".join(str(uuid4()) for _ in range(101))
+        response = self.client.get(self.url, {"centers": too_many})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_zero_limit_keeps_stats(self):
+        response = self.client.get(
+            self.url, {"centers": self.ids(self.centers), "limit": 0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = response.data[str(self.centers[3].id)]
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["average"], 2.5)
+        self.assertEqual(summary["comments"], [])
+
+    def test_post_with_non_object_body(self):
+        response = self.client.post(self.url, [str(self.centers[0].id)], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,182 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from buty_center import tasks
+from buty_center.models import Address, Center, CenterProfile, Job
+from buty_center.tasks import claim_jobs, enqueue, process_jobs
+from django.contrib.auth.models import User
+
+
+@override_settings(
+    TASK_QUEUE_EAGER=False,
+    TASK_VISIBILITY_TIMEOUT=60,
+    TASK_MAX_ATTEMPTS=3,
+    TASK_RETRY_DELAY=10,
+)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.failing = set()
+        handlers = {"test.record": self.record}
+        patcher = mock.patch.dict(tasks.handlers, handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Задачи теста ставятся позже setUp, но должны быть уже доступны
+        self.now = timezone.now() + timedelta(seconds=1)
+
+    def record(self, keys):
+        self.calls.append(keys)
+        if self.failing & set(keys):
+            raise ValueError("boom")
+
+    def later(self, seconds):
+        return self.now + timedelta(seconds=seconds)
+
+    def test_pending_jobs_are_coalesced_per_key(self):
+        enqueue("test.record", ["a", "b", "a"])
+        enqueue("test.record", ["b", "c"])
+        self.assertEqual(Job.objects.count(), 3)
+
+        self.assertEqual(process_jobs(now=self.now), 3)
+        self.assertEqual(self.calls, [["a", "b", "c"]])
+        self.assertFalse(Job.objects.exists())
+
+    def test_key_queued_while_running_is_handled_again(self):
+        enqueue("test.record", ["a"])
+        claimed = claim_jobs(10, self.now)
+        enqueue("test.record", ["a"])
+        self.assertEqual(Job.objects.count(), 2)
+
+        tasks.handlers["test.record"]([job.key for job in claimed])
+        Job.objects.filter(pk__in=[job.pk for job in claimed]).delete()
+        process_jobs(now=self.now)
+        self.assertEqual(self.calls, [["a"], ["a"]])
+
+    def test_claimed_job_is_delivered_again_after_visibility_timeout(self):
+        enqueue("test.record", ["a"])
+        # Воркер взял задачу и упал, не завершив ее
+        self.assertEqual(len(claim_jobs(10, self.now)), 1)
+        self.assertEqual(process_jobs(now=self.later(59)), 0)
+
+        self.assertEqual(process_jobs(now=self.later(60)), 1)
+        self.assertEqual(self.calls, [["a"]])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_batch_is_retried_with_backoff(self):
+        self.failing = {"a"}
+        enqueue("test.record", ["a", "b"])
+        process_jobs(now=self.now)
+        job = Job.objects.get(key="a")
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.available_at, self.later(10))
+        self.assertEqual(job.last_error, "ValueError: boom")
+
+        self.assertEqual(process_jobs(now=self.later(9)), 0)
+        self.assertEqual(process_jobs(now=self.later(10)), 2)
+        self.assertEqual(Job.objects.get(key="a").available_at, self.later(30))
+
+        self.failing = set()
+        process_jobs(now=self.later(30))
+        self.assertEqual(self.calls[-1], ["a", "b"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_job_fails_after_max_attempts(self):
+        self.failing = {"a"}
+        enqueue("test.record", ["a"])
+        for seconds in [0, 10, 30]:
+            process_jobs(now=self.later(seconds))
+        job = Job.objects.get()
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(job.failed_at, self.later(30))
+        self.assertEqual(process_jobs(now=self.later(3600)), 0)
+
+        # Упавшая задача не мешает поставить ключ снова
+        enqueue("test.record", ["a"])
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_retry_merges_into_newer_pending_job(self):
+        enqueue("test.record", ["a"])
+        claimed = claim_jobs(10, self.now)
+        enqueue("test.record", ["a"])
+        tasks._fail(claimed[0], "ValueError: boom", self.now)
+        self.assertEqual(Job.objects.get().attempts, 0)
+
+    def test_unknown_task_fails_at_once(self):
+        enqueue("test.unknown", ["a"])
+        process_jobs(now=self.now)
+        job = Job.objects.get()
+        self.assertIsNotNone(job.failed_at)
+        self.assertIn("Unknown task", job.last_error)
+
+    def test_rolled_back_write_queues_nothing(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue("test.record", ["a"])
+            raise RuntimeError()
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_eager_mode_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue("test.record", ["a", "b", "a"])
+            enqueue("test.record", ["c"])
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [["a", "b"], ["c"]])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_eager_mode_drops_rolled_back_savepoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue("test.record", ["a"])
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                enqueue("test.record", ["b"])
+                raise RuntimeError()
+        self.assertEqual(self.calls, [["a"]])
+
+
+@override_settings(TASK_QUEUE_EAGER=False)
+class WorkerTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="password")
+        self.client.force_authenticate(user=self.user)
+        address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=1
+        )
+        self.center = Center.objects.create(
+            name="Main Center", phone="+71234567890", address=address
+        )
+        call_command("run_worker", "--once", stdout=StringIO())
+
+    def rating(self):
+        response = self.client.get(reverse("center-profile", args=[self.center.pk]))
+        return response.json()["rating"]
+
+    def test_write_returns_before_derived_data_is_rebuilt(self):
+        self.assertEqual(self.rating()["count"], 0)
+        response = self.client.post(
+            reverse("comments-list"),
+            {"content": "Great", "mark": 5, "center_id": str(self.center.pk)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(Job.objects.values_list("name", "key")),
+            {
+                ("profiles.update", str(self.center.pk)),
+                ("search.reindex", str(self.center.pk)),
+            },
+        )
+        self.assertEqual(self.rating()["count"], 0)
+
+        out = StringIO()
+        call_command("run_worker", "--once", stdout=out)
+        self.assertIn("Processed 2 jobs", out.getvalue())
+        self.assertEqual(self.rating(), {"average": 5.0, "count": 1})
+        self.assertTrue(CenterProfile.objects.filter(pk=self.center.pk).exists())
@@ -0,0 +1,213 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from buty_center.cache import get_cache
+from buty_center.models import Address, Center
+from buty_center import throttling
+from buty_center.throttling import (
+    CacheBucketStore,
+    RegisterThrottle,
+    TokenBucketThrottle,
+    check_buckets,
+    local_store,
+    parse_rate,
+    take_token,
+)
+from django.contrib.auth.models import User
+
+BUCKETS = {
+    "comments": {"rate": "1/min", "burst": 2},
+    "register": {"rate": "1/hour", "burst": 3},
+}
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/s"), 10)
+        self.assertEqual(parse_rate("30/min"), 0.5)
+        self.assertEqual(parse_rate("36/hour"), 0.01)
+        for rate in ["abc", "5/", "5/week", "x/min", "0/min", None]:
+            with self.subTest(rate), self.assertRaises(ValueError):
+                parse_rate(rate)
+
+    def test_check_buckets(self):
+        check_buckets(BUCKETS)
+        for bucket in [{"rate": "5/fortnight"}, {}, {"rate": "5/min", "burst": 0}]:
+            with self.subTest(bucket), self.assertRaises(ImproperlyConfigured):
+                check_buckets({"comments": bucket})
+
+    def test_expired_lock_of_another_process_is_kept(self):
+        cache = get_cache()
+        cache.clear()
+        store = CacheBucketStore(cache)
+
+        def take_over(*args):
+            # Блокировка истекла, и ее взял другой процесс
+            cache.set("bucket:lock", "other")
+            return take_token(*args)
+
+        with mock.patch.object(throttling, "take_token", take_over):
+            self.assertEqual(store.consume("bucket", 100.0, 1, 2), 0)
+        self.assertEqual(cache.get("bucket:lock"), "other")
+        cache.clear()
+
+    def test_bucket_refills_at_rate_up_to_capacity(self):
+        state = None
+        for _ in range(2):
+            wait, state = take_token(state, 100.0, rate=1, capacity=2)
+            self.assertEqual(wait, 0)
+        wait, state = take_token(state, 100.0, rate=1, capacity=2)
+        self.assertEqual(wait, 1)
+        wait, state = take_token(state, 100.5, rate=1, capacity=2)
+        self.assertEqual(wait, 0.5)
+        wait, state = take_token(state, 101.0, rate=1, capacity=2)
+        self.assertEqual(wait, 0)
+
+        # Простой не копит токенов больше емкости
+        wait, state = take_token(state, 1000.0, rate=1, capacity=2)
+        self.assertEqual(state, (1, 1000.0))
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = [RegisterThrottle]
+
+    def post(self, request):
+        return Response(status=status.HTTP_201_CREATED)
+
+
+class StoreMixin:
+    def setUp(self):
+        super().setUp()
+        local_store.clear()
+        get_cache().clear()
+
+
+class ConcurrentThrottleMixin(StoreMixin):
+    threads = 8
+    requests_per_thread = 25
+
+    def post(self, address):
+        request = APIRequestFactory().post("/", REMOTE_ADDR=address)
+        return ThrottledView.as_view()(request)
+
+    def test_limit_holds_under_parallel_requests(self):
+        addresses = ["10.0.0.1", "10.0.0.2"] * (
+            self.threads * self.requests_per_thread // 2
+        )
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            responses = list(executor.map(self.post, addresses))
+
+        allowed = Counter(
+            address
+            for address, response in zip(addresses, responses)
+            if response.status_code == status.HTTP_201_CREATED
+        )
+        self.assertEqual(allowed, {"10.0.0.1": 3, "10.0.0.2": 3})
+        throttled = [response for response in responses if response.status_code == 429]
+        self.assertEqual(len(throttled), len(addresses) - 6)
+        self.assertTrue(all(int(response["Retry-After"]) > 0 for response in throttled))
+
+
+class ThrottleAPIMixin(StoreMixin):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="testuser", password="password")
+        self.client.force_authenticate(user=self.user)
+        address = Address.objects.create(
+            street="Main St", city="Anytown", state="State", number=1
+        )
+        self.center = Center.objects.create(
+            name="Main Center", phone="+71234567890", address=address
+        )
+        self.now = 1000.0
+        patcher = mock.patch.object(TokenBucketThrottle, "timer", lambda _: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def comment(self):
+        return self.client.post(
+            reverse("comments-list"),
+            {"content": "Great", "mark": 5, "center_id": str(self.center.pk)},
+            format="json",
+        )
+
+    def register(self, num, address="10.0.0.1"):
+        return self.client.post(
+            reverse("register"),
+            {"username": f"user{num}", "password": "pass", "email": "a@example.com"},
+            format="json",
+            REMOTE_ADDR=address,
+        )
+
+    def test_comment_burst_then_refill(self):
+        for _ in range(2):
+            self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+        response = self.comment()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "60")
+
+        self.now += 30
+        self.assertEqual(self.comment()["Retry-After"], "30")
+        self.now += 30
+        self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+
+    def test_buckets_are_per_user(self):
+        for _ in range(3):
+            self.comment()
+        other = User.objects.create(username="other", password="password")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+
+    def test_reads_are_not_throttled(self):
+        for _ in range(3):
+            self.comment()
+        response = self.client.get(reverse("comments-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_register_is_throttled_per_address(self):
+        self.client.force_authenticate(user=None)
+        for num in range(3):
+            self.assertEqual(self.register(num).status_code, status.HTTP_201_CREATED)
+        response = self.register(3)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "3600")
+        self.assertFalse(User.objects.filter(username="user3").exists())
+        self.assertEqual(
+            self.register(3, address="10.0.0.2").status_code, status.HTTP_201_CREATED
+        )
+
+    @override_settings(THROTTLE_BUCKETS={})
+    def test_unconfigured_scope_is_not_throttled(self):
+        for _ in range(5):
+            self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+
+
+@override_settings(THROTTLE_BUCKETS=BUCKETS, THROTTLE_CACHE_ALIAS="")
+class LocalConcurrentThrottleTest(ConcurrentThrottleMixin, SimpleTestCase):
+    pass
+
+
+@override_settings(THROTTLE_BUCKETS=BUCKETS, THROTTLE_CACHE_ALIAS="default")
+class CacheConcurrentThrottleTest(ConcurrentThrottleMixin, SimpleTestCase):
+    pass
+
+
+@override_settings(THROTTLE_BUCKETS=BUCKETS, THROTTLE_CACHE_ALIAS="")
+class LocalThrottleAPITest(ThrottleAPIMixin, APITestCase):
+    pass
+
+
+@override_settings(THROTTLE_BUCKETS=BUCKETS, THROTTLE_CACHE_ALIAS="default")
+class CacheThrottleAPITest(ThrottleAPIMixin, APITestCase):
+    pass